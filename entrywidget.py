@@ -1,15 +1,51 @@
-from PyQt5.QtWidgets import QLineEdit, QWidget, QHBoxLayout
+from PyQt5.QtWidgets import QLineEdit, QWidget, QHBoxLayout, QApplication
 from PyQt5.QtCore import pyqtProperty, pyqtSignal
-from PyQt5 import Qt, QtCore
-from PyQt5.QtGui import QColor
+from PyQt5 import Qt, QtCore, sip
+from PyQt5.QtGui import QColor, QPalette
 from qt_utils import loggableQtName, ErrorMixin
 from qt_utils.widgets import DictComboBox
 from delegated import delegated
+from collections import deque
+from contextlib import contextmanager
+import asyncio
+import functools
+import inspect
 import logging
+import re
+import time
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+# active tracer, see entrywidget_trace.Tracer.install()
+_tracer = None
+
+
+class _NoSpan:
+    """Do-nothing context manager used when no tracer is installed."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_noSpan = _NoSpan()
+
+
+def _span(name, widget):
+    """Get a context manager that records a trace span for 'widget', if tracing is enabled.
+
+    :param name: str, name of the step being timed
+    :param widget: widget the step belongs to
+    :return: context manager
+    """
+    if _tracer is None:
+        return _noSpan
+    return _tracer.span(name, widget)
+
 
 def mkQApp(*args):
     qa = QApplication.instance()
@@ -18,6 +54,295 @@ def mkQApp(*args):
     return qa
 
 
+# widgets with a pending status refresh while in deferStatusUpdates(), else None
+_deferredWidgets = None
+
+
+@contextmanager
+def deferStatusUpdates():
+    """Context manager holding off status refreshes (and restyling) of all widgets until the block exits,
+    then refreshing each affected widget once. Nested uses join the outermost block.
+    """
+    global _deferredWidgets
+    if _deferredWidgets is not None:
+        yield
+        return
+    _deferredWidgets = pending = {}
+    try:
+        yield
+    finally:
+        _deferredWidgets = None
+        for w in pending:
+            try:
+                w.refreshStatus()
+            except RuntimeError:
+                pass  # deleted in the meantime
+
+
+def _disconnectSignals(obj, signals):
+    """Disconnect everything from signals of 'obj'.
+
+    :param obj: QObject
+    :param signals: iterable of (signal name, tuple of overload types besides the default)
+    :return:
+    """
+    for name, overloads in signals:
+        signal = getattr(obj, name)
+        for s in (signal, *(signal[t] for t in overloads)):
+            try:
+                s.disconnect()
+            except TypeError:
+                pass  # nothing connected
+
+
+def _receiverCounts(obj, signals):
+    """Get the number of receivers connected to signals of 'obj'.
+
+    :param obj: QObject
+    :param signals: iterable of (signal name, tuple of overload types besides the default)
+    :return: list of int
+    """
+    counts = []
+    for name, overloads in signals:
+        signal = getattr(obj, name)
+        counts.append(obj.receivers(signal))
+        counts.extend(obj.receivers(signal[t]) for t in overloads)
+    return counts
+
+
+def _sendChunks(gen, text, pos, size, deadline=None):
+    """Send 'text' to a primed chunkCheck generator in chunks of 'size', starting at 'pos'.
+
+    :param gen: primed generator (see AutoColorLineEdit `chunkCheck`)
+    :param text: str, full text being validated
+    :param pos: int, index of the first character not sent yet
+    :param size: int, chunk length
+    :param deadline: time.perf_counter() value to pause at, or None to send everything
+    :return: tuple (done, result, pos)
+        done: bool, whether the generator produced a result
+        result: error status (None if not done)
+        pos: int, index of the first character not sent yet
+    """
+    try:
+        while pos < len(text):
+            gen.send(text[pos:pos + size])
+            pos += size
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False, None, pos
+        result = gen.send(None)
+    except StopIteration as e:
+        return True, e.value, pos
+    gen.close()
+    return True, result, pos
+
+
+def _widgetLogger(widget):
+    """Get the logger for a widget, giving it a NullHandler the first time.
+    Named widgets log by name; unnamed ones share a logger per class, so creating and destroying
+    widgets does not register new loggers or stack handlers on existing ones.
+
+    :param widget: widget with a `name` attribute
+    :return: logging.Logger
+    """
+    if widget.objectName():
+        log = logging.getLogger(widget.name)
+    else:
+        log = logging.getLogger(f'{__name__}.{type(widget).__name__}')
+    if not log.handlers:
+        log.addHandler(logging.NullHandler())
+    return log
+
+
+def _scalar(value):
+    """Convert a numpy scalar to the equivalent Python object."""
+    return value.item() if hasattr(value, 'item') and hasattr(value, 'dtype') else value
+
+
+_syncLoop = None  # asyncio loop running async errorChecks when no loop is driven, see _runAsyncCheckNow
+_unparsed = object()  # AutoColorLineEdit._valueKey before parsing
+_paletteCache = {}  # (background, text) color keys: QPalette
+_ruleCache = {}  # (background, text) color keys: single rule styleSheet string
+_rgbRe = re.compile(r'rgba?\(([^)]*)\)')
+
+
+def _styleString(colors):
+    """Build the styleSheet string for a colors dict or tuple, see AutoColorLineEdit.makeStyleString."""
+    if _isColorDict(colors):
+        string = ''
+        for k, v in colors.items():
+            v0, v1 = v
+            if isinstance(v0, QColor):
+                v0 = v0.getRgb()[:2]
+            if isinstance(v1, QColor):
+                v1 = v1.getRgb()[:2]
+
+            if isinstance(v0, (tuple, list)):
+                v0 = "rgb{}".format(str(tuple(v0))).replace(' ', '')
+            if isinstance(v1, (tuple, list)):
+                v1 = "rgb{}".format(str(tuple(v1))).replace(' ', '')
+            string += "AutoColorLineEdit[status='" + str(k) + "'] {background-color: " + str(v0) + "; color: " + str(v1) + ";}\n"
+
+    elif _isColorTuple(colors):
+        v0, v1 = colors[0], colors[1]
+        if isinstance(v0, QColor):
+            v0 = v0.getRgb()[:2]
+        if isinstance(v1, QColor):
+            v1 = v1.getRgb()[:2]
+
+        if isinstance(v0, (tuple, list)):
+            v0 = "rgb{}".format(str(tuple(v0))).replace(' ', '')
+        if isinstance(v1, (tuple, list)):
+            v1 = "rgb{}".format(str(tuple(v1))).replace(' ', '')
+        string = "AutoColorLineEdit {background-color: " + str(v0) + "; color: " + str(v1) + ";}\n"
+
+    else:
+        raise TypeError(f'Invalid format: {type(colors)} {colors}')
+    return string
+
+
+@functools.lru_cache(maxsize=256)
+def _cachedStyleString(key, isDict):
+    """_styleString for hashable colors: dict items (isDict) or a tuple; every widget builds the same few."""
+    return _styleString(dict(key) if isDict else key)
+
+
+def _toQColor(color):
+    """Convert a color in any format setColors accepts to a QColor."""
+    if isinstance(color, QColor):
+        return QColor(color)
+    if isinstance(color, (tuple, list)):
+        return QColor(*color)
+    match = _rgbRe.fullmatch(str(color).replace(' ', ''))
+    if match:
+        return QColor(*(int(float(v)) for v in match.group(1).split(',')))
+    return QColor(color)
+
+
+def _colorKey(color):
+    if isinstance(color, QColor):
+        return color.rgba()
+    return tuple(color) if isinstance(color, list) else color
+
+
+def _statusPalette(colors):
+    """Get the palette for a (background, text) color tuple, for all color groups.
+
+    :param colors: color tuple, see setColors
+    :return: QPalette, shared by all widgets with the same colors
+    """
+    key = (_colorKey(colors[0]), _colorKey(colors[1]))
+    palette = _paletteCache.get(key)
+    if palette is None:
+        palette = QPalette()  # only these roles are set, the others follow the application palette
+        background, text = _toQColor(colors[0]), _toQColor(colors[1])
+        for role in (QPalette.Base, QPalette.Window, QPalette.Button):
+            palette.setColor(role, background)
+        for role in (QPalette.Text, QPalette.WindowText, QPalette.ButtonText):
+            palette.setColor(role, text)
+        palette = _paletteCache[key] = palette
+    return palette
+
+
+class _AdaptiveCheck:
+    """State of 'adaptive' liveErrorChecking for one AutoColorLineEdit."""
+    maxDecisions = 20
+
+    def __init__(self, widget):
+        self.mode = 'live'
+        self.samples = deque(maxlen=widget.adaptiveWindow)
+        self.decisions = deque(maxlen=self.maxDecisions)
+        self.timer = QtCore.QTimer(widget)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(widget.adaptiveDebounce)
+        self.timer.timeout.connect(widget._onDebounceTimer)
+
+    def latency(self):
+        if not self.samples:
+            return None
+        return sorted(self.samples)[len(self.samples) // 2]
+
+    def record(self, widget, seconds):
+        """Add an errorCheck latency, switching mode once the window is full."""
+        self.samples.append(seconds)
+        if len(self.samples) < self.samples.maxlen:
+            return
+        latency = self.latency()
+        if latency > widget.adaptiveSlowBudget:
+            mode = 'editingFinished'
+        elif latency > widget.adaptiveBudget:
+            mode = 'debounced'
+        elif latency < widget.adaptiveBudget / 2:
+            mode = 'live'
+        else:
+            return
+        if mode == self.mode:
+            return
+        self.decisions.append({'time': time.time(), 'from': self.mode, 'to': mode, 'latency': latency})
+        widget.logger.info("liveCheckMode '%s' -> '%s', errorCheck latency %.1f ms", self.mode, mode, latency * 1000)
+        self.mode = mode
+        self.samples.clear()  # judge the new mode on fresh samples
+        self.timer.stop()
+        widget._liveErrorChecking = mode != 'editingFinished'
+        widget.liveCheckModeChanged.emit(mode)
+
+
+def _differs(a, b):
+    """Whether two option data values differ, for data whose == is not a bool (e.g. arrays)."""
+    if a is b:
+        return False
+    try:
+        return bool(a != b)
+    except (TypeError, ValueError):
+        return True
+
+
+def _updateComboItems(combo, texts, data, oldTexts, oldData):
+    """Change a combo box's items from 'oldTexts' with 'oldData' to 'texts' with 'data',
+    by removing, inserting and updating only what differs. 'texts' must be unique.
+
+    :return: int, number of item operations
+    """
+    ops = 0
+    keep = set(texts)
+    current, currentData = list(oldTexts), list(oldData)
+    seen = set()
+    repeated = [t in seen or seen.add(t) for t in current]  # items added to the combo box directly
+    for i in range(len(current) - 1, -1, -1):
+        if current[i] not in keep or repeated[i]:
+            combo.removeItem(i)
+            del current[i], currentData[i]
+            ops += 1
+    remaining = set(current)
+    for i, (text, value) in enumerate(zip(texts, data)):
+        if i < len(current) and current[i] == text:
+            if _differs(currentData[i], value):
+                combo.setItemData(i, value)
+                ops += 1
+            continue
+        if text in remaining:  # moved
+            j = current.index(text, i)
+            combo.removeItem(j)
+            del current[j], currentData[j]
+            ops += 1
+        combo.insertItem(i, text, value)
+        current.insert(i, text)
+        currentData.insert(i, value)
+        ops += 1
+    return ops
+
+
+def _splitOptions(options):
+    """Split options into texts and data.
+
+    :param options: [str, str, ...] or {str:data, str:data, ...}; repeated texts are kept once, like dict keys
+    :return: tuple (list of str, list of data)
+    """
+    if isinstance(options, dict):
+        return list(options.keys()), list(options.values())
+    options = list(dict.fromkeys(options))
+    return options, list(options)
+
+
 def _isColorTuple(colors):
     """See if 'colors' matches the format for a colors tuple.
 
@@ -69,9 +394,47 @@ class AutoColorLineEdit(QLineEdit, ErrorMixin):
         :param colors: dict or tuple of colors; see help(setColors) for formatting
         :param readOnly: bool, whether the text box is editable
         :param liveErrorChecking: bool, whether error checking occurs
-                    after every keystroke (=True) or only after text editing is finished (=False)
+                    after every keystroke (=True) or only after text editing is finished (=False),
+                    or 'adaptive' to switch between the two (with a debounced mode between) by errorCheck latency,
+                    see `liveCheckMode`
+        :param chunkCheck: generator function for validating text in chunks, called with widget as first argument.
+                    Each chunk of text is sent to the generator, then None is sent once the text is exhausted.
+                    It returns (or yields after None) the error status, and can return early.
+                    Text of at least `chunkThreshold` characters is validated one chunk at a time between
+                    event loop iterations (status 'validating' until finished), shorter text at once.
+                    Used as `errorCheck` when no errorCheck is provided.
+        :param chunkSize: int, number of characters per chunk sent to `chunkCheck`
+        :param chunkThreshold: int, text length at which `chunkCheck` runs in the background
+        :param directPaint: bool, whether to color the widget with a palette per status instead of a styleSheet,
+                    see setDirectPaint
+        :param parser: callable(text) -> value, converts the text once per text, see `value`.
+                    Exceptions it raises set the error status (to their message) before errorCheck runs.
+        :param valueCheck: callable(value) -> error status, called with the parsed value;
+                    used as `errorCheck` when no errorCheck is provided
         """
     name = loggableQtName
+    validationProgress = pyqtSignal(float)  # fraction of text validated by a background chunkCheck
+    liveCheckModeChanged = pyqtSignal(str)  # new liveCheckMode, when 'adaptive' liveErrorChecking switches it
+    valueChanged = pyqtSignal(object)  # parsed value when it changes (None when parsing fails), see parser
+    chunkTimeSlice = 0.01  # seconds of chunkCheck work per event loop iteration
+
+    # adaptive liveErrorChecking: the median errorCheck latency of the last `adaptiveWindow` checks
+    # above `adaptiveBudget` s debounces checks by `adaptiveDebounce` ms, above `adaptiveSlowBudget` s
+    # defers them to editingFinished, and below half of `adaptiveBudget` s checks on every keystroke again
+    adaptiveBudget = 0.008
+    adaptiveSlowBudget = 0.1
+    adaptiveDebounce = 250
+    adaptiveWindow = 3
+
+    # inputs read by getStatus; the cached `status` is only recomputed when one of them changes.
+    # Subclasses overriding getStatus should list what it reads ('text' recomputes on every text change),
+    # and call refreshStatus() when anything else it reads changes.
+    statusDependencies = ('error', 'enabled', 'readOnly', 'blank', 'validating')
+
+    # color dicts with more statuses than this are applied one status at a time: each status's rule is
+    # built once, and only the current status's rule is set as styleSheet (see setColors), so restyling
+    # costs the same for any number of statuses instead of matching every status's rule on each polish
+    statusRuleLimit = 8
 
     defaultColors = {
         'error-readonly': ('orangered', 'white'),
@@ -82,16 +445,46 @@ class AutoColorLineEdit(QLineEdit, ErrorMixin):
         'readonly': ('#F0F0F0', 'black')
     }
 
+    # colors of the 'validating' status, added to the automatic colors (unless set) when a background
+    # chunkCheck or async errorCheck first runs, so widgets not using them keep the plain styleSheet
+    validatingColors = ('lavender', 'black')
+
     defaultArgs = {
         'colors': None,
         'liveErrorChecking': True,
         'errorCheck': None,
+        'chunkCheck': None,
+        'chunkSize': 65536,
+        'chunkThreshold': 262144,
+        'directPaint': False,
+        'parser': None,
+        'valueCheck': None,
         'text': ''
     }
 
     def __init__(self, parent=None, **kwargs):
         self._autoColors = self.defaultColors.copy()
-        self._liveErrorChecking = kwargs.pop('liveErrorChecking', self.defaultArgs['liveErrorChecking'])
+        liveErrorChecking = kwargs.pop('liveErrorChecking', self.defaultArgs['liveErrorChecking'])
+        self._chunkCheck = kwargs.pop('chunkCheck', self.defaultArgs['chunkCheck'])
+        self._chunkSize = kwargs.pop('chunkSize', self.defaultArgs['chunkSize'])
+        self._chunkThreshold = kwargs.pop('chunkThreshold', self.defaultArgs['chunkThreshold'])
+        self._adaptive = None  # _AdaptiveCheck state of 'adaptive' liveErrorChecking
+        self._chunkJob = None  # [generator, text, position] of a running background chunkCheck
+        self._chunkTimer = None
+        self._asyncTask = None  # asyncio.Task of a running async errorCheck
+        self._settleWaiters = []  # futures of validated() calls
+        self._status = None  # cached getStatus() result, see refreshStatus
+        self._palettes = None  # {status: QPalette} when directPaint, see setDirectPaint
+        self._palette = None  # QPalette applied for the current status
+        self._ownPalette = None  # palette set before directPaint, restored when it is turned off
+        self._statusRules = None  # {status: styleSheet} when colors has > statusRuleLimit statuses
+        self._staticColors = False  # whether colors are a single tuple, see setColors
+        directPaint = kwargs.pop('directPaint', self.defaultArgs['directPaint'])
+        self._parser = kwargs.pop('parser', self.defaultArgs['parser'])
+        self._valueKey = _unparsed  # (text, context) the cached _value is for, see value
+        self._value = self._parseError = None
+        valueCheck = kwargs.pop('valueCheck', self.defaultArgs['valueCheck'])
+        self._blank = True
 
         colors = kwargs.pop('colors', self.defaultArgs['colors'])
         ec = kwargs.pop('errorCheck', self.defaultArgs['errorCheck'])
@@ -99,47 +492,368 @@ class AutoColorLineEdit(QLineEdit, ErrorMixin):
         QLineEdit.__init__(self, parent=parent, **kwargs)
         ErrorMixin.__init__(self)
 
-        self.logger = logging.getLogger(self.name)
-        self.logger.addHandler(logging.NullHandler())
+        self.logger = _widgetLogger(self)
 
-        # connect signals to do error checking, color updating
-        self.textChanged[str].connect(self._onTextChanged)
-        self.editingFinished.connect(self._onEditingFinished)
-        self.errorChanged[object].connect(lambda o: self.update())
+        self._blank = self.text() == ''
+        self._status = self.getStatus()
+        self._setLiveMode(liveErrorChecking)
 
-        if colors:
+        self._connectSignals()
+
+        if directPaint:
+            self.setDirectPaint(True, colors)
+        elif colors:
             self.setColors(colors)
         else:
             super().setStyleSheet(self.makeStyleString())
 
         if ec is not None:
             self.errorCheck = lambda s: ec(self)
+        elif valueCheck is not None:
+            self.errorCheck = lambda s: valueCheck(self.value())
+        elif self._chunkCheck is not None:
+            self.errorCheck = lambda s: self.runChunkCheck()
+        self.errorCheck = self._withParser(self.errorCheck)
 
         try:
             self.setError(self.errorCheck(self))
         except:
             pass
+        self._baseReceivers = _receiverCounts(self, self.resettableSignals)
+
+    def _connectSignals(self):
+        # connect signals to do error checking, color updating
+        self.textChanged[str].connect(self._onTextChanged)
+        self.editingFinished.connect(self._onEditingFinished)
+        self.errorChanged[object].connect(lambda o: self._statusInputChanged('error'))
+
+    # signals cleared by resetConnections, overloaded signals are listed with their overload types
+    resettableSignals = (('textChanged', ()), ('textEdited', ()), ('editingFinished', ()), ('returnPressed', ()),
+                         ('selectionChanged', ()), ('cursorPositionChanged', ()), ('errorCleared', ()),
+                         ('validationProgress', ()), ('liveCheckModeChanged', ()), ('valueChanged', ()),
+                         ('errorChanged', (object, str)), ('hasError', (object, str)))
+
+    def resetConnections(self):
+        """Disconnect everything connected to the widget's signals, keeping the widget's own connections.
+
+        :return: bool, whether anything was disconnected
+        """
+        if _receiverCounts(self, self.resettableSignals) == self._baseReceivers:
+            return False
+        self._resetConnections()
+        return True
+
+    def _resetConnections(self):
+        _disconnectSignals(self, self.resettableSignals)
+        error = self._error
+        ErrorMixin.__init__(self)  # restores any connections ErrorMixin makes
+        self._error = error
+        self._connectSignals()
+        if self.isClearButtonEnabled():  # QLineEdit's clear button listens to textChanged
+            QLineEdit.setClearButtonEnabled(self, False)
+            QLineEdit.setClearButtonEnabled(self, True)
+        self._baseReceivers = _receiverCounts(self, self.resettableSignals)
 
     def _onEditingFinished(self):
         self.logger.log(logging.DEBUG-1, 'editingFinished()')
-        self.setError(self.errorCheck(self))
+        with _span('editingFinished', self):
+            if self._adaptive is not None:
+                self._adaptive.timer.stop()
+            if self._chunkJob is not None or self._asyncTask is not None:
+                return  # background check of the current text will set the error
+            if self._useChunks(self.text()):
+                self._startChunkCheck(self.text())
+                return
+            self.setError(self._timedErrorCheck())
+
+    def _timedErrorCheck(self):
+        """Run errorCheck, recording its latency for 'adaptive' liveErrorChecking."""
+        with _span('errorCheck', self):
+            if self._adaptive is None:
+                return self.errorCheck(self)
+            t = time.perf_counter()
+            err = self.errorCheck(self)
+            self._adaptive.record(self, time.perf_counter() - t)
+        return err
 
-    def _onTextChanged(self, text):
-        self.logger.log(logging.DEBUG-1, f"textChanged('{text}')")
+    def _onDebounceTimer(self):
+        if self._chunkJob is not None or self._asyncTask is not None:
+            return
+        if self._useChunks(self.text()):
+            self._startChunkCheck(self.text())
+            return
+        self.setError(self._timedErrorCheck())
 
-        if self._liveErrorChecking is True:
-            err = self.errorCheck(self)
-            if err != self.getError():
-                self.setError(err)
+    def _onTextChanged(self, text):
+        self.logger.log(logging.DEBUG-1, "textChanged('%s')", text)
+
+        with _span('textChanged', self):
+            if self._parser is not None:
+                self._updateValue()
+            changed = ['text']
+            if self._chunkJob is not None or self._asyncTask is not None:
+                self._cancelChunkCheck()
+                self._cancelAsyncCheck()
+                changed.append('validating')
+            blank = text == ''
+            if blank is not self._blank:
+                self._blank = blank
+                changed.append('blank')
+
+            live = self._liveErrorChecking
+            if live is True and self._adaptive is not None and self._adaptive.mode == 'debounced':
+                self._adaptive.timer.start()
+                live = False
+            try:
+                if live is True:
+                    if self._useChunks(text):
+                        self._startChunkCheck(text)
+                        return
+                    err = self._timedErrorCheck()
+                    if err != self.getError():
+                        self.setError(err)
+                        return
+                self._statusInputChanged(*changed)
+            finally:
+                self._wakeWaiters()
+
+    def value(self):
+        """Get the text converted by `parser`, parsed at most once per text (and EntryWidget option).
+
+        :return: parsed value, None if parsing failed (see parseError); the text if there is no parser
+        """
+        if self._parser is None:
+            return self.text()
+        text, context = self.text(), self._valueContext()
+        old = self._valueKey
+        if old is _unparsed or old[0] != text or (old[1] is not context and _differs(old[1], context)):
+            self._valueKey = key = (text, context)
+            with _span('parse', self):
+                try:
+                    self._value, self._parseError = self._parser(key[0]), None
+                except Exception as e:
+                    self._value, self._parseError = None, str(e) or type(e).__name__
+        return self._value
+
+    def parseError(self):
+        """Get why `parser` failed for the current text.
+
+        :return: str, None if it did not fail
+        """
+        self.value()
+        return self._parseError
+
+    def _valueContext(self):
+        """Input besides the text the parsed value depends on (the selected option of an EntryWidget)."""
+        return None
+
+    def _updateValue(self):
+        """Parse the current text if needed, emitting valueChanged if the value changed."""
+        old, failed = self._value, self._parseError is not None
+        value = self.value()
+        if (self._parseError is not None) != failed or _differs(value, old):
+            self.valueChanged.emit(value)
+
+    def _withParser(self, check):
+        """Make an errorCheck which gives parse failures before running 'check'."""
+        if self._parser is None:
+            return check
+
+        def checkParsed(s):
+            self.value()
+            if self._parseError is not None:
+                return self._parseError
+            return check(s)
+        return checkParsed
+
+    def _useChunks(self, text):
+        return self._chunkCheck is not None and len(text) >= self._chunkThreshold
+
+    def runChunkCheck(self, text=None):
+        """Run `chunkCheck` over the whole text at once.
+
+        :param text: str, text to validate (default current text)
+        :return: error status
+        """
+        if text is None:
+            text = self.text()
+        gen = self._chunkCheck(self)
+        next(gen)
+        return _sendChunks(gen, text, 0, self._chunkSize)[1]
+
+    def _startChunkCheck(self, text):
+        """Start validating 'text' with `chunkCheck` one time slice per event loop iteration."""
+        self._cancelChunkCheck()
+        gen = self._chunkCheck(self)
+        next(gen)
+        self._chunkJob = [gen, text, 0]
+        if self._chunkTimer is None:
+            self._chunkTimer = QtCore.QTimer(self)
+            self._chunkTimer.setInterval(0)
+            self._chunkTimer.timeout.connect(self._onChunkTimer)
+        self.validationProgress.emit(0.0)
+        self._chunkTimer.start()
+        self._useValidatingColors()
+        self._statusInputChanged('validating')
+
+    def _useValidatingColors(self):
+        """Add `validatingColors` to the automatic colors the first time background validation runs."""
+        if 'validating' in self._autoColors:
+            return
+        self._autoColors['validating'] = self.validatingColors
+        if not self._staticColors:
+            self.setColors()
+
+    def _cancelChunkCheck(self):
+        """Stop a running background chunkCheck without changing the error status."""
+        if self._chunkJob is None:
+            return
+        self._chunkTimer.stop()
+        self._chunkJob[0].close()
+        self._chunkJob = None
+
+    def _onChunkTimer(self):
+        gen, text, pos = self._chunkJob
+        with _span('chunkCheck', self):
+            try:
+                done, err, pos = _sendChunks(gen, text, pos, self._chunkSize,
+                                             time.perf_counter() + self.chunkTimeSlice)
+            except:
+                self._cancelChunkCheck()
+                self._statusInputChanged('validating')
+                self._wakeWaiters()
+                raise
+        if not done:
+            self._chunkJob[2] = pos
+            self.validationProgress.emit(pos / len(text))
+            return
+
+        self._chunkTimer.stop()
+        self._chunkJob = None
+        self.validationProgress.emit(1.0)
+        self.setError(err)
+        self._statusInputChanged('validating')
+        self._wakeWaiters()
+
+    def _startAsyncCheck(self, awaitable):
+        """Run an async errorCheck result as a task, superseding any running one."""
+        self._cancelAsyncCheck()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            from entrywidget_async import AsyncioDriver
+            driver = AsyncioDriver.current()
+            if driver is None:
+                self._runAsyncCheckNow(awaitable)
                 return
-        self.update()
+            loop = driver.loop
+            driver.wake()
+        self._asyncTask = task = asyncio.ensure_future(awaitable, loop=loop)
+        task.add_done_callback(self._onAsyncCheckDone)
+        self._useValidatingColors()
+        self._statusInputChanged('validating')
+
+    def _runAsyncCheckNow(self, awaitable):
+        """Run an async errorCheck result to completion, blocking, when no asyncio loop is driven."""
+        global _syncLoop
+        if _syncLoop is None:
+            _syncLoop = asyncio.new_event_loop()
+        with _span('asyncCheckNow', self):
+            try:
+                status = _syncLoop.run_until_complete(awaitable)
+            except Exception as exc:
+                self.logger.error('errorCheck raised %r', exc)
+                return
+        self.setError(status)
+
+    def _cancelAsyncCheck(self):
+        """Cancel a running async errorCheck without changing the error status."""
+        if self._asyncTask is None:
+            return
+        self._asyncTask.cancel()
+        self._asyncTask = None
+
+    def _cancelValidation(self):
+        """Stop any background validation, waking validated() callers."""
+        if self.isValidating():
+            self._cancelChunkCheck()
+            self._cancelAsyncCheck()
+            self._statusInputChanged('validating')
+        self._wakeWaiters()
+
+    def _onAsyncCheckDone(self, task):
+        if task is not self._asyncTask or sip.isdeleted(self):
+            return  # superseded
+        self._asyncTask = None
+        exc = None if task.cancelled() else task.exception()
+        with _span('asyncCheckDone', self):
+            if exc is not None:
+                self.logger.error('errorCheck raised %r', exc)
+            elif not task.cancelled():
+                self.setError(task.result())
+            self._statusInputChanged('validating')
+        self._wakeWaiters(exc)
+
+    def _wakeWaiters(self, exc=None):
+        """Resolve validated() futures once no validation is running."""
+        if not self._settleWaiters or self.isValidating():
+            return
+        waiters, self._settleWaiters = self._settleWaiters, []
+        for f in waiters:
+            if f.done():
+                continue
+            if exc is None:
+                f.set_result(None)
+            else:
+                f.set_exception(exc)
+
+    def isValidating(self):
+        """Whether a background chunkCheck or async errorCheck is still running (validation is partial).
+
+        :return: bool
+        """
+        return self._chunkJob is not None or self._asyncTask is not None
+
+    async def validated(self):
+        """Wait until no background chunkCheck or async errorCheck is running.
+        Re-raises an exception raised by an async errorCheck.
+
+        :return: settled error status
+        """
+        while self.isValidating():
+            future = asyncio.get_running_loop().create_future()
+            self._settleWaiters.append(future)
+            await future
+        return self._error
+
+    def setError(self, status):
+        """Set the error status, emitting error signals if it changed.
+        An awaitable status (the result of an `async def` errorCheck) is awaited in the background,
+        cancelling any one still running; the widget is 'validating' until it sets the error status.
+
+        :param status: new error status, or awaitable of it
+        :return:
+        """
+        if inspect.isawaitable(status):
+            self._startAsyncCheck(status)
+            return
+        superseded = self._asyncTask is not None
+        self._cancelAsyncCheck()
+        with _span('setError', self):
+            ErrorMixin.setError(self, status)
+        if superseded:
+            self._statusInputChanged('validating')
+            self._wakeWaiters()
 
     def getStatus(self):
-        """Get widget status for color selection.
+        """Compute widget status for color selection.
+        The result is cached as `status`, see `statusDependencies` and `refreshStatus`.
 
         :return: str, key for use in colors dict
         """
-        if bool(self._error):
+        if self.isValidating() and self.isEnabled() is True and self.isReadOnly() is False:
+            status = 'validating'
+        elif bool(self._error):
             status = 'error'
             if self.isEnabled() is False or self.isReadOnly() is True:
                 status += '-readonly'
@@ -147,12 +861,67 @@ class AutoColorLineEdit(QLineEdit, ErrorMixin):
             status = 'disabled'
         elif self.isReadOnly() is True:
             status = 'readonly'
-        elif self.text() == '':
+        elif self._blank is True:
             status = 'blank'
         else:
             status = 'default'
         return status
-    status = pyqtProperty(str, getStatus)
+
+    def currentStatus(self):
+        """Get cached widget status, as last computed by `getStatus`.
+
+        :return: str, key for use in colors dict
+        """
+        return self._status
+    status = pyqtProperty(str, currentStatus)
+
+    def refreshStatus(self):
+        """Recompute the cached status, updating widget colors if it changed.
+
+        :return: bool, whether status changed
+        """
+        status = self.getStatus()
+        if status == self._status:
+            return False
+        self._status = status
+        self.update()
+        return True
+
+    def _statusInputChanged(self, *inputs):
+        """Refresh the cached status if any of 'inputs' is in `statusDependencies`."""
+        if self._status is None:
+            return  # still constructing
+        deps = self.statusDependencies
+        for i in inputs:
+            if i in deps:
+                if _deferredWidgets is not None:
+                    _deferredWidgets[self] = None
+                else:
+                    self.refreshStatus()
+                return
+
+    def _syncText(self, text):
+        """Update state derived from text after it was set with signals blocked.
+
+        :param text: str, current text
+        :return:
+        """
+        if self._parser is not None:
+            self._updateValue()
+        blank = text == ''
+        if blank is not self._blank:
+            self._blank = blank
+            self._statusInputChanged('text', 'blank')
+        else:
+            self._statusInputChanged('text')
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        t = event.type()
+        if t == QtCore.QEvent.EnabledChange:
+            self._statusInputChanged('enabled')
+        elif t == QtCore.QEvent.ReadOnlyChange:
+            self._statusInputChanged('readOnly')
 
     def makeStyleString(self, colors=None):
         """Get a styleSheet string built from provided 'colors' or the defaults.
@@ -168,55 +937,127 @@ class AutoColorLineEdit(QLineEdit, ErrorMixin):
         elif isinstance(colors, str):
             colors = self._autoColors[colors]
 
-        if _isColorDict(colors):
-            string = ''
-            for k, v in colors.items():
-                v0, v1 = v
-                if isinstance(v0, QColor):
-                    v0 = v0.getRgb()[:2]
-                if isinstance(v1, QColor):
-                    v1 = v1.getRgb()[:2]
-
-                if isinstance(v0, tuple):
-                    v0 = "rgb{}".format(str(v0[:])).replace(' ', '')
-                if isinstance(v1, tuple):
-                    v1 = "rgb{}".format(str(v1[:])).replace(' ', '')
-                string += "AutoColorLineEdit[status='" + str(k) + "'] {background-color: " + str(v0) + "; color: " + str(v1) + ";}\n"
+        isDict = isinstance(colors, dict)
+        key = tuple(colors.items()) if isDict else colors
+        try:
+            hash(key)
+        except TypeError:  # QColors, lists
+            return _styleString(colors)
+        return _cachedStyleString(key, isDict)
 
-        elif _isColorTuple(colors):
-            v0, v1 = colors[0], colors[1]
-            if isinstance(v0, QColor):
-                v0 = v0.getRgb()[:2]
-            if isinstance(v1, QColor):
-                v1 = v1.getRgb()[:2]
+    def setLiveErrorChecking(self, mode):
+        """Enable or disable liveErrorChecking.
 
-            if isinstance(v0, tuple):
-                v0 = "rgb{}".format(str(v0[:])).replace(' ', '')
-            if isinstance(v1, tuple):
-                v1 = "rgb{}".format(str(v1[:])).replace(' ', '')
-            string = "AutoColorLineEdit {background-color: " + str(v0) + "; color: " + str(v1) + ";}\n"
+        :param mode: bool, or 'adaptive' to choose by errorCheck latency, see `liveCheckMode`
+        :return:
+        """
+        self._setLiveMode(mode)
+
+        if self._liveErrorChecking is True:
+            self.setError(self._timedErrorCheck())
 
+    def _setLiveMode(self, mode):
+        if mode == 'adaptive':
+            if self._adaptive is None:
+                self._adaptive = _AdaptiveCheck(self)
+            self._liveErrorChecking = self._adaptive.mode != 'editingFinished'
         else:
-            raise TypeError(f'Invalid format: {type(colors)} {colors}')
-        return string
+            if self._adaptive is not None:
+                self._adaptive.timer.stop()
+                self._adaptive = None
+            self._liveErrorChecking = mode
 
-    def setLiveErrorChecking(self, mode):
-        """Enable or disable liveErrorChecking.
+    def liveCheckMode(self):
+        """Get when errorCheck runs while typing: 'live' on every keystroke, 'debounced' after typing pauses
+        for `adaptiveDebounce` ms, or 'editingFinished'. 'adaptive' liveErrorChecking switches between them,
+        see `liveCheckDecisions` for its recent decisions.
 
-        :param mode: bool
-        :return:
+        :return: str
         """
-        self._liveErrorChecking = mode
+        if self._adaptive is not None:
+            return self._adaptive.mode
+        return 'live' if self._liveErrorChecking is True else 'editingFinished'
 
-        if mode is True:
-            self.setError(self.errorCheck(self))
+    def liveCheckDecisions(self):
+        """Get the recent mode switches of 'adaptive' liveErrorChecking, oldest first.
+
+        :return: list of dict {'time': time.time(), 'from': mode, 'to': mode, 'latency': median s}
+        """
+        return [] if self._adaptive is None else list(self._adaptive.decisions)
+
+    def checkLatency(self):
+        """Get the median latency of the recent errorChecks measured by 'adaptive' liveErrorChecking.
+
+        :return: float s, None if not measured
+        """
+        return None if self._adaptive is None else self._adaptive.latency()
 
     def update(self):
         """Update widget colors"""
         # self.logger.log(logging.DEBUG - 1, "update: status: '%s' error: '%s' disabled: %s readonly: %s text: '%s'"%
         #             (self.status, str(self.getError()), str(not self.isEnabled()), str(self.isReadOnly()), self.text())
         #             )
-        self.style().polish(self)
+        if self._palettes is not None:
+            self._applyPalette()
+            return
+        if self._statusRules is not None:
+            self._applyStatusRule()
+            return
+        with _span('polish', self):
+            self.style().polish(self)
+
+    def setDirectPaint(self, mode, colors=None):
+        """Color the widget with a palette per status instead of a styleSheet.
+        The palettes are resolved from the colors once (and shared between widgets with the same colors),
+        and applied when the status changes; the widget paints with them directly, without the
+        styleSheet engine restyling it on status changes and repaints.
+        Status keys, setColors and custom getStatus work the same; statuses without colors use the default palette.
+        The palettes follow application palette changes; turning directPaint off restores the widget's palette.
+
+        :param mode: bool
+        :param colors: colors to set, see setColors (default stored colors)
+        :return:
+        """
+        if mode:
+            if self._palettes is None and self.testAttribute(QtCore.Qt.WA_SetPalette):
+                self._ownPalette = QPalette(self.palette())
+            self._palettes = {}
+            super().setStyleSheet('')
+        elif self._palettes is not None:
+            self._palettes = self._palette = None
+            own, self._ownPalette = self._ownPalette, None
+            QWidget.setPalette(self, QPalette() if own is None else own)
+        self.setColors(colors)
+
+    def isDirectPaint(self):
+        return self._palettes is not None
+
+    def _applyPalette(self):
+        palettes = self._palettes
+        palette = palettes.get(self._status, palettes.get(None))
+        if palette is None:
+            palette = QPalette()
+        if palette is not self._palette:
+            self._palette = palette
+            with _span('palette', self):
+                QWidget.setPalette(self, palette)
+
+    def _applyStatusRule(self):
+        rule = self._statusRules.get(self._status, '')
+        if rule != self.styleSheet():
+            with _span('styleRule', self):
+                super().setStyleSheet(rule)
+
+    def _makeStatusRules(self, colors):
+        """Get {status: single rule styleSheet} for a color dict, sharing rules between widgets."""
+        rules = {}
+        for k, v in colors.items():
+            key = (_colorKey(v[0]), _colorKey(v[1]))
+            rule = _ruleCache.get(key)
+            if rule is None:
+                rule = _ruleCache[key] = self.makeStyleString(v)
+            rules[k] = rule
+        return rules
 
     def autoColors(self):
         """Get current color settings dict.
@@ -231,7 +1072,9 @@ class AutoColorLineEdit(QLineEdit, ErrorMixin):
 
         If colors is a dict (format below), updates the automatic colors,
             where each key represents a different `widget.status`.
-        A custom set of `status`s can be used by overriding `getStatus` and providing a custom dict.
+        A custom set of `status`s can be used by overriding `getStatus` and providing a custom dict,
+            listing the inputs the override reads in `statusDependencies`.
+            With more than `statusRuleLimit` statuses, the styleSheet only holds the current status's rule.
 
         :param colors: dict of tuples of color strings or QColors
             dict format:
@@ -241,7 +1084,9 @@ class AutoColorLineEdit(QLineEdit, ErrorMixin):
                     'disabled': X,          # box is not editable or selectable
                     'readonly': X,          # box is not editable
                     'error': X,             # box is editable and has an error
-                    'error-readonly': X     # box is not editable, but has an error
+                    'error-readonly': X,    # box is not editable, but has an error
+                    'validating': X         # box is editable, background validation is running
+                                            # (default `validatingColors`, added when it first runs)
                 }
                 *all keys are optional, dict update currently stored autoColors.
                 Where each X matches the format below.
@@ -262,6 +1107,20 @@ class AutoColorLineEdit(QLineEdit, ErrorMixin):
             colors = self._autoColors[colors]
         else:
             raise TypeError(f"Provide `None`, color dict, color tuple, or str; not {colors}")
+        self._staticColors = not _isColorDict(colors)
+        self._statusRules = None
+        if self._palettes is not None:
+            if _isColorDict(colors):
+                self._palettes = {k: _statusPalette(v) for k, v in colors.items()}
+            else:
+                self._palettes = {None: _statusPalette(colors)}
+            self._palette = None
+            self._applyPalette()
+            return
+        if _isColorDict(colors) and len(colors) > self.statusRuleLimit:
+            self._statusRules = self._makeStatusRules(colors)
+            self._applyStatusRule()
+            return
         super().setStyleSheet(self.makeStyleString(colors))
 
     def setReadOnly(self, status):
@@ -272,7 +1131,6 @@ class AutoColorLineEdit(QLineEdit, ErrorMixin):
         """
         super().setReadOnly(status)
         self.setClearButtonEnabled(not status)
-        self.update()
 
     def setDisabled(self, status=True):
         """Set the box disabled or enabled.
@@ -294,7 +1152,6 @@ class AutoColorLineEdit(QLineEdit, ErrorMixin):
         """
         super().setEnabled(status)
         self.setClearButtonEnabled(status)
-        self.update()
 
     @classmethod
     def popArgs(cls, kwargs):
@@ -325,6 +1182,9 @@ class EntryWidget(QWidget):
     Widget kwargs
     :param parent: Parent Qt Object (default None for individual widget)
     :param errorCheck: callable, returns error status, called with widget as first argument
+    :param optionChecks: {option: errorCheck, ...}, errorCheck to use while an option is selected, see setOptionChecks
+    :param parser: callable(text, data) -> value, converts the text for the selected option's data, see `value`
+    :param valueCheck: callable(value) -> error status, called with the parsed value
     :param objectName: str, name of object for logging and within Qt
     :param readOnly: bool, whether the text box is editable
 
@@ -332,11 +1192,13 @@ class EntryWidget(QWidget):
     :param text: str, starting text
     :param colors: dict or tuple of colors; see help(setColors) for formatting
     :param liveErrorChecking: bool, whether error checking occurs
-                after every keystroke (=True) or only after text editing is finished (=False)
+                after every keystroke (=True) or only after text editing is finished (=False), or 'adaptive'
 
     DictComboBox kwargs
     :param options: [str, str, ...] or {str:data, str:data, ...}
     :param optionFixed: bool, whether option is fixed or can be changed
+    :param lazy: bool, whether to postpone creating the DictComboBox and layout until the widget is first shown
+                or `comboBox` is first used; options and selection work the same before then
     """
     name = loggableQtName
     errorChanged = ErrorMixin.errorChanged
@@ -345,28 +1207,30 @@ class EntryWidget(QWidget):
 
     defaultColors = AutoColorLineEdit.defaultColors.copy()
     defaultArgs = AutoColorLineEdit.defaultArgs.copy()
-    defaultArgs.update({'options': {'opt1':'opt1 Data', 'opt2':'opt2 Data'}, 'optionFixed': False})
-
-    # delegate methods to DictComboBox
-    getSelected, setSelected, setOptionFixed, currentData = \
-        delegated.methods('comboBox', 'currentText, setCurrentText, setDisabled, currentData')
-    getOptions, setOptions = delegated.methods('comboBox', 'allItems setAllItems')
+    defaultArgs.update({'options': {'opt1':'opt1 Data', 'opt2':'opt2 Data'}, 'optionFixed': False, 'lazy': False,
+                        'optionChecks': None})
 
     # delegate methods to AutoColorLineEdit
     text, setText = delegated.methods('lineEdit', 'text, setText')
     text_ = pyqtProperty(str, lambda s: s.lineEdit.text(), lambda s, t: s.lineEdit.setText(t))
     clear, setClearButtonEnabled = delegated.methods('lineEdit', 'clear setClearButtonEnabled')
     setColors, setLiveErrorChecking = delegated.methods('lineEdit', 'setColors, setLiveErrorChecking')
+    setDirectPaint, isDirectPaint = delegated.methods('lineEdit', 'setDirectPaint, isDirectPaint')
     setError, getError, clearError = delegated.methods('lineEdit', 'setError, getError, clearError')
+    isValidating, validated = delegated.methods('lineEdit', 'isValidating, validated')
+    liveCheckMode, liveCheckDecisions, checkLatency = delegated.methods(
+        'lineEdit', 'liveCheckMode, liveCheckDecisions, checkLatency')
+    value, parseError = delegated.methods('lineEdit', 'value, parseError')
 
     # delegate AutoColorLineEdit signals
     textChanged, editingFinished, textEdited = delegated.attributes('lineEdit', 'textChanged, editingFinished, textEdited')
+    validationProgress, liveCheckModeChanged, valueChanged = delegated.attributes(
+        'lineEdit', 'validationProgress, liveCheckModeChanged, valueChanged')
 
-    # delegate DictComboBox signals
-    dataChanged = delegated.attribute('comboBox', 'dataChanged')
     # signals triggered by DictComboBox (re-emitted to allow multiple formats)
     optionChanged = pyqtSignal([],[str])  # currentTextChanged
     optionIndexChanged = pyqtSignal([],[int])  # currentIndexChanged
+    dataChanged = pyqtSignal([],[object])  # dataChanged
 
     def __init__(self, parent=None, **kwargs):
         QWidget.__init__(self, parent=parent)
@@ -379,53 +1243,343 @@ class EntryWidget(QWidget):
             self.setError(self.errorCheck(self))
         except:
             pass
+        self.lineEdit._baseReceivers = _receiverCounts(self.lineEdit, self.lineEdit.resettableSignals)
+        self._baseReceivers = self._receiverCounts()
 
     def setupUi(self, kwargs):
         options = kwargs.pop('options', self.defaultArgs['options'])
         optionFixed = kwargs.pop('optionFixed', self.defaultArgs['optionFixed'])
+        lazy = kwargs.pop('lazy', self.defaultArgs['lazy'])
+        optionChecks = kwargs.pop('optionChecks', self.defaultArgs['optionChecks'])
 
-        # connect signals to simpler versions
-        self.errorChanged[object].connect(lambda o: self.errorChanged[str].emit(str(o)))
-        self.errorChanged[object].connect(lambda o: self.errorChanged.emit())
-        self.hasError[object].connect(lambda o: self.hasError[str].emit(str(o)))
-        self.hasError[object].connect(lambda o: self.hasError.emit())
-        self.optionChanged[str].connect(lambda o: self.optionChanged.emit())
-        self.optionIndexChanged[int].connect(lambda o: self.optionIndexChanged.emit())
+        # options and selection are held here until the DictComboBox is created
+        self._combo = None
+        self._comboCache = self._comboModel = None  # see _comboItems
+        self._optionTexts, self._optionData = _splitOptions(options)
+        self._selectedIndex = 0 if self._optionTexts else -1
+        self._optionEnabled = not optionFixed
 
-        self.logger = logging.getLogger(self.name)
-        self.logger.addHandler(logging.NullHandler())
+        self.logger = _widgetLogger(self)
 
         ec = kwargs.get('errorCheck', None)
         if ec is not None:
             kwargs['errorCheck'] = lambda s: ec(self)
-        self.lineEdit = lineEdit = AutoColorLineEdit(parent=self, **kwargs)
-        lineEdit.errorCleared.connect(self.errorCleared.emit)
-        lineEdit.errorChanged[object].connect(self.errorChanged[object].emit)
-        lineEdit.hasError[object].connect(self.hasError[object].emit)
-
-        self.comboBox = combo = DictComboBox(parent=self, options=options)
-        combo.setDisabled(optionFixed)
+        cc = kwargs.get('chunkCheck', None)
+        if cc is not None:
+            kwargs['chunkCheck'] = lambda s: cc(self)
+        parser = kwargs.get('parser', None)
+        if parser is not None:
+            kwargs['parser'] = lambda text: parser(text, self.currentData())
+        self.lineEdit = AutoColorLineEdit(parent=self, **kwargs)
+        self.lineEdit._valueContext = self.currentData
+        self._lineEditCheck = self.lineEdit.errorCheck
+        self._fallbackCheck = ec if ec is not None else self._lineEditCheck
+        self._optionChecks = None
+        if optionChecks:
+            self.setOptionChecks(optionChecks)
+        self._connectSignals()
+
+        if not lazy:
+            self._createComboBox()
+
+    def _createComboBox(self):
+        """Create the DictComboBox from the held options and selection, and the layout."""
+        self._combo = combo = DictComboBox(parent=self, options=dict(zip(self._optionTexts, self._optionData)))
+        if combo.currentIndex() != self._selectedIndex:
+            blocked = combo.blockSignals(True)
+            combo.setCurrentIndex(self._selectedIndex)
+            combo.blockSignals(blocked)
+        combo.setEnabled(self._optionEnabled)
+        self._optionTexts = self._optionData = None
         # combo.setSizeAdjustPolicy(DictComboBox.AdjustToContents)
         combo.currentIndexChanged[int].connect(self.optionIndexChanged[int].emit)
         combo.currentTextChanged[str].connect(self.optionChanged[str].emit)
         combo.currentTextChanged[str].connect(self._onOptionChanged)
+        combo.dataChanged[object].connect(self.dataChanged[object].emit)
 
         layout = QHBoxLayout(self)
-        layout.addWidget(lineEdit)
+        layout.addWidget(self.lineEdit)
         layout.addWidget(combo)
         layout.setContentsMargins(0,0,0,0)
         self.setLayout(layout)
 
+    @property
+    def comboBox(self):
+        """The DictComboBox, created on first use if the widget is lazy."""
+        if self._combo is None:
+            self._createComboBox()
+        return self._combo
+
+    def showEvent(self, event):
+        if self._combo is None:
+            self._createComboBox()
+        super().showEvent(event)
+
+    def _selectLazily(self, index):
+        """Change the held selection, emitting the signals the DictComboBox would."""
+        if index == self._selectedIndex:
+            return
+        self._selectedIndex = index
+        if self.signalsBlocked():
+            return
+        text = self.getSelected()
+        self.optionIndexChanged[int].emit(index)
+        self.dataChanged[object].emit(self.currentData())
+        self.optionChanged[str].emit(text)
+        self._onOptionChanged(text)
+
+    def getOptions(self):
+        """Get options.
+
+        :return: dict {str:data, str:data, ...}
+        """
+        if self._combo is not None:
+            return self._combo.allItems()
+        return dict(zip(self._optionTexts, self._optionData))
+
+    def setOptions(self, options):
+        """Replace all options, inserting, removing and updating only the items which differ.
+        The selected option stays selected if it is still an option, else the first option is selected.
+        optionIndexChanged, dataChanged and optionChanged are emitted (and errorCheck run) only for
+        what changed about the selection; the DictComboBox's own signals are not emitted.
+
+        :param options: [str, str, ...] or {str:data, str:data, ...}
+        :return:
+        """
+        texts, data = _splitOptions(options)
+        old = self._selection()
+        if self._combo is None:
+            self._optionTexts, self._optionData = texts, data
+            if old[0] >= 0 and old[1] in texts:
+                self._selectedIndex = texts.index(old[1])
+            else:
+                self._selectedIndex = 0 if texts else -1
+        else:
+            combo = self._combo
+            oldTexts, oldData = self._comboItems()
+            blocked = combo.blockSignals(True)
+            try:
+                _updateComboItems(combo, texts, data, oldTexts, oldData)
+                index = combo.findText(old[1], QtCore.Qt.MatchExactly | QtCore.Qt.MatchCaseSensitive) \
+                    if old[0] >= 0 else -1
+                if index < 0:
+                    index = 0 if texts else -1
+                if combo.currentIndex() != index:
+                    combo.setCurrentIndex(index)
+            finally:
+                combo.blockSignals(blocked)
+            self._comboCache = (texts, data)
+        self._checkIndex = None
+        self._selectionChanged(old)
+
+    def _comboItems(self):
+        """Get (texts, data) of the DictComboBox items; cached from setOptions until the items are changed otherwise."""
+        combo = self._combo
+        if self._comboCache is not None and self._comboModel is combo.model():
+            return self._comboCache
+        if self._comboModel is not combo.model():
+            self._comboModel = model = combo.model()
+            for signal in (model.rowsInserted, model.rowsRemoved, model.rowsMoved, model.dataChanged,
+                           model.modelReset, model.layoutChanged):
+                signal.connect(self._invalidateComboItems)
+        n = combo.count()
+        return [combo.itemText(i) for i in range(n)], [combo.itemData(i) for i in range(n)]
+
+    def _invalidateComboItems(self, *args):
+        self._comboCache = None
+
+    def _selection(self):
+        return self.getSelectedIndex(), self.getSelected(), self.currentData()
+
+    def _selectionChanged(self, old):
+        """Emit signals (and run errorCheck) for what changed about the selection since 'old' _selection()."""
+        if self.signalsBlocked():
+            return
+        index, text, data = self._selection()
+        optionChanged = text != old[1] or _differs(data, old[2])
+        if index != old[0]:
+            self.optionIndexChanged[int].emit(index)
+        if optionChanged:
+            self.dataChanged[object].emit(data)
+        if text != old[1]:
+            self.optionChanged[str].emit(text)
+        if optionChanged:
+            self._onOptionChanged(text)
+
+    def optionCount(self):
+        """Get number of options.
+
+        :return: int
+        """
+        if self._combo is not None:
+            return self._combo.count()
+        return len(self._optionTexts)
+
+    def getSelected(self):
+        """Get selected option.
+
+        :return: str, '' when nothing is selected
+        """
+        if self._combo is not None:
+            return self._combo.currentText()
+        i = self._selectedIndex
+        return self._optionTexts[i] if i >= 0 else ''
+
+    def setSelected(self, option):
+        """Select an option by its text, if it exists.
+
+        :param option: str
+        :return:
+        """
+        if self._combo is not None:
+            self._combo.setCurrentText(option)
+        elif option in self._optionTexts:
+            self._selectLazily(self._optionTexts.index(option))
+
+    def getSelectedIndex(self):
+        """Get index of selected option.
+
+        :return: int, -1 when nothing is selected
+        """
+        if self._combo is not None:
+            return self._combo.currentIndex()
+        return self._selectedIndex
+
+    def setSelectedIndex(self, index):
+        """Select an option by its index.
+
+        :param index: int, -1 (or out of range) to select nothing
+        :return:
+        """
+        if self._combo is not None:
+            self._combo.setCurrentIndex(index)
+        else:
+            self._selectLazily(index if 0 <= index < len(self._optionTexts) else -1)
+
+    def currentData(self):
+        """Get data attached to selected option.
+
+        :return: data, None when nothing is selected
+        """
+        if self._combo is not None:
+            return self._combo.currentData()
+        i = self._selectedIndex
+        return self._optionData[i] if i >= 0 else None
+
+    def _setOptionEnabled(self, status):
+        if self._combo is not None:
+            self._combo.setEnabled(status)
+        else:
+            self._optionEnabled = status
+
+    def setOptionFixed(self, status):
+        """Set whether the option is fixed or can be changed.
+
+        :param status: bool, True: fixed
+        :return:
+        """
+        self._setOptionEnabled(not status)
+
+    def _connectSignals(self):
+        # connect signals to simpler versions
+        self.errorChanged[object].connect(lambda o: self.errorChanged[str].emit(str(o)))
+        self.errorChanged[object].connect(lambda o: self.errorChanged.emit())
+        self.hasError[object].connect(lambda o: self.hasError[str].emit(str(o)))
+        self.hasError[object].connect(lambda o: self.hasError.emit())
+        self.optionChanged[str].connect(lambda o: self.optionChanged.emit())
+        self.optionIndexChanged[int].connect(lambda o: self.optionIndexChanged.emit())
+        self.dataChanged[object].connect(lambda o: self.dataChanged.emit())
+
+        lineEdit = self.lineEdit
+        lineEdit.errorCleared.connect(self.errorCleared.emit)
+        lineEdit.errorChanged[object].connect(self._onErrorChanged)
+        lineEdit.hasError[object].connect(self.hasError[object].emit)
+
+    # signals cleared by resetConnections (besides lineEdit's)
+    resettableSignals = (('errorCleared', ()), ('errorChanged', (object, str)), ('hasError', (object, str)),
+                         ('optionChanged', (str,)), ('optionIndexChanged', (int,)), ('dataChanged', (object,)))
+
+    def _receiverCounts(self):
+        return _receiverCounts(self, self.resettableSignals)
+
+    def resetConnections(self):
+        """Disconnect everything connected to the widget's (and lineEdit's) signals,
+        keeping the widget's own connections.
+
+        :return: bool, whether anything was disconnected
+        """
+        le = self.lineEdit
+        if self._receiverCounts() == self._baseReceivers and \
+                _receiverCounts(le, le.resettableSignals) == le._baseReceivers:
+            return False
+        le._resetConnections()
+        _disconnectSignals(self, self.resettableSignals)
+        self._connectSignals()
+        le._baseReceivers = _receiverCounts(le, le.resettableSignals)
+        self._baseReceivers = self._receiverCounts()
+        return True
+
     @staticmethod
     def errorCheck(self):
         return self.lineEdit.errorCheck(self)
 
+    def setOptionChecks(self, checks):
+        """Validate with a different errorCheck for each option.
+        The errorCheck for the selected option is looked up once when the selection changes,
+        by option text, else by option data; options without one use the `errorCheck` kwarg.
+
+        :param checks: {option text or data: callable, ...}, callables are called with widget as first argument;
+                       None to use only the `errorCheck` kwarg again
+        :return:
+        """
+        if checks:
+            self._optionChecks = dict(checks)
+            self._checkIndex = None  # selected index the cached _activeCheck is for
+            self._activeCheck = None
+            self.lineEdit.errorCheck = self.lineEdit._withParser(lambda s: self.activeErrorCheck()(self))
+        else:
+            self._optionChecks = None
+            self.lineEdit.errorCheck = self._lineEditCheck
+
+    def activeErrorCheck(self):
+        """Get the errorCheck used for the selected option, see setOptionChecks.
+
+        :return: callable
+        """
+        if self._optionChecks is None:
+            return self._fallbackCheck
+        index = self.getSelectedIndex()
+        if index != self._checkIndex:
+            self._checkIndex = index
+            check = None
+            if index >= 0:
+                check = self._optionChecks.get(self.getSelected())
+                if check is None:
+                    try:
+                        check = self._optionChecks.get(self.currentData())
+                    except TypeError:
+                        pass  # unhashable data
+            self._activeCheck = check or self._fallbackCheck
+        return self._activeCheck
+
+    def _onErrorChanged(self, error):
+        with _span('errorChanged', self):
+            self.errorChanged[object].emit(error)
+
     def _onOptionChanged(self, text):
         self.logger.log(logging.DEBUG-1, f"optionChanged('{text}')")
-        self.setError(self.errorCheck(self))
+        self._checkIndex = None
+        with _span('optionChanged', self):
+            if self.lineEdit._parser is not None:
+                self.lineEdit._updateValue()
+            with _span('errorCheck', self):
+                err = self.errorCheck(self)
+            self.setError(err)
 
     def optionFixed(self):
-        return not self.comboBox.isEnabled()
+        if self._combo is not None:
+            return not self._combo.isEnabled()
+        return not (self._optionEnabled and self.isEnabled())
 
     def setEnabled(self, status):
         """Set the box disabled or enabled.
@@ -435,7 +1589,7 @@ class EntryWidget(QWidget):
             False: unselectable, uneditable
         :return:
         """
-        self.comboBox.setEnabled(status)
+        self._setOptionEnabled(status)
         self.lineEdit.setEnabled(status)
 
     def setReadOnly(self, status):
@@ -446,15 +1600,15 @@ class EntryWidget(QWidget):
             False: editable
         :return:
         """
-        self.comboBox.setEnabled(not status)
+        self._setOptionEnabled(not status)
         self.lineEdit.setReadOnly(status)
 
     def isReadOnly(self):
-        return self.lineEdit.isReadOnly() and (not self.comboBox.isEnabled())
+        return self.lineEdit.isReadOnly() and self.optionFixed()
 
     mkQApp = mkQApp
 
-__all__ = ['AutoColorLineEdit', 'EntryWidget']
+__all__ = ['AutoColorLineEdit', 'EntryWidget', 'deferStatusUpdates']
 
 if __name__ == '__main__':
     from qt_utils.designer import install_plugin_files
@@ -0,0 +1,136 @@
+"""Running asyncio inside the Qt event loop, for `async def` errorCheck functions.
+
+An errorCheck may be a coroutine function; widgets await its result as a task on the running
+asyncio loop (or the started AsyncioDriver's), cancel it when the text changes, and set the error when
+it finishes. Applications already integrating asyncio with Qt (e.g. with qasync) need nothing more.
+Otherwise, an AsyncioDriver steps an asyncio loop from a Qt timer; without either, async errorChecks
+run to completion at once, blocking the GUI:
+
+    driver = AsyncioDriver().start()
+
+    async def checkName(widget):
+        return not await service.nameExists(widget.text())
+
+    widget = AutoColorLineEdit(errorCheck=checkName)
+    ...
+    error = await widget.validated()  # in a coroutine running on driver.loop
+"""
+from PyQt5 import QtCore
+import asyncio
+
+
+class AsyncioDriver(QtCore.QObject):
+    """Runs the ready callbacks of an asyncio event loop on every tick of a Qt timer.
+
+    The timer stops while the loop has no tasks or callbacks; widgets starting an async errorCheck
+    restart it. Call `wake` after scheduling other work on `loop` from outside its tasks.
+
+    :param loop: asyncio event loop to drive (default a new one)
+    :param interval: int, timer interval in ms; how late timed asyncio callbacks (e.g. sleep) may run
+    :param parent: Parent Qt Object
+    """
+    _current = None  # started driver, see current
+
+    def __init__(self, loop=None, interval=2, parent=None):
+        super().__init__(parent)
+        self.loop = loop if loop is not None else asyncio.new_event_loop()
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.step)
+        self._madeCurrent = False
+        self._driving = False  # started, the timer runs whenever the loop has work
+        self._waiting = 0  # runUntilComplete calls in progress
+        self.steps = 0
+
+    @classmethod
+    def current(cls):
+        """Get the started driver, if any.
+
+        :return: AsyncioDriver or None
+        """
+        return cls._current
+
+    def start(self):
+        """Make `loop` the current asyncio event loop and start driving it.
+
+        :return: self
+        """
+        asyncio.set_event_loop(self.loop)
+        self._madeCurrent = True
+        self._driving = True
+        AsyncioDriver._current = self
+        self._timer.start()
+        return self
+
+    def stop(self):
+        """Stop driving `loop`; it keeps its pending callbacks."""
+        self._driving = False
+        if AsyncioDriver._current is self:
+            AsyncioDriver._current = None
+        self._timer.stop()
+
+    def isRunning(self):
+        return self._driving or self._timer.isActive()
+
+    def wake(self):
+        """Step `loop` again after it was idle (when started)."""
+        if self._driving and not self._timer.isActive():
+            self._timer.start()
+
+    def step(self):
+        """Run the callbacks of `loop` which are ready now; stop the timer if it has nothing left to do."""
+        if self.loop.is_running() or self.loop.is_closed():
+            return  # re-entered, e.g. a callback spun the Qt event loop
+        self.steps += 1
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        if not self._waiting and self._idle():
+            self._timer.stop()
+
+    def _idle(self):
+        loop = self.loop
+        return not (getattr(loop, '_ready', True) or getattr(loop, '_scheduled', True) or asyncio.all_tasks(loop))
+
+    def runUntilComplete(self, awaitable, timeout=None):
+        """Run the Qt event loop (and so `loop`) until 'awaitable' is done.
+
+        :param awaitable: coroutine or future
+        :param timeout: float, seconds to wait before raising asyncio.TimeoutError (default forever)
+        :return: result of 'awaitable'
+        """
+        future = asyncio.ensure_future(awaitable, loop=self.loop)
+        eventLoop = QtCore.QEventLoop()
+        future.add_done_callback(lambda f: eventLoop.quit())
+        if timeout is not None:
+            QtCore.QTimer.singleShot(int(timeout * 1000), eventLoop.quit)
+        self._waiting += 1
+        self._timer.start()
+        try:
+            if not future.done():
+                eventLoop.exec_()
+        finally:
+            self._waiting -= 1
+            if not self._driving or not self._waiting and self._idle():
+                self._timer.stop()
+        if not future.done():
+            future.cancel()
+            raise asyncio.TimeoutError()
+        return future.result()
+
+    def close(self):
+        """Stop driving `loop`, cancel its tasks and close it."""
+        self.stop()
+        if self.loop.is_closed():
+            return
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+        if self._madeCurrent:
+            asyncio.set_event_loop(None)
+            self._madeCurrent = False
+
+
+__all__ = ['AsyncioDriver']
@@ -0,0 +1,348 @@
+"""Two-way binding of entry widgets to cells of a columnar store.
+
+The store is a mapping of column name to a mutable 1-D sequence indexed by row: numpy arrays
+(e.g. a dict of arrays, or the fields of a structured array), lists, or anything alike.
+numpy is not required, but numpy columns are read with one fancy-indexing call per column.
+
+    binding = ColumnBinding(store, parsers={'length': float})
+    binding.bind(lengthWidget, 'length', row=12, optionColumn='unit')
+    binding.setColumnCheck('length', lambda values: values < 0)  # vectorised errorCheck
+
+    store['length'][changedRows] = newValues  # e.g. in a background computation
+    binding.storeChanged('length', changedRows)  # applied to bound widgets on the next event loop tick
+
+Edits in bound widgets are written back to the store in batches, see `flush`.
+"""
+from PyQt5 import QtCore, sip
+from PyQt5.QtCore import pyqtSignal
+
+from entrywidget import EntryWidget, deferStatusUpdates, _scalar
+
+
+def _take(values, rows):
+    """Get values[rows] for a list of rows, with one call for numpy-like columns."""
+    if hasattr(values, 'dtype'):
+        return values[rows]
+    return [values[r] for r in rows]
+
+
+class ColumnBinding(QtCore.QObject):
+    """Binds AutoColorLineEdit/EntryWidget text (and EntryWidget options) to (column, row) cells of a store.
+
+    Store to widgets: after `storeChanged`, changed cells are applied in one coalesced pass on the next
+    event loop tick, to visible bound widgets only; hidden ones are updated when they are shown.
+    Text is set without emitting textChanged, then validated with the column's vectorised check
+    (see `setColumnCheck`) or else each widget's errorCheck.
+
+    Widgets to store: edits are collected and written on the next event loop tick (or by `flush`),
+    converted with the column's parser; the `storeWritten` signal then reports the written cells.
+    Edits in columns with a column check are validated by it when written, not by the widget's errorCheck;
+    edits the column's parser fails on are errors.
+
+    Widgets are unbound when they are destroyed.
+
+    :param store: mapping of column name to mutable sequence
+    :param formats: dict {column: callable(value) -> str}, default str
+    :param parsers: dict {column: callable(str) -> value}, default the column's dtype type, or no conversion
+    :param parent: Parent Qt Object
+    """
+    storeWritten = pyqtSignal(object)  # {column: [row, ...]} written from widget edits
+
+    def __init__(self, store, formats=None, parsers=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.formats = dict(formats or {})
+        self.parsers = dict(parsers or {})
+        self._columnChecks = {}
+        self._cells = {}  # widget: (column, row, optionColumn)
+        self._slots = {}  # widget: connected (signal, slot) pairs
+        self._errorChecks = {}  # widget: (line edit, its errorCheck before binding)
+        self._byColumn = {}  # column: {row: [widgets]}, for text and option columns
+        self._storeDirty = {}  # column: set of rows, or None for all rows
+        self._edited = {}  # widget: None, edited since last flush
+        self._stale = set()  # hidden widgets to update when shown
+        self.updateCount = self.writeCount = self.parseFailures = 0
+
+        self._applyTimer = self._makeTimer(self.applyStoreChanges)
+        self._flushTimer = self._makeTimer(self.flush)
+
+    def _makeTimer(self, slot):
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(0)
+        timer.timeout.connect(slot)
+        return timer
+
+    def __len__(self):
+        """Number of bound widgets"""
+        return len(self._cells)
+
+    def bind(self, widget, column, row, optionColumn=None):
+        """Bind a widget's text to store[column][row], and an EntryWidget's selected option to
+        store[optionColumn][row]. The widget is updated from the store immediately.
+
+        :param widget: EntryWidget or AutoColorLineEdit
+        :param column: text column name
+        :param row: int
+        :param optionColumn: option column name (EntryWidget only)
+        :return:
+        """
+        if widget in self._cells:
+            self.unbind(widget)
+        self._cells[widget] = (column, row, optionColumn)
+        self._index(widget, add=True)
+
+        le = widget.lineEdit if isinstance(widget, EntryWidget) else widget
+        slot = lambda *args: self._onEdited(widget)
+        slots = [(le.textChanged[str], slot), (widget.destroyed, lambda: self._forget(widget))]
+        if optionColumn is not None:
+            slots.append((widget.optionChanged[str], slot))
+        for signal, s in slots:
+            signal.connect(s)
+        self._slots[widget] = slots
+
+        errorCheck = le.errorCheck
+        self._errorChecks[widget] = (le, errorCheck)
+        le.errorCheck = lambda s: widget.getError() if column in self._columnChecks else errorCheck(s)
+        self._load([widget])
+
+    def unbind(self, widget):
+        """Stop binding a widget. Pending edits are written first.
+
+        :param widget: bound widget
+        :return:
+        """
+        if widget in self._edited:
+            self.flush()
+        for signal, slot in self._slots.pop(widget, ()):
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+        le, errorCheck = self._errorChecks.pop(widget)
+        le.errorCheck = errorCheck
+        self._index(widget, add=False)
+        del self._cells[widget]
+        if widget in self._stale:
+            self._stale.discard(widget)
+            widget.removeEventFilter(self)
+
+    def _forget(self, widget):
+        """Drop a destroyed widget, without reading it."""
+        if widget not in self._cells:
+            return
+        self._slots.pop(widget, None)
+        self._errorChecks.pop(widget, None)
+        self._edited.pop(widget, None)
+        self._stale.discard(widget)
+        self._index(widget, add=False)
+        del self._cells[widget]
+
+    def rebind(self, widget, row):
+        """Move a bound widget to another row of the same columns, e.g. when scrolling.
+
+        :param widget: bound widget
+        :param row: int
+        :return:
+        """
+        column, _, optionColumn = self._cells[widget]
+        self.bind(widget, column, row, optionColumn)
+
+    def cell(self, widget):
+        """Get the cell a widget is bound to.
+
+        :return: tuple (column, row, optionColumn)
+        """
+        return self._cells[widget]
+
+    def setColumnCheck(self, column, check):
+        """Validate the widgets bound to a text column with one vectorised call instead of their errorChecks.
+
+        :param column: text column name
+        :param check: callable(values) -> error statuses, called with the values of the rows to check
+                      (a numpy array for numpy columns); None to use errorChecks again
+        :return:
+        """
+        if check is None:
+            self._columnChecks.pop(column, None)
+        else:
+            self._columnChecks[column] = check
+
+    def storeChanged(self, column, rows=None):
+        """Report changed store cells; bound widgets are updated on the next event loop tick,
+        coalesced with any other changes reported until then.
+
+        :param column: column name
+        :param rows: iterable of int, None for all rows
+        :return:
+        """
+        if column not in self._byColumn:
+            return
+        if rows is None:
+            self._storeDirty[column] = None
+        else:
+            dirty = self._storeDirty.setdefault(column, set())
+            if dirty is not None:
+                dirty.update(rows)
+        self._applyTimer.start()
+
+    def applyStoreChanges(self):
+        """Update visible widgets bound to changed cells now.
+
+        :return: int, number of widgets updated
+        """
+        self._applyTimer.stop()
+        dirty, self._storeDirty = self._storeDirty, {}
+        widgets = {}
+        for column, rows in dirty.items():
+            byRow = self._byColumn.get(column, {})
+            if rows is None:
+                rows = byRow.keys()
+            for r in rows:
+                for w in byRow.get(r, ()):
+                    widgets[w] = None
+
+        visible = []
+        for w in widgets:
+            if sip.isdeleted(w):
+                continue
+            if w.isVisible():
+                visible.append(w)
+            elif w not in self._stale:
+                self._stale.add(w)
+                w.installEventFilter(self)
+        return self._load(visible)
+
+    def flush(self):
+        """Write edits of bound widgets to the store now.
+
+        :return: int, number of cells written
+        """
+        self._flushTimer.stop()
+        edited, self._edited = self._edited, {}
+        written = {}
+        for w in edited:
+            if sip.isdeleted(w):
+                continue
+            column, row, optionColumn = self._cells[w]
+            try:
+                value = self._parser(column)(w.text())
+            except (TypeError, ValueError):
+                self.parseFailures += 1
+                if column in self._columnChecks:
+                    w.setError(True)  # the column check only sees parsed values
+            else:
+                self.store[column][row] = value
+                written.setdefault(column, set()).add(row)
+            if optionColumn is not None:
+                self.store[optionColumn][row] = w.getSelected()
+                written.setdefault(optionColumn, set()).add(row)
+        if not written:
+            return 0
+
+        written = {c: sorted(rows) for c, rows in written.items()}
+        count = sum(len(rows) for rows in written.values())
+        self.writeCount += count
+        for column, rows in written.items():
+            byRow = self._byColumn.get(column, {})
+            if column in self._columnChecks:
+                self._check(column, [w for r in rows for w in byRow.get(r, ())])
+            if any(len(byRow.get(r, ())) > 1 for r in rows):
+                self.storeChanged(column, rows)  # other widgets showing the same cells
+        self.storeWritten.emit(written)
+        return count
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Show and obj in self._stale:
+            self._stale.discard(obj)
+            obj.removeEventFilter(self)
+            self._load([obj])
+        return False
+
+    def _onEdited(self, widget):
+        self._edited[widget] = None
+        self._flushTimer.start()
+
+    def _parser(self, column):
+        parser = self.parsers.get(column)
+        if parser is None:
+            dtype = getattr(self.store[column], 'dtype', None)
+            parser = dtype.type if dtype is not None else str
+        return parser
+
+    def _index(self, widget, add):
+        column, row, optionColumn = self._cells[widget]
+        for c in (column, optionColumn):
+            if c is None:
+                continue
+            byRow = self._byColumn.setdefault(c, {})
+            if add:
+                byRow.setdefault(row, []).append(widget)
+            else:
+                byRow[row].remove(widget)
+                if not byRow[row]:
+                    del byRow[row]
+
+    def _load(self, widgets):
+        """Set widgets from the store, then validate them, restyling each once."""
+        if not widgets:
+            return 0
+        groups = {}
+        for w in widgets:
+            column, row, optionColumn = self._cells[w]
+            groups.setdefault((column, optionColumn), []).append(w)
+
+        with deferStatusUpdates():
+            for (column, optionColumn), ws in groups.items():
+                rows = [self._cells[w][1] for w in ws]
+                values = _take(self.store[column], rows)
+                fmt = self.formats.get(column, str)
+                for w, value in zip(ws, values):
+                    self._setText(w, fmt(_scalar(value)))
+                if optionColumn is not None:
+                    for w, option in zip(ws, _take(self.store[optionColumn], rows)):
+                        self._setOption(w, _scalar(option))
+
+            for (column, optionColumn), ws in groups.items():
+                if column in self._columnChecks:
+                    self._check(column, ws)
+                else:
+                    for w in ws:
+                        w.setError(w.errorCheck(w))
+        self.updateCount += len(widgets)
+        return len(widgets)
+
+    def _check(self, column, widgets):
+        """Validate widgets bound to 'column' with one call of its column check."""
+        rows = [self._cells[w][1] for w in widgets]
+        errors = self._columnChecks[column](_take(self.store[column], rows))
+        for w, error in zip(widgets, errors):
+            w.setError(_scalar(error))
+
+    @staticmethod
+    def _setText(widget, text):
+        le = widget.lineEdit if isinstance(widget, EntryWidget) else widget
+        if le.text() == text:
+            return
+        blocked = le.blockSignals(True)
+        try:
+            le.setText(text)
+            le._syncText(text)
+        finally:
+            le.blockSignals(blocked)
+
+    @staticmethod
+    def _setOption(widget, option):
+        if widget.getSelected() == option:
+            return
+        combo = widget._combo
+        blocked = widget.blockSignals(True), combo.blockSignals(True) if combo is not None else None
+        try:
+            widget.setSelected(option)
+        finally:
+            widget.blockSignals(blocked[0])
+            if combo is not None:
+                combo.blockSignals(blocked[1])
+
+
+__all__ = ['ColumnBinding']
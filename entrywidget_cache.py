@@ -0,0 +1,276 @@
+"""Validation results kept on disk between sessions.
+
+Deterministic but expensive validators (checksums, catalogue lookups) are run again for every prefilled
+field each time the application starts, by the widgets' initial errorCheck. A ValidationCache keeps
+their results in an SQLite file, keyed by validator name, validator version and input, so the next
+start (or another instance of the application) reads them instead:
+
+    cache = ValidationCache(os.path.join(cacheDir, 'validation.sqlite'))
+    serial = AutoColorLineEdit(text=saved, errorCheck=cache.check(checksumError, version=2))
+    part = EntryWidget(options=catalogues, errorCheck=cache.check(
+        notInCatalogue, key=lambda w: (w.text(), w.getSelected())))
+
+The validator gets the input ('key' of the widget, default its text) instead of the widget, and its
+error statuses must be None, bool, int, float or str to be cached. Its version is by default a hash of its
+code and of the values bound to it (closure cells, defaults, partial and method arguments, by their repr;
+pass `version` for values without a stable repr). Results of other versions are not read, and are dropped
+as the least recently used results beyond `maxEntries`, or by `invalidate`.
+"""
+from PyQt5 import QtCore
+from collections import OrderedDict
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+_schemaVersion = 1
+_cacheable = (type(None), bool, int, float, str)
+
+
+def _hashCode(code, digest):
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            _hashCode(const, digest)  # nested function, lambda or comprehension; its repr has an address
+        else:
+            digest.update(repr(const).encode())
+
+
+def _hashValue(value, digest, seen):
+    """Hash a validator with the values bound to it: defaults, closure cells, partial and method arguments."""
+    if isinstance(value, functools.partial):
+        _hashValue(value.func, digest, seen)
+        for arg in value.args:
+            _hashValue(arg, digest, seen)
+        for k, v in sorted(value.keywords.items()):
+            digest.update(k.encode())
+            _hashValue(v, digest, seen)
+    elif inspect.ismethod(value):
+        _hashValue(value.__func__, digest, seen)
+        _hashValue(value.__self__, digest, seen)
+    elif inspect.isfunction(value):
+        if value in seen:
+            digest.update(b'<recursive>')
+            return
+        seen.add(value)
+        _hashCode(value.__code__, digest)
+        for v in value.__defaults__ or ():
+            _hashValue(v, digest, seen)
+        for k, v in sorted((value.__kwdefaults__ or {}).items()):
+            digest.update(k.encode())
+            _hashValue(v, digest, seen)
+        for cell in value.__closure__ or ():
+            try:
+                _hashValue(cell.cell_contents, digest, seen)
+            except ValueError:  # empty cell
+                digest.update(b'<empty>')
+    else:
+        digest.update(repr(value).encode())
+
+
+def _codeVersion(validator):
+    """Get a version of a validator from its code and the values bound to it
+    (changes when the function is edited, or made with other arguments)."""
+    digest = hashlib.sha1()
+    _hashValue(validator, digest, set())
+    return digest.hexdigest()[:16]
+
+
+def _defaultName(validator):
+    """Get a validator's module and qualified name (of the function of a partial, or of the class of a callable)."""
+    while isinstance(validator, functools.partial):
+        validator = validator.func
+    if not hasattr(validator, '__qualname__'):
+        validator = type(validator)
+    return f'{validator.__module__}.{validator.__qualname__}'
+
+
+class ValidationCache(QtCore.QObject):
+    """Persistent cache of validator results, shared by the application's instances.
+
+    Results are read from memory, then from the file; new results and the use of cached ones are
+    written once per event loop tick (or by `flush`), in one transaction. The file is opened in WAL
+    mode, so instances read while another writes; a write waiting for another instance longer than
+    `timeout` is skipped (logged), never failing a validation.
+
+    :param path: str, SQLite file (created if missing)
+    :param maxEntries: int, number of results kept in the file
+    :param memorySize: int, number of results kept in memory
+    :param timeout: float, s to wait for another instance writing
+    :param parent: Parent Qt Object
+    """
+    def __init__(self, path, maxEntries=100000, memorySize=4096, timeout=2.0, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.maxEntries = maxEntries
+        self.memorySize = memorySize
+        self._memory = OrderedDict()  # (name, version, input JSON): result, least recently used first
+        self._new = {}  # (name, version, input JSON): result JSON, to write
+        self._used = set()  # keys read, to mark used
+        self.hits = self.misses = self.uncacheable = self.writes = self.evicted = 0
+        self._closed = False
+
+        self._db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._write(self._createSchema)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+    def _createSchema(self, db):
+        if db.execute('PRAGMA user_version').fetchone()[0] != _schemaVersion:
+            db.execute('DROP TABLE IF EXISTS results')
+            db.execute(f'PRAGMA user_version={_schemaVersion}')
+        db.execute('CREATE TABLE IF NOT EXISTS results (validator TEXT, version TEXT, input TEXT, result TEXT, '
+                   'used REAL, PRIMARY KEY (validator, version, input)) WITHOUT ROWID')
+        db.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+
+    def _write(self, func):
+        """Run func(connection) in a write transaction.
+
+        :return: bool, whether it was committed
+        """
+        db = self._db
+        try:
+            db.execute('BEGIN IMMEDIATE')
+        except sqlite3.OperationalError as e:
+            logger.warning('validation cache %s busy, not written: %s', self.path, e)
+            return False
+        try:
+            func(db)
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+        return True
+
+    def check(self, validator, name=None, version=None, key=None):
+        """Make an errorCheck reading validator results from the cache.
+
+        :param validator: callable(input) -> error status, deterministic
+        :param name: str, identifies the validator in the file, default its module and qualified name
+        :param version: str, results of other versions of the validator are not read; default a hash of its code
+            and bound values (closure cells, defaults, partial arguments), see the module docstring
+        :param key: callable(widget) -> input, JSON serializable; default the widget's text
+        :return: callable(widget) -> error status, use as errorCheck
+        """
+        if name is None:
+            name = _defaultName(validator)
+        if version is None:
+            version = _codeVersion(validator)
+        version = str(version)
+        if key is None:
+            key = lambda w: w.text()
+        return lambda widget: self.get(validator, name, version, key(widget))
+
+    def get(self, validator, name, version, value):
+        """Get the result of a validator for an input, from the cache or by running it.
+
+        :return: error status
+        """
+        if self._closed:
+            return validator(value)
+        k = (name, version, json.dumps(value, separators=(',', ':')))
+        memory = self._memory
+        if k in memory:
+            memory.move_to_end(k)
+            self.hits += 1
+            self._touch(k)
+            return memory[k]
+        if k in self._new:
+            result = json.loads(self._new[k])
+        else:
+            row = self._db.execute('SELECT result FROM results WHERE validator=? AND version=? AND input=?',
+                                   k).fetchone()
+            if row is None:
+                self.misses += 1
+                result = validator(value)
+                if type(result) not in _cacheable:
+                    self.uncacheable += 1
+                    return result
+                self._new[k] = json.dumps(result)
+                self._schedule()
+            else:
+                self.hits += 1
+                result = json.loads(row[0])
+                self._touch(k)
+        memory[k] = result
+        if len(memory) > self.memorySize:
+            memory.popitem(last=False)
+        return result
+
+    def _touch(self, k):
+        self._used.add(k)
+        self._schedule()
+
+    def _schedule(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Write new results and mark read ones used now, dropping the least recently used beyond `maxEntries`.
+
+        :return: int, number of results written
+        """
+        self._timer.stop()
+        if self._closed or not self._new and not self._used:
+            return 0
+        new, used = self._new, self._used
+        now = time.time()
+
+        def write(db):
+            db.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                           [(*k, result, now) for k, result in new.items()])
+            db.executemany('UPDATE results SET used=? WHERE validator=? AND version=? AND input=?',
+                           [(now, *k) for k in used if k not in new])
+            if new:
+                cursor = db.execute('DELETE FROM results WHERE (validator, version, input) IN '
+                                    '(SELECT validator, version, input FROM results ORDER BY used DESC '
+                                    'LIMIT -1 OFFSET ?)', (self.maxEntries,))
+                self.evicted += max(cursor.rowcount, 0)
+
+        written = len(new) if self._write(write) else 0
+        self.writes += written
+        self._new, self._used = {}, set()
+        return written
+
+    def invalidate(self, name=None):
+        """Drop the cached results of a validator, or all results.
+
+        :param name: str, validator name (see check), None for all
+        :return:
+        """
+        if name is None:
+            self._memory.clear()
+            self._new.clear()
+            self._write(lambda db: db.execute('DELETE FROM results'))
+            return
+        for store in (self._memory, self._new):
+            for k in [k for k in store if k[0] == name]:
+                del store[k]
+        self._write(lambda db: db.execute('DELETE FROM results WHERE validator=?', (name,)))
+
+    def __len__(self):
+        """Number of results in the file (not counting unflushed ones)."""
+        return self._db.execute('SELECT count(*) FROM results').fetchone()[0]
+
+    def close(self):
+        """Flush and close the file; validators then run without the cache.
+
+        :return:
+        """
+        self.flush()
+        self._closed = True
+        self._db.close()
+
+
+__all__ = ['ValidationCache']
@@ -0,0 +1,257 @@
+"""Incremental revalidation of entry widgets whose errorChecks read other widgets.
+
+Declare which widgets each errorCheck reads; when a widget's text (or an EntryWidget's option)
+changes, only the errorChecks which transitively depend on it are run again, in dependency order,
+restyling each widget once.
+
+    graph = DependencyGraph()
+    graph.add(maxWidget, reads=[minWidget])  # errorCheck: max must be greater than min
+    graph.add(unitWidget, reads=[systemWidget])
+    graph.add(summaryWidget, reads=[maxWidget, unitWidget])
+
+    with graph.batch():  # one revalidation for several changes
+        minWidget.setText('2')
+        systemWidget.setSelected('imperial')
+"""
+from collections import deque
+from contextlib import contextmanager
+from PyQt5 import sip
+
+from entrywidget import EntryWidget, deferStatusUpdates
+
+
+class DependencyCycleError(ValueError):
+    """Raised when a dependency would make the graph cyclic.
+
+    :param cycle: list of widgets, each read by the next, ending with the first
+    """
+    def __init__(self, cycle):
+        self.cycle = cycle
+        names = ' -> '.join(getattr(w, 'name', repr(w)) for w in cycle)
+        super().__init__(f'Dependency cycle: {names}')
+
+
+class DependencyGraph:
+    """DAG of which widgets' errorChecks read which other widgets.
+
+    `recomputeCounts` holds the number of times each widget's errorCheck was run by the graph,
+    `batchCount` the number of revalidation batches run.
+    """
+    def __init__(self):
+        self._reads = {}  # widget: tuple of widgets its errorCheck reads
+        self._readBy = {}  # widget: list of widgets whose errorCheck reads it
+        self._watched = {}  # widget: connected (signal, slot) pairs
+        self._order = None  # {widget: topological index}, None when stale
+        self._affected = {}  # changed widget: tuple of widgets to revalidate, in order
+        self._pending = None  # widgets changed inside batch()
+        self.recomputeCounts = {}
+        self.batchCount = 0
+
+    def __len__(self):
+        """Number of widgets in the graph"""
+        return len(self._watched)
+
+    def __contains__(self, widget):
+        return widget in self._watched
+
+    def add(self, widget, reads=()):
+        """Declare the widgets 'widget's errorCheck reads, replacing any earlier declaration.
+
+        :param widget: EntryWidget or AutoColorLineEdit
+        :param reads: iterable of EntryWidget or AutoColorLineEdit
+        :return:
+        """
+        reads = tuple(dict.fromkeys(reads))
+        for r in reads:
+            path = self._path(widget, r)
+            if path is not None:
+                raise DependencyCycleError(path + [widget])
+
+        for r in self._reads.get(widget, ()):
+            self._readBy[r].remove(widget)
+        self._reads[widget] = reads
+        for r in reads:
+            self._readBy.setdefault(r, []).append(widget)
+            self._watch(r)
+        self._watch(widget)
+        self.recomputeCounts.setdefault(widget, 0)
+        self._invalidate()
+
+    def remove(self, widget):
+        """Remove a widget and its dependencies from the graph.
+
+        :param widget: EntryWidget or AutoColorLineEdit
+        :return:
+        """
+        for r in self._reads.pop(widget, ()):
+            self._readBy[r].remove(widget)
+        for d in self._readBy.pop(widget, ()):
+            self._reads[d] = tuple(r for r in self._reads[d] if r is not widget)
+        self.recomputeCounts.pop(widget, None)
+        self._unwatch(widget)
+        self._invalidate()
+
+    def dependencies(self, widget):
+        """Get the widgets 'widget's errorCheck reads.
+
+        :return: tuple of widgets
+        """
+        return self._reads.get(widget, ())
+
+    def dependents(self, widget):
+        """Get the widgets whose errorCheck reads 'widget'.
+
+        :return: tuple of widgets
+        """
+        return tuple(self._readBy.get(widget, ()))
+
+    def edges(self):
+        """Get all dependencies.
+
+        :return: list of tuples (widget read, widget reading it)
+        """
+        return [(r, w) for w, reads in self._reads.items() for r in reads]
+
+    def order(self):
+        """Get all widgets in topological order; each comes after every widget it reads.
+
+        :return: list of widgets
+        """
+        return sorted(self._watched, key=self._topoIndex().__getitem__)
+
+    def affected(self, widget):
+        """Get the widgets revalidated when 'widget' changes: those which transitively read it.
+
+        :return: tuple of widgets, in topological order
+        """
+        try:
+            return self._affected[widget]
+        except KeyError:
+            pass
+        seen = set()
+        queue = deque(self._readBy.get(widget, ()))
+        while queue:
+            w = queue.popleft()
+            if w not in seen:
+                seen.add(w)
+                queue.extend(self._readBy.get(w, ()))
+        index = self._topoIndex()
+        result = self._affected[widget] = tuple(sorted(seen, key=index.__getitem__))
+        return result
+
+    @contextmanager
+    def batch(self):
+        """Collect changes inside the block and revalidate their affected widgets once at its end.
+        Nested batches join the outermost one.
+        """
+        if self._pending is not None:
+            yield
+            return
+        self._pending = {}
+        try:
+            yield
+        finally:
+            pending, self._pending = self._pending, None
+            if pending:
+                self.revalidate(*pending)
+
+    def revalidate(self, *changed):
+        """Run the errorChecks of the widgets affected by 'changed' widgets, in topological order,
+        as one batch with a single restyle of each widget.
+
+        :param changed: widgets whose value changed
+        :return: list of widgets revalidated
+        """
+        if len(changed) == 1:
+            todo = self.affected(changed[0])
+        else:
+            todo = set()
+            for c in changed:
+                todo.update(self.affected(c))
+            todo = sorted(todo, key=self._topoIndex().__getitem__)
+        if not todo:
+            return []
+
+        done = []
+        with deferStatusUpdates():
+            for w in todo:
+                if sip.isdeleted(w):
+                    continue
+                w.setError(w.errorCheck(w))
+                self.recomputeCounts[w] += 1
+                done.append(w)
+        self.batchCount += 1
+        return done
+
+    def _onChanged(self, widget):
+        if self._pending is not None:
+            self._pending[widget] = None
+        elif self._readBy.get(widget):
+            self.revalidate(widget)
+
+    def _watch(self, widget):
+        if widget in self._watched:
+            return
+        slot = lambda *args: self._onChanged(widget)
+        if isinstance(widget, EntryWidget):
+            signals = (widget.lineEdit.textChanged[str], widget.optionChanged[str])
+        else:
+            signals = (widget.textChanged[str],)
+        for signal in signals:
+            signal.connect(slot)
+        self._watched[widget] = [(signal, slot) for signal in signals]
+        self.recomputeCounts.setdefault(widget, 0)
+        widget.destroyed.connect(lambda *args: self._onDestroyed(widget))
+
+    def _unwatch(self, widget):
+        for signal, slot in self._watched.pop(widget, ()):
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+
+    def _onDestroyed(self, widget):
+        if widget in self._watched:
+            self._watched[widget] = []  # connections went with the widget
+            self.remove(widget)
+
+    def _path(self, start, goal):
+        """Find a chain of widgets, each read by the next, from 'start' to 'goal'; None if there is none."""
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            w = queue.popleft()
+            if w is goal:
+                path = []
+                while w is not None:
+                    path.append(w)
+                    w = parents[w]
+                return path[::-1]
+            for d in self._readBy.get(w, ()):
+                if d not in parents:
+                    parents[d] = w
+                    queue.append(d)
+        return None
+
+    def _invalidate(self):
+        self._order = None
+        self._affected.clear()
+
+    def _topoIndex(self):
+        if self._order is not None:
+            return self._order
+        remaining = {w: len(self._reads.get(w, ())) for w in self._watched}
+        queue = deque(w for w, n in remaining.items() if n == 0)
+        order = {}
+        while queue:
+            w = queue.popleft()
+            order[w] = len(order)
+            for d in self._readBy.get(w, ()):
+                remaining[d] -= 1
+                if remaining[d] == 0:
+                    queue.append(d)
+        self._order = order
+        return order
+
+
+__all__ = ['DependencyGraph', 'DependencyCycleError']
@@ -0,0 +1,313 @@
+"""Input history and completion for entry widgets, shared between widgets.
+
+An InputHistory keeps the values entered in its widgets in a compact prefix index (one sorted list of
+values with an entry count and rank each), ranked by how often and how recently each value was
+entered. Widgets attached to it complete from it while typing, and add their text to it on
+editingFinished when no error is set. Widgets using the same history key share one index, and it is
+saved to disk in a binary format read back in a few ms.
+
+    parts = sharedHistory('parts', path=os.path.join(configDir, 'parts.history'))
+    parts.attach(partNumber)  # AutoColorLineEdit or EntryWidget
+    parts.attach(replacementPart)
+    ...
+    parts.save()
+"""
+from PyQt5.QtCore import QStringListModel
+from PyQt5.QtWidgets import QCompleter
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+import heapq
+import math
+import os
+import struct
+import sys
+
+from entrywidget import EntryWidget
+
+_histories = {}  # key: InputHistory, see sharedHistory
+_magic = b'EWHIST1\n'
+_header = struct.Struct('<dQQ')  # halfLife, tick, number of values
+_end = '\U0010ffff'  # sorts after any value starting with a prefix
+
+
+def _toLittle(a):
+    if sys.byteorder == 'big':
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+def _fromLittle(typecode, data):
+    a = array(typecode)
+    a.frombytes(data)
+    if sys.byteorder == 'big':
+        a.byteswap()
+    return a
+
+
+class InputHistory:
+    """Values entered in widgets, completing prefixes with the best ranked values.
+
+    A value's rank grows with each entry and decays by half every `halfLife` entries (of any value)
+    since; see `complete`.
+
+    :param path: str, file to load from (if it exists) and save to, None to keep in memory only
+    :param limit: int, number of completions offered
+    :param halfLife: float, number of entries after which an entry counts half
+    :param maxValues: int, values kept; the worst ranked are dropped beyond it
+    """
+    cacheSize = 4096  # prefixes with cached completions
+
+    def __init__(self, path=None, limit=10, halfLife=1000.0, maxValues=1000000):
+        self.path = path
+        self.limit = limit
+        self.halfLife = halfLife
+        self.maxValues = maxValues
+        self._values = []  # sorted
+        self._counts = array('I')  # entries of each value
+        self._ranks = array('d')  # log(count) + (tick of its last entry) * ln 2 / halfLife
+        self._tick = 0  # entries recorded
+        self._cache = OrderedDict()  # prefix: completions, least recently used first
+        self._dirty = False
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, value):
+        i = bisect_left(self._values, value)
+        return i < len(self._values) and self._values[i] == value
+
+    def count(self, value):
+        """Get the number of times a value was entered.
+
+        :return: int
+        """
+        i = bisect_left(self._values, value)
+        return self._counts[i] if i < len(self._values) and self._values[i] == value else 0
+
+    def record(self, value):
+        """Add an entry of a value.
+
+        :param value: str (blank values and values containing NUL are ignored)
+        :return: bool, whether it was recorded
+        """
+        if not value or '\0' in value:
+            return False
+        self._tick += 1
+        values = self._values
+        i = bisect_left(values, value)
+        if i < len(values) and values[i] == value:
+            self._counts[i] += 1
+        else:
+            values.insert(i, value)
+            self._counts.insert(i, 1)
+            self._ranks.insert(i, 0.0)
+        self._ranks[i] = math.log(self._counts[i]) + self._tick * math.log(2) / self.halfLife
+        cache = self._cache
+        for n in range(len(value) + 1):
+            cache.pop(value[:n], None)
+        self._dirty = True
+        if len(values) > self.maxValues * 1.1:
+            self.prune()
+        return True
+
+    def recordMany(self, values):
+        """Add entries of many values at once, as if recorded one by one in order (e.g. to import a history).
+
+        :param values: iterable of str
+        :return: int, number of entries recorded
+        """
+        entries = {}  # value: [entries, tick of the last]
+        tick = self._tick
+        for value in values:
+            if not value or '\0' in value:
+                continue
+            tick += 1
+            entry = entries.get(value)
+            if entry is None:
+                entries[value] = [1, tick]
+            else:
+                entry[0] += 1
+                entry[1] = tick
+        recorded = tick - self._tick
+        if not recorded:
+            return 0
+        self._tick = tick
+        decay = math.log(2) / self.halfLife
+        index = {v: i for i, v in enumerate(self._values)}
+        counts, ranks = self._counts, self._ranks
+        new = []
+        for value, (count, last) in entries.items():
+            i = index.get(value)
+            if i is None:
+                new.append(value)
+            else:
+                counts[i] += count
+                ranks[i] = math.log(counts[i]) + last * decay
+        if new:
+            values = self._values + new
+            counts.extend(entries[v][0] for v in new)
+            ranks.extend(math.log(entries[v][0]) + entries[v][1] * decay for v in new)
+            order = sorted(range(len(values)), key=values.__getitem__)
+            self._values = [values[i] for i in order]
+            self._counts = array('I', (counts[i] for i in order))
+            self._ranks = array('d', (ranks[i] for i in order))
+        self._cache.clear()
+        self._dirty = True
+        if len(self._values) > self.maxValues * 1.1:
+            self.prune()
+        return recorded
+
+    def complete(self, prefix, limit=None):
+        """Get the best ranked values starting with 'prefix'.
+
+        :param prefix: str
+        :param limit: int, default `limit`
+        :return: list of str, best first (equal ranks in sorted order)
+        """
+        cached = limit is None or limit == self.limit
+        limit = self.limit if limit is None else limit
+        cache = self._cache
+        if cached and prefix in cache:
+            cache.move_to_end(prefix)
+            return cache[prefix]
+        lo = bisect_left(self._values, prefix)
+        hi = bisect_left(self._values, prefix + _end, lo)
+        if hi - lo <= limit:
+            indices = sorted(range(lo, hi), key=self._ranks.__getitem__, reverse=True)
+        else:
+            indices = heapq.nlargest(limit, range(lo, hi), key=self._ranks.__getitem__)
+        result = [self._values[i] for i in indices]
+        if cached:
+            cache[prefix] = result
+            if len(cache) > self.cacheSize:
+                cache.popitem(last=False)
+        return result
+
+    def prune(self, maxValues=None):
+        """Drop the worst ranked values beyond 'maxValues'.
+
+        :param maxValues: int, default `maxValues`
+        :return: int, number of values dropped
+        """
+        maxValues = self.maxValues if maxValues is None else maxValues
+        dropped = len(self._values) - maxValues
+        if dropped <= 0:
+            return 0
+        keep = sorted(heapq.nlargest(maxValues, range(len(self._values)), key=self._ranks.__getitem__))
+        self._values = [self._values[i] for i in keep]
+        self._counts = array('I', (self._counts[i] for i in keep))
+        self._ranks = array('d', (self._ranks[i] for i in keep))
+        self._cache.clear()
+        self._dirty = True
+        return dropped
+
+    def clear(self):
+        self._values, self._counts, self._ranks = [], array('I'), array('d')
+        self._tick = 0
+        self._cache.clear()
+        self._dirty = True
+
+    def save(self, path=None):
+        """Write the history to a file (atomically), if changed since loaded or saved.
+
+        :param path: str, default `path`
+        :return: bool, whether it was written
+        """
+        path = self.path if path is None else path
+        if path is None:
+            raise ValueError('no path to save to')
+        if not self._dirty and path == self.path and os.path.exists(path):
+            return False
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(_magic)
+            f.write(_header.pack(self.halfLife, self._tick, len(self._values)))
+            f.write(_toLittle(self._counts))
+            f.write(_toLittle(self._ranks))
+            f.write('\0'.join(self._values).encode('utf-8'))
+        os.replace(tmp, path)
+        if path == self.path:
+            self._dirty = False
+        return True
+
+    def load(self, path=None):
+        """Replace the history with one saved to a file.
+
+        :param path: str, default `path`
+        :return:
+        """
+        path = self.path if path is None else path
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(_magic):
+            raise ValueError(f'{path} is not an input history file')
+        pos = len(_magic)
+        halfLife, tick, n = _header.unpack_from(data, pos)
+        pos += _header.size
+        counts = _fromLittle('I', data[pos:pos + 4 * n])
+        pos += 4 * n
+        ranks = _fromLittle('d', data[pos:pos + 8 * n])
+        pos += 8 * n
+        values = data[pos:].decode('utf-8').split('\0') if n else []
+        if len(values) != n or len(counts) != n or len(ranks) != n:
+            raise ValueError(f'{path} is truncated')
+        if halfLife != self.halfLife:
+            scale = halfLife / self.halfLife
+            for i, c in enumerate(counts):
+                log = math.log(c)
+                ranks[i] = log + (ranks[i] - log) * scale
+        self._values, self._counts, self._ranks, self._tick = values, counts, ranks, tick
+        self._cache.clear()
+        self._dirty = path != self.path
+
+    def attach(self, widget):
+        """Complete a widget's text from the history while typing, and record its text on
+        editingFinished when no error is set (and no background errorCheck is running).
+
+        :param widget: AutoColorLineEdit or EntryWidget
+        :return: QCompleter showing the completions
+        """
+        le = widget.lineEdit if isinstance(widget, EntryWidget) else widget
+        completer = QCompleter(le)
+        completer.setModel(QStringListModel(completer))
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        le.setCompleter(completer)
+        le.textEdited.connect(lambda text: self._showCompletions(completer, text))
+        le.editingFinished.connect(lambda: self._recordText(le))
+        return completer
+
+    def _showCompletions(self, completer, text):
+        matches = self.complete(text) if text else []
+        completer.model().setStringList(matches)
+        if matches and matches != [text]:
+            completer.complete()
+        else:
+            completer.popup().hide()
+
+    def _recordText(self, le):
+        if le.getError() or le.isValidating():
+            return
+        self.record(le.text())
+
+
+def sharedHistory(key, path=None, **kwargs):
+    """Get the InputHistory shared by all widgets using 'key', creating it on first use.
+
+    :param key: hashable
+    :param path: str, file of a new history, see InputHistory
+    :param kwargs: other InputHistory arguments of a new history
+    :return: InputHistory
+    """
+    history = _histories.get(key)
+    if history is None:
+        history = _histories[key] = InputHistory(path, **kwargs)
+    return history
+
+
+__all__ = ['InputHistory', 'sharedHistory']
@@ -0,0 +1,183 @@
+"""Memory accounting of entry widgets.
+
+Measures what one widget costs: Python-side allocations (with tracemalloc) and Qt objects,
+and checks that create/destroy cycles give their memory, widgets, loggers and handlers back.
+
+    QT_QPA_PLATFORM=offscreen python entrywidget_memory.py
+
+From code:
+
+    report = measure(lambda parent: EntryWidget(parent, options=units))
+    report['bytes'], report['qtObjects'], report['top']
+    leaks = leakCheck(lambda parent: EntryWidget(parent, options=units))
+"""
+from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtCore import QObject, QCoreApplication, QEvent
+import gc
+import logging
+import sys
+import tracemalloc
+
+from entrywidget import AutoColorLineEdit, EntryWidget
+
+
+def _deleteLater(obj):
+    """Delete a QObject now, with the slot proxies of its connections (deleted later in turn)."""
+    obj.deleteLater()
+    for _ in range(2):
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        QCoreApplication.processEvents()
+    gc.collect()
+
+
+def _traceFilter(snapshot):
+    return snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                   tracemalloc.Filter(False, __file__)])
+
+
+def _sizeOf(obj, seen=None):
+    """Get the size of an object and the containers and strings it holds, in bytes."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_sizeOf(k, seen) + _sizeOf(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_sizeOf(v, seen) for v in obj)
+    return size
+
+
+def loggerStats():
+    """Get the number of registered loggers and of handlers attached to them.
+
+    :return: tuple (loggers, handlers)
+    """
+    loggers = [l for l in logging.Logger.manager.loggerDict.values() if isinstance(l, logging.Logger)]
+    return len(loggers), sum(len(l.handlers) for l in loggers)
+
+
+def footprint(widget):
+    """Break down the Python-side state of one widget.
+
+    :param widget: AutoColorLineEdit or EntryWidget
+    :return: dict {component: bytes}, plus 'qtObjects': number of QObjects making up the widget
+    """
+    le = widget.lineEdit if isinstance(widget, EntryWidget) else widget
+    result = {
+        'colors': _sizeOf(le._autoColors),
+        'styleSheet': _sizeOf(le.styleSheet()),
+        'lineEditDict': _sizeOf(vars(le)),
+        'closures': sum(_sizeOf(v) + _sizeOf(v.__closure__ or ()) for v in vars(le).values()
+                        if callable(v) and hasattr(v, '__closure__')),
+    }
+    if isinstance(widget, EntryWidget):
+        result['entryDict'] = _sizeOf(vars(widget))
+    result['qtObjects'] = 1 + len(widget.findChildren(QObject))
+    return result
+
+
+def measure(factory, n=200, top=10):
+    """Measure the memory of widgets made by 'factory'.
+
+    :param factory: callable(parent) -> widget
+    :param n: int, number of widgets to make (costs are averaged)
+    :param top: int, number of largest allocation sites to report
+    :return: dict {'bytes': Python bytes per widget, 'qtObjects': QObjects per widget,
+                   'top': [(file:line, bytes per widget), ...], 'footprint': footprint() of one widget}
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    parent = QWidget()
+    factory(parent)  # warm up caches (imports, class attributes, loggers...)
+    try:
+        gc.collect()
+        before = _traceFilter(tracemalloc.take_snapshot())
+        objects = len(parent.findChildren(QObject))
+        widgets = [factory(parent) for _ in range(n)]
+        gc.collect()
+        after = _traceFilter(tracemalloc.take_snapshot())
+        objects = len(parent.findChildren(QObject)) - objects
+
+        stats = after.compare_to(before, 'lineno')
+        total = sum(s.size_diff for s in stats)
+        sites = [(f'{s.traceback[0].filename}:{s.traceback[0].lineno}', s.size_diff / n)
+                 for s in stats[:top] if s.size_diff > 0]
+        result = {'bytes': total / n, 'qtObjects': objects / n, 'top': sites, 'footprint': footprint(widgets[0])}
+    finally:
+        widgets = None
+        _deleteLater(parent)
+        if started:
+            tracemalloc.stop()
+    return result
+
+
+def leakCheck(factory, n=50, cycles=5):
+    """Create and destroy widgets made by 'factory' repeatedly, measuring what is not given back.
+
+    :param factory: callable(parent) -> widget
+    :param n: int, number of widgets per cycle
+    :param cycles: int, number of measured cycles (after two warm-up cycles)
+    :return: dict {'bytesPerCycle': Python bytes kept per cycle, 'widgets': QWidgets kept,
+                   'loggers': loggers added, 'handlers': logging handlers added}
+    """
+    def cycle():
+        parent = QWidget()
+        for _ in range(n):
+            factory(parent)
+        _deleteLater(parent)
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        cycle()
+        cycle()
+        widgets = len(QApplication.allWidgets())
+        loggers, handlers = loggerStats()
+        memory = tracemalloc.get_traced_memory()[0]
+        for _ in range(cycles):
+            cycle()
+        memory = tracemalloc.get_traced_memory()[0] - memory
+    finally:
+        if started:
+            tracemalloc.stop()
+    newLoggers, newHandlers = loggerStats()
+    return {
+        'bytesPerCycle': memory / cycles,
+        'widgets': len(QApplication.allWidgets()) - widgets,
+        'loggers': newLoggers - loggers,
+        'handlers': newHandlers - handlers,
+    }
+
+
+FACTORIES = {
+    'AutoColorLineEdit': lambda parent: AutoColorLineEdit(parent),
+    'AutoColorLineEdit (named, errorCheck)': lambda parent: AutoColorLineEdit(
+        parent, objectName='field', errorCheck=lambda w: w.text() == ''),
+    'EntryWidget': lambda parent: EntryWidget(parent, options=['m', 'km']),
+    'EntryWidget (lazy)': lambda parent: EntryWidget(parent, options=['m', 'km'], lazy=True),
+}
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    for name, factory in FACTORIES.items():
+        report = measure(factory)
+        leaks = leakCheck(factory)
+        print(f'--- {name}')
+        print(f"{'Python bytes / widget':<40} {report['bytes']:10.0f}")
+        print(f"{'QObjects / widget':<40} {report['qtObjects']:10.1f}")
+        for component, size in report['footprint'].items():
+            print(f"  {component:<38} {size:10}")
+        for site, size in report['top'][:5]:
+            print(f"  {site:<58} {size:10.0f}")
+        print(f"{'kept per create/destroy cycle':<40} {leaks['bytesPerCycle']:10.0f} bytes, "
+              f"{leaks['widgets']} widgets, {leaks['loggers']} loggers, {leaks['handlers']} handlers")
+
+
+if __name__ == '__main__':
+    main()
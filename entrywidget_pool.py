@@ -0,0 +1,186 @@
+"""Recycling of AutoColorLineEdit/EntryWidget instances.
+
+Building an EntryWidget means a layout, an AutoColorLineEdit, a DictComboBox, their connections,
+a logger and a styleSheet. Screens which destroy and recreate many of them can instead release
+them to a WidgetPool and acquire them again, which only resets their state.
+
+    pool = WidgetPool(EntryWidget, maxSize=500)
+    widget = pool.acquire(parent, text='1.0', options=units, errorCheck=checkNumber)
+    ...
+    pool.release(widget)  # before its parent is deleted
+"""
+from collections import OrderedDict
+from PyQt5.QtWidgets import QWidget
+from PyQt5 import sip
+
+from entrywidget import AutoColorLineEdit, EntryWidget, _widgetLogger
+
+
+def _freeze(value):
+    """Get a hashable version of a configuration value."""
+    if isinstance(value, dict):
+        return (dict, tuple((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(v) for v in value))
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value), repr(value))
+    return value
+
+
+class WidgetPool:
+    """Hands out AutoColorLineEdit/EntryWidget instances, reusing released ones with the same configuration.
+
+    The configuration is every constructor kwarg except the per-use state `parent`, `text`, `readOnly`
+    and `objectName`; e.g. `colors`, `options`, `optionFixed`, `errorCheck`, `liveErrorChecking`.
+    A reused widget gets its configured colors and options back, its text, selection, error,
+    enabled/readOnly state and objectName reset, and everything connected to its signals disconnected.
+
+    Callables in the configuration are compared by identity: a new lambda per acquire (e.g.
+    `errorCheck=lambda w: ...` in a loop) never matches an idle widget, pass the same function instead.
+    Widgets deleted without being released (e.g. with their parent) are dropped from the pool.
+
+    :param cls: widget class, AutoColorLineEdit or EntryWidget (or a subclass)
+    :param maxSize: int, maximum number of idle widgets kept; the least recently released are deleted first
+    """
+    perUseArgs = ('text', 'readOnly', 'objectName')
+
+    def __init__(self, cls=EntryWidget, maxSize=256):
+        self.cls = cls
+        self.maxSize = maxSize
+        self._idle = OrderedDict()  # idle widget: key, least recently released first
+        self._byKey = {}  # key: list of idle widgets
+        self._inUse = {}  # acquired widget: key
+        self._initial = {}  # widget: (styleSheet, colors, options, optionFixed) right after construction
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        """Number of idle widgets"""
+        return len(self._idle)
+
+    def acquire(self, parent=None, text='', readOnly=False, objectName='', **config):
+        """Get a widget with the given configuration, reusing an idle one if available.
+
+        :param parent: Parent Qt Object
+        :param text: str, starting text
+        :param readOnly: bool, whether the widget is editable
+        :param objectName: str, name of object for logging and within Qt
+        :param config: other constructor kwargs
+        :return: widget
+        """
+        key = _freeze(config)
+        idle = self._byKey.get(key)
+        while idle:
+            widget = idle.pop()
+            del self._idle[widget]
+            if sip.isdeleted(widget):
+                self._initial.pop(widget, None)
+                continue
+            self.hits += 1
+            self._reset(widget, parent, text, readOnly, objectName)
+            self._inUse[widget] = key
+            return widget
+
+        self.misses += 1
+        widget = self.cls(parent, text=text, readOnly=readOnly, objectName=objectName, **config)
+        le = widget.lineEdit if isinstance(widget, EntryWidget) else widget
+        if isinstance(widget, EntryWidget):
+            options, optionFixed = widget.getOptions(), widget.optionFixed()
+        else:
+            options = optionFixed = None
+        self._initial[widget] = (le.styleSheet(), dict(le.autoColors()), options, optionFixed)
+        self._inUse[widget] = key
+        widget.destroyed.connect(lambda: self._forget(widget))
+        return widget
+
+    def release(self, widget):
+        """Return a widget to the pool. It is disconnected, hidden and unparented,
+        so must be released before its parent is deleted.
+
+        :param widget: widget from acquire()
+        :return:
+        """
+        try:
+            key = self._inUse.pop(widget)
+        except KeyError:
+            raise ValueError(f'{widget} was not acquired from this pool') from None
+        widget.resetConnections()
+        le = widget.lineEdit if isinstance(widget, EntryWidget) else widget
+        le._cancelValidation()
+        widget.setParent(None)
+
+        self._idle[widget] = key
+        self._byKey.setdefault(key, []).append(widget)
+        while len(self._idle) > self.maxSize:
+            old, oldKey = self._idle.popitem(last=False)
+            self._byKey[oldKey].remove(old)
+            self._initial.pop(old, None)
+            if not sip.isdeleted(old):
+                old.deleteLater()
+            self.evictions += 1
+
+    def clear(self):
+        """Delete all idle widgets."""
+        for widget in self._idle:
+            self._initial.pop(widget, None)
+            if not sip.isdeleted(widget):
+                widget.deleteLater()
+        self._idle.clear()
+        self._byKey.clear()
+
+    def _forget(self, widget):
+        """Drop a deleted widget."""
+        self._inUse.pop(widget, None)
+        self._initial.pop(widget, None)
+        key = self._idle.pop(widget, None)
+        if key is not None:
+            self._byKey[key].remove(widget)
+
+    def _reset(self, widget, parent, text, readOnly, objectName):
+        styleSheet, colors, options, optionFixed = self._initial[widget]
+        isEntry = isinstance(widget, EntryWidget)
+        le = widget.lineEdit if isEntry else widget
+        combo = widget._combo if isEntry else None
+
+        blocked = [(o, o.blockSignals(True)) for o in (widget, le, combo) if o is not None]
+        try:
+            if le.autoColors() != colors or le.styleSheet() != styleSheet:
+                le._autoColors = dict(colors)
+                le.setColors()
+            if isEntry:
+                if widget.getOptions() != options:
+                    widget.setOptions(options)
+                widget.setSelectedIndex(0)
+                widget.setOptionFixed(optionFixed)
+            if isEntry and not widget.isEnabled():
+                QWidget.setEnabled(widget, True)
+            le.setEnabled(True)
+            if isEntry:
+                if readOnly:
+                    widget.setReadOnly(True)
+                else:
+                    le.setReadOnly(False)
+            else:
+                le.setReadOnly(readOnly)
+            if le.objectName() != objectName:
+                le.setObjectName(objectName)
+                le.logger = _widgetLogger(le)
+            if le.text() != text:
+                le.setText(text)
+                le._syncText(text)
+        finally:
+            for o, b in blocked:
+                o.blockSignals(b)
+
+        widget.setParent(parent)
+        if parent is not None:
+            widget.show()
+        try:
+            widget.setError(widget.errorCheck(widget))
+        except:
+            pass
+        le.refreshStatus()
+
+
+__all__ = ['WidgetPool']
@@ -0,0 +1,242 @@
+"""Validating changed widgets once per event loop tick, in batches, the ones the user sees first.
+
+Widgets whose errorCheck comes from a ValidationScheduler are only marked dirty when their text
+(or option) changes. Once per event loop tick the dirty widgets are grouped by validator: batch
+validators are called once with the values of the whole group, the others once per widget, and the
+error statuses are then applied with one restyle per widget.
+
+The focused widget is validated first, then the visible ones; hidden widgets (on other tabs, scrolled
+out of view, or not shown yet) are validated in batches in later ticks, while nothing else is
+pending. `flush` (or `validateAll`) validates everything at once, e.g. before saving a form.
+
+This order only applies to errorChecks made by `check`. A DependencyGraph or ColumnBinding revalidating
+widgets calls their errorCheck, which marks them here, so bound and dependent fields are ordered the same
+way; plain errorChecks and ColumnBinding's column checks are still run at once, in the caller's order.
+
+    scheduler = ValidationScheduler()
+    inRange = scheduler.check(lambda values: np.abs(np.asarray(values) - 50) > 50, batch=True)  # vectorised
+    known = scheduler.check(lambda values: unknownParts(db, values), batch=True)  # one SQL `IN` query
+    fields = [AutoColorLineEdit(form, parser=float, errorCheck=inRange) for _ in range(500)]
+    name = AutoColorLineEdit(form, errorCheck=scheduler.check(lambda w: w.text() == ''))  # per widget
+"""
+from PyQt5 import QtCore, sip
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import QApplication
+from itertools import islice
+import weakref
+
+from entrywidget import deferStatusUpdates, _scalar
+
+
+class ValidationScheduler(QtCore.QObject):
+    """Collects widgets to validate and validates them once per event loop tick, by priority.
+
+    While a widget is dirty its errorCheck returns its current error status; parse failures
+    (see AutoColorLineEdit's parser) are still set at once.
+
+    :param idleBatch: int, maximum number of hidden widgets validated per tick
+    :param parent: Parent Qt Object
+    """
+    validated = pyqtSignal(int)  # number of widgets validated by a tick
+    settled = pyqtSignal()  # no widget is waiting to be validated anymore
+
+    FOCUSED, VISIBLE, HIDDEN = 0, 1, 2  # priorities, see priority
+
+    def __init__(self, idleBatch=200, parent=None):
+        super().__init__(parent)
+        self.idleBatch = idleBatch
+        self._dirty = {}  # widget: (validator, batch), marked since the last tick
+        self._hidden = {}  # widget: (validator, batch), hidden at a tick, validated in idle ticks
+        self._entries = weakref.WeakKeyDictionary()  # widget: (validator, batch) it was last marked with
+        self.ticks = self.idleTicks = self.batchCalls = self.itemCalls = self.validatedCount = 0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._tick)
+
+        self._idleTimer = QtCore.QTimer(self)
+        self._idleTimer.setSingleShot(True)
+        self._idleTimer.setInterval(0)
+        self._idleTimer.timeout.connect(self._idle)
+
+    def check(self, validator, batch=False):
+        """Make an errorCheck validating with 'validator' on the next tick.
+
+        :param validator: batch: callable(list of values) -> sequence of error statuses, in the same order;
+                          values are `widget.value()` (the parsed value, or the text without a parser)
+                          else: callable(widget) -> error status, like an errorCheck
+        :param batch: bool, whether 'validator' validates a batch of values
+        :return: callable(widget) -> error status, use as errorCheck
+        """
+        entry = (validator, batch)
+        return lambda widget: self.mark(widget, entry)
+
+    def mark(self, widget, entry):
+        """Mark a widget dirty, to validate with 'entry' = (validator, batch) on the next tick.
+
+        :return: the widget's current error status
+        """
+        if not self._dirty:
+            self._timer.start()
+        self._hidden.pop(widget, None)
+        self._dirty[widget] = entry
+        self._entries[widget] = entry
+        return widget.getError()
+
+    def revalidate(self, widgets=None):
+        """Mark widgets dirty again, e.g. after something their validators read changed.
+
+        :param widgets: iterable of widgets validated by this scheduler before, None for all of them
+        :return: int, number of widgets marked
+        """
+        entries = self._entries
+        if widgets is None:
+            widgets = list(entries)
+        count = 0
+        for w in widgets:
+            entry = entries.get(w)
+            if entry is None:
+                continue
+            if sip.isdeleted(w):
+                del entries[w]
+                continue
+            self.mark(w, entry)
+            count += 1
+        return count
+
+    def isPending(self, widget=None):
+        """Whether a widget (or any widget) is waiting to be validated.
+
+        :param widget: widget, None for any widget
+        :return: bool
+        """
+        if widget is None:
+            return bool(self._dirty or self._hidden)
+        return widget in self._dirty or widget in self._hidden
+
+    def priority(self, widget, focus=None):
+        """Get the priority of validating a widget.
+
+        :param widget: widget
+        :param focus: the focus widget, default QApplication.focusWidget()
+        :return: FOCUSED if the widget (or its line edit) has the focus,
+                 VISIBLE if some of it is on screen, else HIDDEN
+        """
+        if focus is None:
+            focus = QApplication.focusWidget()
+        if focus is not None and (focus is widget or widget.isAncestorOf(focus)):
+            return self.FOCUSED
+        if widget.isVisible() and not widget.visibleRegion().isEmpty():
+            return self.VISIBLE
+        return self.HIDDEN
+
+    def flush(self):
+        """Validate every waiting widget now, hidden ones included.
+
+        :return: int, number of widgets validated
+        """
+        self._timer.stop()
+        self._idleTimer.stop()
+        pending, hidden = self._dirty, self._hidden
+        self._dirty, self._hidden = {}, {}
+        for widget, entry in hidden.items():
+            pending.setdefault(widget, entry)
+        if pending:
+            self.ticks += 1
+        return self._finish(self._run(pending))
+
+    def validateAll(self, widgets=None):
+        """Validate widgets now, whether dirty or not (form-wide validation), and everything waiting.
+
+        :param widgets: iterable of widgets validated by this scheduler before, None for all of them
+        :return: int, number of widgets validated
+        """
+        self.revalidate(widgets)
+        return self.flush()
+
+    def _tick(self):
+        """Validate the focused and visible dirty widgets, leave the hidden ones for idle ticks."""
+        dirty, self._dirty = self._dirty, {}
+        focus = QApplication.focusWidget()
+        ranked = ({}, {})  # focused, visible
+        for widget, entry in dirty.items():
+            if sip.isdeleted(widget):
+                continue
+            priority = self.priority(widget, focus)
+            if priority == self.HIDDEN:
+                self._hidden[widget] = entry
+            else:
+                ranked[priority][widget] = entry
+        now = ranked[self.FOCUSED]
+        now.update(ranked[self.VISIBLE])
+        if now:
+            self.ticks += 1
+        self._finish(self._run(now))
+
+    def _idle(self):
+        """Validate widgets hidden at their tick: the ones shown since, and up to `idleBatch` others."""
+        if self._dirty:
+            self._idleTimer.start()  # after the tick
+            return
+        hidden = self._hidden
+        focus = QApplication.focusWidget()
+        now = {}
+        for widget in list(hidden):
+            if sip.isdeleted(widget):
+                del hidden[widget]
+            elif self.priority(widget, focus) != self.HIDDEN:
+                now[widget] = hidden.pop(widget)
+        for widget in list(islice(hidden, self.idleBatch)):
+            now[widget] = hidden.pop(widget)
+        count = self._run(now)
+        self.idleTicks += 1
+        self._finish(count)
+
+    def _finish(self, count):
+        if count:
+            self.validatedCount += count
+            self.validated.emit(count)
+        if self._hidden:
+            if not self._idleTimer.isActive():
+                self._idleTimer.start()
+        elif not self._dirty:
+            self.settled.emit()
+        return count
+
+    def _run(self, pending):
+        """Validate widgets, grouped by validator in order of first appearance."""
+        groups = {}
+        for widget, entry in pending.items():
+            if not sip.isdeleted(widget):
+                groups.setdefault(entry, []).append(widget)
+        count = 0
+        with deferStatusUpdates():
+            for (validator, batch), widgets in groups.items():
+                count += self._validate(validator, batch, widgets)
+        return count
+
+    def _validate(self, validator, batch, widgets):
+        if not batch:
+            for w in widgets:
+                self.itemCalls += 1
+                w.setError(validator(w))
+            return len(widgets)
+
+        values = []
+        parsed = []
+        for w in widgets:
+            value = w.value()
+            if value is not None or w.parseError() is None:
+                parsed.append(w)
+                values.append(value)
+        if not parsed:
+            return 0
+        self.batchCalls += 1
+        errors = validator(values)
+        for w, error in zip(parsed, errors):
+            w.setError(_scalar(error))
+        return len(parsed)
+
+
+__all__ = ['ValidationScheduler']
@@ -0,0 +1,336 @@
+"""errorChecks answered by a local validation service, over HTTP or a Unix socket.
+
+A ServiceValidator collects the queries of all widgets using its errorChecks, sends them in one request
+per event loop tick over a small pool of persistent (keep-alive) connections in background threads,
+sends a query already in flight only once, and sets each widget's error when its answer arrives.
+The GUI thread never waits for the service.
+
+    service = ServiceValidator('http://127.0.0.1:8470/check', timeout=0.5, timeoutError='unavailable')
+    partNumber = AutoColorLineEdit(errorCheck=service.check('part'))
+    catalogue = EntryWidget(options=catalogues, errorCheck=service.check('catalogue'))
+
+    service = ServiceValidator('unix:/run/validation.sock')  # HTTP over a Unix socket
+
+Protocol: POST {"queries": [[kind, value], ...]} -> {"results": [error status, ...]} in the same order.
+StandInService serves it from a Python function, for tests:
+
+    server = StandInService(lambda kind, value: value not in parts).start()
+    service = ServiceValidator(server.address)
+"""
+from PyQt5 import QtCore, sip
+from PyQt5.QtCore import pyqtSignal
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import http.client
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection to a Unix socket."""
+    def __init__(self, path, timeout):
+        super().__init__('localhost', timeout=timeout)
+        self._socketPath = path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._socketPath)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class ServiceValidator(QtCore.QObject):
+    """Batching, deduplicating client of a validation service, making errorChecks for widgets.
+
+    While a widget's query is unanswered its errorCheck returns its current error status, so the widget
+    keeps its colors until the answer is set. Answers to superseded queries (the text changed since) are
+    dropped. Recent answers are cached and returned by the errorCheck at once.
+
+    :param address: 'http://host:port/path' or 'unix:/path/to/socket'
+    :param poolSize: int, number of persistent connections (and concurrent requests)
+    :param timeout: float, s to wait for a connection or an answer
+    :param timeoutError: error status set when the service does not answer in time (or at all)
+    :param cacheSize: int, number of answers cached; 0 to always ask the service
+    :param maxBatch: int, maximum number of queries per request
+    :param parent: Parent Qt Object
+    """
+    answered = pyqtSignal(object, object)  # widget, error status set from the service's answer
+    _done = pyqtSignal(object)  # (keys, results or None, exception or None), from the request threads
+
+    def __init__(self, address, poolSize=2, timeout=1.0, timeoutError='timeout', cacheSize=1024,
+                 maxBatch=256, parent=None):
+        super().__init__(parent)
+        self.address = address
+        self.timeout = timeout
+        self.timeoutError = timeoutError
+        self.cacheSize = cacheSize
+        self.maxBatch = maxBatch
+        if address.startswith('unix:'):
+            self._socketPath, self._path = address[len('unix:'):], '/'
+        else:
+            url = urlsplit(address)
+            self._socketPath, self._host, self._port = None, url.hostname, url.port or 80
+            self._path = url.path or '/'
+
+        self._connections = queue.LifoQueue()  # idle connections
+        self._executor = ThreadPoolExecutor(max_workers=poolSize, thread_name_prefix='ServiceValidator')
+        self._queued = OrderedDict()  # key: None, to send on the next tick
+        self._inFlight = set()  # keys sent and not answered
+        self._waiting = {}  # key: [widgets]
+        self._latest = {}  # widget: key of its latest query
+        self._cache = OrderedDict()  # key: answer, least recently used first
+        self.requestCount = self.queryCount = self.dedupCount = self.cacheHits = self.failureCount = 0
+        self.connectionCount = 0  # connections opened
+        self._closed = False
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.send)
+        self._done.connect(self._onDone)
+
+    def check(self, kind, value=None):
+        """Make an errorCheck asking the service about widgets' values.
+
+        :param kind: JSON value telling the service what to check, e.g. 'part'
+        :param value: callable(widget) -> JSON value to check, default the widget's text
+        :return: callable(widget) -> error status, use as errorCheck
+        """
+        if value is None:
+            value = lambda w: w.text()
+        return lambda widget: self.query(widget, kind, value(widget))
+
+    def query(self, widget, kind, value):
+        """Ask the service about a value for a widget, setting its error when answered.
+
+        :param widget: AutoColorLineEdit or EntryWidget
+        :param kind: JSON value
+        :param value: JSON value
+        :return: cached answer, else the widget's current error status
+        """
+        key = (kind, value)
+        if self._closed:
+            return widget.getError()
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.cacheHits += 1
+            self._latest.pop(widget, None)
+            return self._cache[key]
+
+        self._latest[widget] = key
+        waiting = self._waiting.setdefault(key, [])
+        if widget not in waiting:
+            waiting.append(widget)
+        if key in self._queued or key in self._inFlight:
+            self.dedupCount += 1
+        else:
+            self._queued[key] = None
+            self._timer.start()
+        return widget.getError()
+
+    def isPending(self, widget=None):
+        """Whether a query (of a widget) is waiting for its answer.
+
+        :param widget: widget, None for any widget
+        :return: bool
+        """
+        if widget is None:
+            return bool(self._latest)
+        return widget in self._latest
+
+    def send(self):
+        """Send the queued queries now, in requests of at most `maxBatch` queries.
+
+        :return: int, number of requests sent
+        """
+        self._timer.stop()
+        if self._closed:
+            return 0
+        keys = list(self._queued)
+        self._queued.clear()
+        self._inFlight.update(keys)
+        batches = [keys[i:i + self.maxBatch] for i in range(0, len(keys), self.maxBatch)]
+        for batch in batches:
+            self.requestCount += 1
+            self.queryCount += len(batch)
+            self._executor.submit(self._request, batch)
+        return len(batches)
+
+    def settle(self, timeout=5.0):
+        """Process Qt events until every query is answered.
+
+        :param timeout: float, maximum s to wait
+        :return: bool, whether every query was answered
+        """
+        app = QtCore.QCoreApplication.instance()
+        deadline = time.perf_counter() + timeout
+        while (self._queued or self._inFlight) and time.perf_counter() < deadline:
+            app.processEvents(QtCore.QEventLoop.AllEvents, 5)
+            time.sleep(0.001)
+        return not (self._queued or self._inFlight)
+
+    def clearCache(self):
+        self._cache.clear()
+
+    def close(self):
+        """Stop sending queries and close the connections.
+
+        :return:
+        """
+        self._closed = True
+        self._timer.stop()
+        self._queued.clear()
+        self._executor.shutdown(wait=True)
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _connect(self):
+        self.connectionCount += 1
+        if self._socketPath is not None:
+            return _UnixHTTPConnection(self._socketPath, self.timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
+
+    def _request(self, keys):
+        """Send one request (in a pool thread), reporting the answers with _done."""
+        try:
+            conn = self._connections.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            body = json.dumps({'queries': keys})
+            conn.request('POST', self._path, body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            data = response.read()
+            if response.status != 200:
+                raise http.client.HTTPException(f'{response.status} {response.reason}')
+            results = json.loads(data)['results']
+            if len(results) != len(keys):
+                raise ValueError(f'{len(results)} results for {len(keys)} queries')
+        except (OSError, http.client.HTTPException, ValueError, KeyError, TypeError) as e:
+            conn.close()
+            self._done.emit((keys, None, e))
+            return
+        self._connections.put(conn)
+        self._done.emit((keys, results, None))
+
+    def _onDone(self, payload):
+        keys, results, exc = payload
+        if exc is not None:
+            self.failureCount += 1
+            logger.warning('validation service %s failed: %r', self.address, exc)
+            results = [self.timeoutError] * len(keys)
+        for key, result in zip(keys, results):
+            self._inFlight.discard(key)
+            if exc is None and self.cacheSize > 0:
+                self._cache[key] = result
+                if len(self._cache) > self.cacheSize:
+                    self._cache.popitem(last=False)
+            for widget in self._waiting.pop(key, ()):
+                if self._latest.get(widget) != key:
+                    continue  # superseded by a newer query
+                del self._latest[widget]
+                if sip.isdeleted(widget):
+                    continue
+                widget.setError(result)
+                self.answered.emit(widget, result)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_POST(self):
+        service = self.server.service
+        queries = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['queries']
+        with service._lock:
+            service.requests += 1
+            service.batches.append(len(queries))
+        if service.delay:
+            time.sleep(service.delay)
+        body = json.dumps({'results': [service.lookup(kind, value) for kind, value in queries]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # e.g. a client which timed out closed the connection
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class StandInService:
+    """A local validation service answering queries with a Python function, for tests.
+
+    :param lookup: callable(kind, value) -> error status (JSON value)
+    :param socketPath: str, serve on this Unix socket instead of a free localhost TCP port
+    :param delay: float, s to wait before answering each request
+    """
+    def __init__(self, lookup, socketPath=None, delay=0.0):
+        self.lookup = lookup
+        self.socketPath = socketPath
+        self.delay = delay
+        self.requests = 0
+        self.batches = []  # number of queries of each request
+        self._lock = threading.Lock()
+        self._server = self._thread = None
+
+    @property
+    def address(self):
+        if self.socketPath is not None:
+            return f'unix:{self.socketPath}'
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/check'
+
+    def start(self):
+        """Start serving in a background thread.
+
+        :return: self
+        """
+        if self.socketPath is not None:
+            self._server = _UnixHTTPServer(self.socketPath, _Handler)
+        else:
+            self._server = _HTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.service = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        if self.socketPath is not None and os.path.exists(self.socketPath):
+            os.remove(self.socketPath)
+
+
+__all__ = ['ServiceValidator', 'StandInService']
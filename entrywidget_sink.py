@@ -0,0 +1,164 @@
+"""Setting widget errors from background threads.
+
+Widgets may only be changed on the GUI thread. An ErrorSink takes (widget id, error status) updates
+from any thread, keeps only the latest update for each widget, and sets them on the GUI thread in
+batches of at most `batchSize` per event loop iteration, with one restyle per widget.
+
+    sink = ErrorSink()
+    sink.registerAll(window)  # ids are objectNames, see entrywidget_snapshot.widgetName
+
+    # in a worker thread
+    sink.push('field12', True)
+    sink.pushMany(checkedFiles.items())
+"""
+from PyQt5 import QtCore, sip
+from PyQt5.QtCore import pyqtSignal
+from itertools import islice
+import threading
+
+from entrywidget import AutoColorLineEdit, EntryWidget, deferStatusUpdates
+from entrywidget_snapshot import collectWidgets, widgetName
+
+
+class ErrorSink(QtCore.QObject):
+    """Thread-safe, merging, batched setError for entry widgets.
+
+    Updates are addressed by id: a key given to `register`, or the widget itself.
+    Updates for unknown ids or deleted widgets are dropped (counted in `dropped`).
+
+    :param batchSize: int, maximum number of widgets updated per event loop iteration
+    :param parent: Parent Qt Object (the sink must live in the GUI thread)
+    """
+    applied = pyqtSignal(int)  # number of widgets updated by a batch
+    _wake = pyqtSignal()
+
+    def __init__(self, batchSize=500, parent=None):
+        super().__init__(parent)
+        self.batchSize = batchSize
+        self._widgets = {}  # id: widget
+        self._lock = threading.Lock()
+        self._pending = {}  # id: latest error status, guarded by _lock
+        self._scheduled = False  # a batch is due, guarded by _lock
+        self.received = self.merged = self.updated = self.dropped = self.batches = 0
+        self._wake.connect(self._applyBatch, QtCore.Qt.QueuedConnection)
+
+    def register(self, widget, key=None):
+        """Address a widget by 'key'.
+
+        :param widget: AutoColorLineEdit or EntryWidget
+        :param key: hashable id, default the widget's objectName
+        :return: key
+        """
+        if key is None:
+            key = widgetName(widget)
+        self._widgets[key] = widget
+        return key
+
+    def registerAll(self, root):
+        """Register the entry widgets in a widget tree by objectName (unnamed ones are skipped).
+
+        :param root: QObject to search (including itself), or iterable of widgets
+        :return: int, number of widgets registered
+        """
+        entries, lines = collectWidgets(root)
+        count = 0
+        for w in entries + lines:
+            name = widgetName(w)
+            if name:
+                self._widgets[name] = w
+                count += 1
+        return count
+
+    def unregister(self, key):
+        self._widgets.pop(key, None)
+
+    def push(self, key, error):
+        """Set a widget's error status on the GUI thread soon. Callable from any thread.
+
+        :param key: registered id, or the widget
+        :param error: error status
+        :return:
+        """
+        with self._lock:
+            self.received += 1
+            if key in self._pending:
+                self.merged += 1
+            self._pending[key] = error
+            wake = not self._scheduled
+            self._scheduled = True
+        if wake:
+            self._wake.emit()
+
+    def pushMany(self, updates):
+        """Push several updates at once. Callable from any thread.
+
+        :param updates: iterable of (key, error)
+        :return:
+        """
+        with self._lock:
+            pending = self._pending
+            before = len(pending)
+            count = 0
+            for key, error in updates:
+                pending[key] = error
+                count += 1
+            self.received += count
+            self.merged += count - (len(pending) - before)
+            wake = count and not self._scheduled
+            if wake:
+                self._scheduled = True
+        if wake:
+            self._wake.emit()
+
+    def pending(self):
+        """Number of widgets with updates not applied yet.
+
+        :return: int
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Apply all pending updates now (GUI thread only).
+
+        :return: int, number of widgets updated
+        """
+        with self._lock:
+            updates, self._pending = self._pending, {}
+        return self._apply(updates.items())
+
+    def _applyBatch(self):
+        with self._lock:
+            pending = self._pending
+            if len(pending) <= self.batchSize:
+                updates, self._pending = pending, {}
+            else:
+                updates = {k: pending[k] for k in islice(pending, self.batchSize)}
+                for k in updates:
+                    del pending[k]
+            more = bool(self._pending)
+            self._scheduled = more
+        self._apply(updates.items())
+        if more:
+            QtCore.QTimer.singleShot(0, self._applyBatch)  # after other pending events (input, painting)
+
+    def _apply(self, updates):
+        count = 0
+        with deferStatusUpdates():
+            for key, error in updates:
+                widget = self._widgets.get(key)
+                if widget is None and isinstance(key, (AutoColorLineEdit, EntryWidget)):
+                    widget = key
+                if widget is None or sip.isdeleted(widget):
+                    self._widgets.pop(key, None)
+                    self.dropped += 1
+                    continue
+                widget.setError(error)
+                count += 1
+        self.updated += count
+        self.batches += 1
+        self.applied.emit(count)
+        return count
+
+
+__all__ = ['ErrorSink']
@@ -0,0 +1,294 @@
+"""Fast snapshot and restore of the state of every entry widget in a widget tree.
+
+A snapshot holds, for each EntryWidget/AutoColorLineEdit: text, selected option index,
+error status, readOnly/enabled/option-enabled state and color scheme, packed column-wise into
+a compact, versioned binary blob.
+
+    data = snapshot(window)
+    ...
+    restore(window, data)  # only touches fields which differ, without emitting signals
+
+Snapshots hold data only (compressed JSON), so restoring a tampered file cannot run code.
+Error statuses other than None, bool, int, float and str are stored as their str().
+"""
+from PyQt5.QtGui import QColor
+import json
+import struct
+import zlib
+
+from entrywidget import AutoColorLineEdit, EntryWidget, deferStatusUpdates, _colorKey
+
+MAGIC = b'EWSNAP'
+VERSION = 2
+_header = struct.Struct('<6sH')
+
+# flag bits
+READONLY = 1
+ENABLED = 2
+OPTION_ENABLED = 4
+
+
+class SnapshotError(ValueError):
+    """Raised when data is not a snapshot, or was made by an unsupported version."""
+
+
+def collectWidgets(root):
+    """Get entry widgets in a widget tree, in depth-first order.
+    The internals of entry widgets are not searched, which is much faster than a recursive findChildren.
+
+    :param root: QObject to search (including itself), or iterable of widgets
+    :return: tuple (list of EntryWidget, list of standalone AutoColorLineEdit)
+    """
+    entries, lines = [], []
+    descend = hasattr(root, 'children')
+    stack = [root] if descend else list(root)[::-1]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, EntryWidget):
+            entries.append(obj)
+        elif isinstance(obj, AutoColorLineEdit):
+            lines.append(obj)
+        elif descend:
+            stack.extend(obj.children()[::-1])
+    return entries, lines
+
+
+def widgetName(widget):
+    """Get the objectName identifying an entry widget (an EntryWidget's objectName is given to its lineEdit).
+
+    :param widget: EntryWidget or AutoColorLineEdit
+    :return: str
+    """
+    name = widget.objectName()
+    if not name and isinstance(widget, EntryWidget):
+        name = widget.lineEdit.objectName()
+    return name
+
+
+def _schemeKey(colors):
+    try:
+        key = tuple(colors.items())
+        hash(key)
+    except TypeError:
+        key = repr(colors)
+    return key
+
+
+def _encodeColor(color):
+    if isinstance(color, QColor):
+        return {'argb': color.name(QColor.HexArgb)}
+    return color
+
+
+def _decodeColor(color):
+    if isinstance(color, dict):
+        return QColor(color['argb'])
+    return tuple(color) if isinstance(color, list) else color
+
+
+def _normalScheme(colors):
+    """Get a color scheme comparable across color formats (QColor, list or tuple)."""
+    return {status: tuple(_colorKey(c) for c in pair) for status, pair in colors.items()}
+
+
+def _encodeError(error):
+    return error if error is None or isinstance(error, (bool, int, float, str)) else str(error)
+
+
+def _state(widget):
+    """Get (lineEdit, text, selected index, error, flags) of an entry widget."""
+    if isinstance(widget, EntryWidget):
+        le = widget.lineEdit
+        selected = widget.getSelectedIndex()
+        flags = 0 if widget.optionFixed() else OPTION_ENABLED
+    else:
+        le, selected, flags = widget, -1, 0
+    if le.isReadOnly():
+        flags |= READONLY
+    if le.isEnabled():
+        flags |= ENABLED
+    return le, le.text(), selected, le._error, flags
+
+
+def load(data):
+    """Decode a snapshot.
+
+    :param data: bytes from snapshot()
+    :return: tuple (nEntries, names, texts, selected, errors, flags, schemeIds, schemes)
+    """
+    if len(data) < _header.size:
+        raise SnapshotError('Not a snapshot')
+    magic, version = _header.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError('Not a snapshot')
+    if version != VERSION:
+        raise SnapshotError(f'Unsupported snapshot version {version}')
+    try:
+        payload = json.loads(zlib.decompress(data[_header.size:]))
+    except (zlib.error, ValueError) as e:
+        raise SnapshotError(f'Corrupt snapshot: {e}')
+    nEntries, names, texts, selected, errors, flags, schemeIds, schemes = payload
+    schemes = [{status: tuple(_decodeColor(c) for c in pair) for status, pair in scheme.items()}
+               for scheme in schemes]
+    return nEntries, names, texts, selected, errors, flags, schemeIds, schemes
+
+
+def _match(widgets, current, names):
+    """Pair widgets (named 'current') with snapshot records, by position unless objectNames say otherwise."""
+    if current == names[:len(current)]:
+        return list(zip(widgets, range(len(names))))
+
+    byName = {}
+    for w, n in zip(widgets, current):
+        if n:
+            byName[n] = None if n in byName else w  # None marks duplicate names
+    pairs = []
+    for i, name in enumerate(names):
+        positional = i < len(widgets) and current[i] == name
+        if name and not positional:
+            w = byName.get(name)
+            if w is None:
+                continue
+        elif name or i < len(widgets) and not current[i]:
+            w = widgets[i]
+        else:
+            continue
+        pairs.append((w, i))
+    return pairs
+
+
+def _apply(widget, le, text, selected, error, flags, scheme):
+    """Set the state of an entry widget, changing only fields which differ, with signals blocked.
+    The color scheme replaces the widget's one, unless it is None (the same).
+    Background validation still running is cancelled, so it cannot overwrite the restored error.
+    A lazy EntryWidget's DictComboBox is not created."""
+    le._cancelValidation()
+    blocked = widget.blockSignals(True), le.blockSignals(True)
+    try:
+        if le.text() != text:
+            le.setText(text)
+            le._syncText(text)
+
+        if le._error != error or type(le._error) is not type(error):
+            le.setError(error)
+            le._statusInputChanged('error')
+
+        if le.isReadOnly() != bool(flags & READONLY):
+            le.setReadOnly(bool(flags & READONLY))
+        if le.isEnabled() != bool(flags & ENABLED):
+            le.setEnabled(bool(flags & ENABLED))
+
+        if scheme is not None:
+            le._autoColors.clear()
+            le.setColors(dict(scheme))
+
+        if isinstance(widget, EntryWidget):
+            combo = widget._combo
+            comboBlocked = combo.blockSignals(True) if combo is not None else None
+            try:
+                if widget.getSelectedIndex() != selected and selected < widget.optionCount():
+                    widget.setSelectedIndex(selected)
+                if widget.optionFixed() == bool(flags & OPTION_ENABLED):
+                    widget.setOptionFixed(not flags & OPTION_ENABLED)
+            finally:
+                if combo is not None:
+                    combo.blockSignals(comboBlocked)
+    finally:
+        widget.blockSignals(blocked[0])
+        le.blockSignals(blocked[1])
+
+
+class FormState:
+    """Snapshot and restore a set of entry widgets, collected once.
+    Call `collect` after adding or removing widgets.
+
+    :param root: QObject to search (including itself), or iterable of widgets
+    """
+    def __init__(self, root):
+        self.root = root
+        self.collect()
+
+    def collect(self):
+        """Find the entry widgets in `root` again."""
+        self.entries, self.lines = collectWidgets(self.root)
+        self.entryNames = [widgetName(w) for w in self.entries]
+        self.lineNames = [w.objectName() for w in self.lines]
+
+    def snapshot(self):
+        """Capture the state of all widgets.
+
+        :return: bytes
+        """
+        texts, selected, errors, flags, schemeIds = [], [], [], [], []
+        schemes, schemeIndex = [], {}
+        last, lastId = None, None
+
+        for w in self.entries + self.lines:
+            le, text, sel, error, f = _state(w)
+            texts.append(text)
+            selected.append(sel)
+            errors.append(_encodeError(error))
+            flags.append(f)
+
+            colors = le._autoColors
+            if colors != last:
+                key = _schemeKey(colors)
+                lastId = schemeIndex.get(key)
+                if lastId is None:
+                    lastId = schemeIndex[key] = len(schemes)
+                    schemes.append({status: [_encodeColor(c) for c in pair] for status, pair in colors.items()})
+                last = colors
+            schemeIds.append(lastId)
+
+        payload = (len(self.entries), self.entryNames + self.lineNames, texts, selected, errors, flags,
+                   schemeIds, schemes)
+        return _header.pack(MAGIC, VERSION) + zlib.compress(json.dumps(payload, separators=(',', ':')).encode(), 1)
+
+    def restore(self, data):
+        """Restore the state of the widgets from a snapshot.
+        Only fields which differ from the snapshot are changed, no signals are emitted,
+        and each changed widget is restyled once at the end.
+
+        :param data: bytes from snapshot()
+        :return: int, number of widgets changed
+        """
+        nEntries, names, texts, selected, errors, flags, schemeIds, schemes = load(data)
+        pairs = _match(self.entries, self.entryNames, names[:nEntries])
+        pairs += [(w, i + nEntries) for w, i in _match(self.lines, self.lineNames, names[nEntries:])]
+
+        normal = [_normalScheme(scheme) for scheme in schemes]
+        changed = 0
+        with deferStatusUpdates():
+            for w, i in pairs:
+                le, text, sel, error, f = _state(w)
+                scheme = schemes[schemeIds[i]]
+                if le._autoColors == scheme or _normalScheme(le._autoColors) == normal[schemeIds[i]]:
+                    scheme = None
+                if (text == texts[i] and sel == selected[i] and f == flags[i] and scheme is None
+                        and error == errors[i] and type(error) is type(errors[i]) and not le.isValidating()):
+                    continue
+                _apply(w, le, texts[i], selected[i], errors[i], flags[i], scheme)
+                changed += 1
+        return changed
+
+
+def snapshot(root):
+    """Capture the state of all entry widgets in 'root'.
+
+    :param root: QObject to search (including itself), or iterable of widgets
+    :return: bytes
+    """
+    return FormState(root).snapshot()
+
+
+def restore(root, data):
+    """Restore the state of entry widgets in 'root' from a snapshot, see FormState.restore.
+
+    :param root: QObject to search (including itself), or iterable of widgets
+    :param data: bytes from snapshot()
+    :return: int, number of widgets changed
+    """
+    return FormState(root).restore(data)
+
+
+__all__ = ['FormState', 'snapshot', 'restore', 'load', 'collectWidgets', 'widgetName', 'SnapshotError']
@@ -0,0 +1,151 @@
+"""Form-wide readOnly/enabled/optionFixed changes.
+
+Locking a form by calling setReadOnly on every widget restyles and repaints each widget as it goes.
+A StateController changes the whole form with those side effects held off, restyles each changed
+widget once, and remembers the previous states to restore them exactly:
+
+    lock = StateController(window)
+    lock.push(readOnly=True)  # lock the form for review
+    ...
+    lock.pop()  # unlock: every widget gets its own previous state back
+
+    with lock.pushed(enabled=False):
+        save()
+"""
+from PyQt5.QtWidgets import QLineEdit, QWidget
+from PyQt5 import QtCore, sip
+from contextlib import contextmanager
+
+from entrywidget import EntryWidget, deferStatusUpdates
+from entrywidget_snapshot import collectWidgets
+
+_forceDisabled = QtCore.Qt.WA_ForceDisabled  # set by setEnabled(False), unlike isEnabled() not inherited
+
+
+def _getState(widget):
+    """Get (readOnly, enabled, option enabled or None, clear button enabled) of an entry widget,
+    as set on the widget itself (not inherited from disabled parents)."""
+    if isinstance(widget, EntryWidget):
+        le, combo = widget.lineEdit, widget._combo
+        optionEnabled = widget._optionEnabled if combo is None else not combo.testAttribute(_forceDisabled)
+    else:
+        le, optionEnabled = widget, None
+    return le.isReadOnly(), not le.testAttribute(_forceDisabled), optionEnabled, le.isClearButtonEnabled()
+
+
+def _targetState(state, readOnly, enabled, optionFixed):
+    """Get the state setReadOnly, setEnabled and setOptionFixed (in that order) would give a widget."""
+    leReadOnly, leEnabled, optionEnabled, clear = state
+    isEntry = optionEnabled is not None
+    if readOnly is not None:
+        leReadOnly, clear = readOnly, not readOnly
+        if isEntry:
+            optionEnabled = not readOnly
+    if enabled is not None:
+        leEnabled, clear = enabled, enabled
+        if isEntry:
+            optionEnabled = enabled
+    if optionFixed is not None and isEntry:
+        optionEnabled = not optionFixed
+    return leReadOnly, leEnabled, optionEnabled, clear
+
+
+class StateController:
+    """Applies readOnly, enabled and optionFixed states to all entry widgets of a form at once.
+
+    The widgets change state without their per-change restyling (deferred to one status refresh per
+    widget, see deferStatusUpdates), and the root widget is not repainted until all have changed.
+    States are applied as the widgets' setReadOnly, setEnabled and setOptionFixed would, in that order.
+    What remains is Qt restyling and repainting each changed widget; directPaint widgets
+    (see AutoColorLineEdit.setDirectPaint) skip the styleSheet engine for both.
+
+    :param root: QWidget containing the form (searched on each push), or iterable of widgets
+    """
+    def __init__(self, root):
+        self.root = root
+        self._saved = []  # stack of [(widget, state before push), ...]
+
+    def widgets(self):
+        """Get the entry widgets of the form.
+
+        :return: list of EntryWidget and AutoColorLineEdit
+        """
+        entries, lines = collectWidgets(self.root)
+        return entries + lines
+
+    def depth(self):
+        """Number of pushes not popped yet.
+
+        :return: int
+        """
+        return len(self._saved)
+
+    def push(self, readOnly=None, enabled=None, optionFixed=None):
+        """Remember the state of every widget, then apply the given states (None leaves a state as is).
+
+        :param readOnly: bool
+        :param enabled: bool
+        :param optionFixed: bool, for EntryWidgets
+        :return: int, number of widgets changed
+        """
+        saved = [(w, _getState(w)) for w in self.widgets()]
+        self._saved.append(saved)
+        return self._apply([(w, s, _targetState(s, readOnly, enabled, optionFixed)) for w, s in saved])
+
+    def pop(self):
+        """Restore the states remembered by the last push.
+
+        :return: int, number of widgets changed
+        """
+        if not self._saved:
+            raise IndexError('StateController.pop() without a matching push()')
+        saved = self._saved.pop()
+        return self._apply([(w, _getState(w), s) for w, s in saved if not sip.isdeleted(w)])
+
+    def apply(self, readOnly=None, enabled=None, optionFixed=None):
+        """Apply states without remembering the previous ones.
+
+        :return: int, number of widgets changed
+        """
+        states = [(w, _getState(w)) for w in self.widgets()]
+        return self._apply([(w, s, _targetState(s, readOnly, enabled, optionFixed)) for w, s in states])
+
+    @contextmanager
+    def pushed(self, readOnly=None, enabled=None, optionFixed=None):
+        """Context manager applying states, and restoring the previous ones on exit."""
+        self.push(readOnly, enabled, optionFixed)
+        try:
+            yield self
+        finally:
+            self.pop()
+
+    def _apply(self, targets):
+        """Change widgets from their current state to a target state, for [(widget, state, target), ...]."""
+        root = self.root if isinstance(self.root, QWidget) else None
+        paused = root is not None and root.updatesEnabled()
+        if paused:
+            root.setUpdatesEnabled(False)
+        changed = 0
+        try:
+            with deferStatusUpdates():
+                for widget, state, target in targets:
+                    if state == target:
+                        continue
+                    changed += 1
+                    readOnly, enabled, optionEnabled, clear = target
+                    le = widget.lineEdit if optionEnabled is not None else widget
+                    if state[0] != readOnly:
+                        QLineEdit.setReadOnly(le, readOnly)
+                    if state[1] != enabled:
+                        QLineEdit.setEnabled(le, enabled)
+                    if state[3] != clear:
+                        QLineEdit.setClearButtonEnabled(le, clear)
+                    if state[2] != optionEnabled:
+                        widget._setOptionEnabled(optionEnabled)
+        finally:
+            if paused:
+                root.setUpdatesEnabled(True)
+        return changed
+
+
+__all__ = ['StateController']
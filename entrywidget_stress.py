@@ -0,0 +1,360 @@
+"""Keystroke-stream stress testing of entry widget forms.
+
+Replays synthetic or recorded keystroke streams into a form with QTest key events, and measures for
+each key the time until the widget's status and colors have settled (including background chunked or
+async validation). Reports latency percentiles, dropped frames and the errorCheck/polish calls per key.
+
+    QT_QPA_PLATFORM=offscreen python entrywidget_stress.py --fields 200 --keys 2000 --rate 30 --validator float
+    python entrywidget_stress.py --fields 20 --record session.json  # type into a window, close it when done
+    QT_QPA_PLATFORM=offscreen python entrywidget_stress.py --fields 20 --replay session.json
+
+From code:
+
+    stream = KeyStream.synthetic(2000, nFields=200, rate=30)
+    report = StressHarness(window).run(stream)
+    print(formatReport(report))
+"""
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+from PyQt5.QtTest import QTest
+from PyQt5 import QtCore
+from collections import Counter
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import time
+
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_snapshot import collectWidgets, widgetName
+from entrywidget_trace import CallCounter
+
+FORMAT_VERSION = 1
+
+
+def percentile(values, p):
+    """Get the nearest-rank percentile of sorted 'values'.
+
+    :param values: sorted list of numbers
+    :param p: float, 0-100
+    :return: number, None for no values
+    """
+    if not values:
+        return None
+    return values[max(0, min(len(values) - 1, math.ceil(p / 100 * len(values)) - 1))]
+
+
+def lineEdits(root):
+    """Get the AutoColorLineEdits of the entry widgets in a widget tree, in collectWidgets order.
+
+    :param root: QObject to search (including itself), or iterable of widgets
+    :return: list of AutoColorLineEdit
+    """
+    entries, lines = collectWidgets(root)
+    return [w.lineEdit for w in entries] + lines
+
+
+class KeyStream:
+    """A timed sequence of key events for the fields of a form.
+
+    Each event is a list [time in s from the start, field index, field name, Qt key, modifiers, text].
+    Events are replayed into the field with the name if the form has it, else the one at the index.
+
+    :param events: list of events
+    """
+    def __init__(self, events=()):
+        self.events = [list(e) for e in events]
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    @classmethod
+    def synthetic(cls, n, nFields=1, rate=None, alphabet='0123456789.', backspace=0.1, burst=8, seed=0):
+        """Make a stream of typing: bursts of keys into random fields, with some backspaces.
+
+        :param n: int, number of keys
+        :param nFields: int, number of fields to type into
+        :param rate: float, keys per second; None for as fast as possible
+        :param alphabet: str, characters to type
+        :param backspace: float, probability of a key being Backspace
+        :param burst: int, mean number of keys typed into a field before moving to another
+        :param seed: random seed
+        :return: KeyStream
+        """
+        rng = random.Random(seed)
+        events, field = [], 0
+        for i in range(n):
+            if rng.random() < 1 / burst:
+                field = rng.randrange(nFields)
+            t = i / rate if rate else 0.0
+            if rng.random() < backspace:
+                events.append([t, field, '', int(QtCore.Qt.Key_Backspace), 0, ''])
+            else:
+                c = rng.choice(alphabet)
+                events.append([t, field, '', 0, 0, c])
+        return cls(events)
+
+    def save(self, file):
+        """Write the stream as JSON.
+
+        :param file: path or text file object
+        :return:
+        """
+        data = {'version': FORMAT_VERSION, 'events': self.events}
+        if hasattr(file, 'write'):
+            json.dump(data, file)
+        else:
+            with open(file, 'w') as f:
+                json.dump(data, f)
+
+    @classmethod
+    def load(cls, file):
+        """Read a stream written by `save`.
+
+        :param file: path or text file object
+        :return: KeyStream
+        """
+        if hasattr(file, 'read'):
+            data = json.load(file)
+        else:
+            with open(file) as f:
+                data = json.load(f)
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported key stream version {data.get('version')}")
+        return cls(data['events'])
+
+
+class Recorder(QtCore.QObject):
+    """Records the key presses into the fields of a form, as a KeyStream.
+
+    :param root: widget containing the form
+    """
+    def __init__(self, root):
+        super().__init__()
+        self.root = root
+        self.events = []
+        self._index = {}
+        self._start = None
+
+    def start(self):
+        """Start recording key presses (application wide).
+
+        :return: self
+        """
+        fields = lineEdits(self.root)
+        self._index = {le: (i, widgetName(le)) for i, le in enumerate(fields)}
+        self._start = None
+        QApplication.instance().installEventFilter(self)
+        return self
+
+    def stop(self):
+        """Stop recording.
+
+        :return: KeyStream of the recorded keys
+        """
+        QApplication.instance().removeEventFilter(self)
+        return self.stream()
+
+    def stream(self):
+        return KeyStream(self.events)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.KeyPress and obj in self._index:
+            now = time.perf_counter()
+            if self._start is None:
+                self._start = now
+            index, name = self._index[obj]
+            text = event.text()
+            key = 0 if (text and text.isprintable()) else event.key()
+            self.events.append([now - self._start, index, name, key, int(event.modifiers()),
+                                text if key == 0 else ''])
+        return False
+
+
+class StressHarness:
+    """Replays key streams into a form and measures input latency.
+
+    :param root: widget containing the form (shown by `run` if it isn't)
+    :param frameTime: float, frame budget in s; each whole frame a key's latency exceeds it by counts as dropped
+    :param settleTimeout: float, maximum s to wait for background validation to finish after a key
+    """
+    def __init__(self, root, frameTime=1 / 60, settleTimeout=5.0):
+        self.root = root
+        self.frameTime = frameTime
+        self.settleTimeout = settleTimeout
+
+    def _targets(self, stream):
+        fields = lineEdits(self.root)
+        byName = {}
+        for le in fields:
+            byName.setdefault(widgetName(le), le)
+        byName.pop('', None)
+        targets = []
+        for t, index, name, key, modifiers, text in stream:
+            le = byName.get(name) if name else None
+            targets.append(le if le is not None else fields[index % len(fields)])
+        return targets
+
+    def run(self, stream, realtime=True):
+        """Replay a key stream.
+
+        :param stream: KeyStream
+        :param realtime: bool, whether to wait for each event's time (processing Qt events meanwhile);
+                         False replays as fast as possible
+        :return: dict, see formatReport
+        """
+        app = QApplication.instance()
+        if not self.root.isVisible():
+            self.root.show()
+        app.processEvents()
+        targets = self._targets(stream)
+
+        latencies, counts, perKey = [], Counter(), {'errorCheck': [], 'polish': []}
+        lag = 0.0
+        counter = CallCounter().install()
+        try:
+            start = time.perf_counter()
+            for (t, index, name, key, modifiers, text), le in zip(stream, targets):
+                if realtime:
+                    due = start + t
+                    while time.perf_counter() < due:
+                        app.processEvents(QtCore.QEventLoop.AllEvents, 1)
+                    lag = max(lag, time.perf_counter() - due)
+                counter.counts.clear()
+                t0 = time.perf_counter()
+                mod = QtCore.Qt.KeyboardModifiers(modifiers)
+                if key:
+                    QTest.keyClick(le, key, mod)
+                else:
+                    QTest.keyClick(le, text, mod)
+                self._settle(le, app)
+                latencies.append(time.perf_counter() - t0)
+                counts.update(counter.counts)
+                for k in perKey:
+                    perKey[k].append(counter.counts[k])
+            duration = time.perf_counter() - start
+        finally:
+            counter.uninstall()
+
+        latencies.sort()
+        n = len(latencies)
+        return {
+            'keys': n,
+            'fields': len(set(targets)),
+            'duration': duration if n else 0.0,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if n else None,
+            'droppedFrames': sum(int(l // self.frameTime) for l in latencies),
+            'maxLag': lag,
+            'calls': dict(counts),
+            'callsPerKey': {k: v / n for k, v in counts.items()} if n else {},
+            'maxCallsPerKey': {k: max(v) if v else 0 for k, v in perKey.items()},
+        }
+
+    def _settle(self, le, app):
+        """Wait until background validation of 'le' is done."""
+        if not le.isValidating():
+            return
+        deadline = time.perf_counter() + self.settleTimeout
+        while le.isValidating() and time.perf_counter() < deadline:
+            app.processEvents(QtCore.QEventLoop.AllEvents, 1)
+
+
+def formatReport(report):
+    """Format a StressHarness.run report as text.
+
+    :param report: dict
+    :return: str
+    """
+    ms = lambda s: 'n/a' if s is None else f'{s * 1000:.3f} ms'
+    lines = [
+        f"keys               {report['keys']} into {report['fields']} fields in {report['duration']:.2f} s",
+        f"latency p50        {ms(report['p50'])}",
+        f"latency p95        {ms(report['p95'])}",
+        f"latency p99        {ms(report['p99'])}",
+        f"latency max        {ms(report['max'])}",
+        f"dropped frames     {report['droppedFrames']}",
+        f"max lag            {ms(report['maxLag'])}",
+    ]
+    for name in sorted(report['callsPerKey']):
+        most = report['maxCallsPerKey'].get(name)
+        lines.append(f"{name + ' / key':<18} {report['callsPerKey'][name]:.2f}" +
+                     ('' if most is None else f' (max {most})'))
+    return '\n'.join(lines)
+
+
+_floatRe = re.compile(r'[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?')
+
+# realistic errorChecks for the command line form
+VALIDATORS = {
+    'none': None,
+    'float': lambda w: _floatRe.fullmatch(w.text()) is None,
+    'range': lambda w: not (_floatRe.fullmatch(w.text()) and 0 <= float(w.text()) <= 1000),
+}
+
+
+def makeForm(nFields, kind='entry', validator='float'):
+    """Make a window with 'nFields' entry widgets.
+
+    :param nFields: int
+    :param kind: str, 'entry' for EntryWidgets or 'line' for AutoColorLineEdits
+    :param validator: str, key of VALIDATORS
+    :return: QWidget
+    """
+    check = VALIDATORS[validator]
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    for i in range(nFields):
+        if kind == 'entry':
+            w = EntryWidget(window, objectName=f'field{i}', options=['m', 'km'], errorCheck=check)
+        else:
+            w = AutoColorLineEdit(window, objectName=f'field{i}', errorCheck=check)
+        layout.addWidget(w)
+    return window
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Keystroke stress test of an entry widget form.')
+    parser.add_argument('--fields', type=int, default=50, help='number of fields')
+    parser.add_argument('--kind', choices=('entry', 'line'), default='entry', help='EntryWidget or AutoColorLineEdit')
+    parser.add_argument('--validator', choices=sorted(VALIDATORS), default='float')
+    parser.add_argument('--keys', type=int, default=1000, help='number of synthetic keys')
+    parser.add_argument('--rate', type=float, default=None, help='keys per second (default as fast as possible)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='save the synthetic stream to this file')
+    parser.add_argument('--replay', help='replay a saved or recorded stream instead')
+    parser.add_argument('--record', help='record typing into the form to this file, until its window is closed')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = makeForm(args.fields, args.kind, args.validator)
+
+    if args.record:
+        recorder = Recorder(window).start()
+        window.show()
+        app.exec_()
+        stream = recorder.stop()
+        stream.save(args.record)
+        print(f'recorded {len(stream)} keys to {args.record}')
+        return
+
+    if args.replay:
+        stream = KeyStream.load(args.replay)
+    else:
+        stream = KeyStream.synthetic(args.keys, args.fields, args.rate, seed=args.seed)
+        if args.save:
+            stream.save(args.save)
+
+    report = StressHarness(window).run(stream, realtime=bool(args.rate) or bool(args.replay))
+    print(json.dumps(report, indent=2) if args.json else formatReport(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""Opt-in tracing of the AutoColorLineEdit/EntryWidget validation and signal chain.
+
+Records timestamped spans (textChanged -> errorCheck -> setError -> errorChanged -> polish ...)
+tagged with each widget's `name`, and writes them as Chrome trace-event JSON
+(load in chrome://tracing, https://ui.perfetto.dev, or speedscope).
+
+    tracer = Tracer().install()
+    ...  # interactive session
+    tracer.dump('session.trace.json')
+
+Or set the environment variable ENTRYWIDGET_TRACE=path/to/file.json before importing
+this module to trace the whole process and write the file at exit.
+"""
+from collections import Counter, deque
+import threading
+import atexit
+import json
+import time
+import os
+
+import entrywidget
+
+
+class _Span:
+    """Context manager recording a single complete ('X') trace event."""
+    __slots__ = ('tracer', 'name', 'widget', 'start')
+
+    def __init__(self, tracer, name, widget):
+        self.tracer = tracer
+        self.name = name
+        self.widget = widget
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer._events.append((self.name, self.widget.name, self.start, end, threading.get_ident()))
+        return False
+
+
+class Tracer:
+    """Collects spans from the widgets while installed.
+
+    Events are stored as plain tuples in a bounded deque and only converted to
+    trace-event dicts when exported, keeping the per-span cost to two clock reads
+    and an append.
+
+    :param maxEvents: int, number of most recent spans kept (older spans are dropped)
+    """
+    def __init__(self, maxEvents=1000000):
+        self._events = deque(maxlen=maxEvents)
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._previous = None  # tracer installed before this one, reinstalled by uninstall
+
+    def span(self, name, widget):
+        """Get a context manager which records a span named 'name' for 'widget'.
+
+        :param name: str, step name
+        :param widget: widget with a `name` attribute
+        :return: context manager
+        """
+        return _Span(self, name, widget)
+
+    def install(self):
+        """Start recording spans from all widgets, instead of the tracer installed before (if any).
+
+        :return: self
+        """
+        if entrywidget._tracer is not self:
+            self.uninstall()
+            self._previous = entrywidget._tracer
+            entrywidget._tracer = self
+        return self
+
+    def uninstall(self):
+        """Stop recording spans. If this tracer is the installed one, the tracer installed before
+        it is reinstalled; if a tracer was installed on top of it, it is only removed from the chain.
+
+        :return:
+        """
+        if entrywidget._tracer is self:
+            entrywidget._tracer = self._previous
+        else:
+            above = entrywidget._tracer
+            while above is not None and above._previous is not self:
+                above = above._previous
+            if above is None:
+                return
+            above._previous = self._previous
+        self._previous = None
+
+    def isInstalled(self):
+        return entrywidget._tracer is self
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
+        return False
+
+    def clear(self):
+        """Drop all recorded spans."""
+        self._events.clear()
+
+    def __len__(self):
+        return len(self._events)
+
+    def events(self):
+        """Get recorded spans as Chrome trace events.
+
+        :return: list of dicts
+        """
+        origin, pid = self._origin, self._pid
+        return [{'name': name, 'cat': 'entrywidget', 'ph': 'X', 'pid': pid, 'tid': tid,
+                 'ts': (start - origin) / 1000, 'dur': (end - start) / 1000, 'args': {'widget': widget}}
+                for name, widget, start, end, tid in list(self._events)]
+
+    def toJson(self):
+        """Get recorded spans as a Chrome trace-event JSON string.
+
+        :return: str
+        """
+        return json.dumps({'traceEvents': self.events(), 'displayTimeUnit': 'ms'})
+
+    def dump(self, file):
+        """Write recorded spans to 'file' as Chrome trace-event JSON.
+
+        :param file: str path or writable text file object
+        :return:
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'w') as f:
+                f.write(self.toJson())
+        else:
+            file.write(self.toJson())
+
+
+class CallCounter(Tracer):
+    """Counts the spans of each name (in `counts`) instead of recording them,
+    passing them on to the tracer installed before it, if any."""
+    def __init__(self):
+        super().__init__(maxEvents=0)
+        self.counts = Counter()
+
+    def span(self, name, widget):
+        self.counts[name] += 1
+        if self._previous is not None:
+            return self._previous.span(name, widget)
+        return entrywidget._noSpan
+
+
+if os.environ.get('ENTRYWIDGET_TRACE'):
+    _envTracer = Tracer().install()
+    atexit.register(_envTracer.dump, os.environ['ENTRYWIDGET_TRACE'])
+
+__all__ = ['Tracer', 'CallCounter']
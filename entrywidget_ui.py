@@ -0,0 +1,198 @@
+"""Loading Qt Designer .ui forms with thousands of entry widgets.
+
+uic.loadUi reads the .ui file on every load, then creates each widget and sets its Designer properties
+one setter at a time; every setText validates and restyles the entry widget again. `loadUi` here builds
+the form from a construction plan instead: the .ui compiled to Python once (cached per file, in memory
+and optionally on disk), and run with
+ - EntryWidgets created lazy (their DictComboBox is created when first shown),
+ - the entry widgets' signals blocked and status refreshes deferred while Designer properties are set,
+ - then each entry widget whose text or selected option changed resynced (textChanged, and the
+   option signals), so it is validated and restyled once.
+
+    form = loadUi('order.ui')  # like uic.loadUi: the form's widgets are attributes, form.partNumber
+    loadUi('order.ui', self)  # onto an existing widget
+    form = loadUi('order.ui', cacheDir=appCacheDir)  # reuse the compiled plan between runs
+
+Designer properties of entry widgets without a `set<Name>` setter (e.g. EntryWidget's `text_`) are set
+with setProperty.
+"""
+from PyQt5 import QtWidgets, uic
+from xml.etree import ElementTree
+import hashlib
+import importlib
+import io
+import marshal
+import os
+import sys
+
+from entrywidget import AutoColorLineEdit, EntryWidget, deferStatusUpdates
+
+_plans = {}  # absolute path: UiPlan
+
+
+def _header2module(header):
+    """Get the module name of a customwidget header, as uic does."""
+    if header.endswith('.h'):
+        header = header[:-2]
+    return header.replace('/', '.')
+
+
+def _entryClasses(root):
+    """Get {class name: class} of the entry widget classes among the customwidgets of a .ui tree."""
+    classes = {}
+    for custom in root.iter('customwidget'):
+        name, header = custom.findtext('class'), custom.findtext('header')
+        if not name or not header:
+            continue
+        try:
+            cls = getattr(importlib.import_module(_header2module(header)), name.split('::')[-1])
+        except (ImportError, AttributeError):
+            continue  # uic reports it when compiling
+        if isinstance(cls, type) and issubclass(cls, (AutoColorLineEdit, EntryWidget)):
+            classes[name] = cls
+    return classes
+
+
+def _fixSetters(root, classes):
+    """Mark properties of entry widgets without a `set<Name>` setter to be set with setProperty."""
+    for widget in root.iter('widget'):
+        cls = classes.get(widget.get('class'))
+        if cls is None:
+            continue
+        for prop in widget.findall('property'):
+            name = prop.get('name')
+            if 'stdset' not in prop.attrib and not hasattr(cls, 'set' + name[0].upper() + name[1:]):
+                prop.set('stdset', '0')
+
+
+class UiPlan:
+    """A Designer form compiled to Python, building the form for `loadUi`.
+
+    :param path: str, .ui file
+    :param code: code object of the compiled form, defining the `Ui_<class>` class
+    :param uiClass: str, name of the `Ui_<class>` class
+    :param widgetClass: str, class name of the form's top-level widget
+    :param stamp: (mtime_ns, size) of the .ui file compiled
+    """
+    def __init__(self, path, code, uiClass, widgetClass, stamp):
+        self.path = path
+        self.code = code
+        self.uiClass = uiClass
+        self.widgetClass = widgetClass
+        self.stamp = stamp
+
+    @classmethod
+    def compile(cls, path):
+        """Compile a .ui file.
+
+        :param path: str, .ui file
+        :return: UiPlan
+        """
+        st = os.stat(path)
+        root = ElementTree.parse(path).getroot()
+        _fixSetters(root, _entryClasses(root))
+        source = io.StringIO()
+        uic.compileUi(io.BytesIO(ElementTree.tostring(root)), source)
+        code = compile(source.getvalue(), path, 'exec')
+        return cls(path, code, 'Ui_' + root.findtext('class'), root.find('widget').get('class'),
+                   (st.st_mtime_ns, st.st_size))
+
+    def build(self, baseinstance=None, lazy=True):
+        """Build the form.
+
+        :param baseinstance: widget to build the form onto, None to create the form's top-level widget
+        :param lazy: bool, whether to create EntryWidgets lazy
+        :return: the form's top-level widget, with an attribute per named child widget, layout and action
+        """
+        namespace = {'__name__': f'_uiplan_{self.uiClass}'}
+        exec(self.code, namespace)
+        built = []  # (widget, line edit, text and selection when created, blocked before)
+        for name, cls in list(namespace.items()):
+            if isinstance(cls, type) and issubclass(cls, (AutoColorLineEdit, EntryWidget)):
+                namespace[name] = self._factory(cls, built, lazy)
+
+        if baseinstance is None:
+            widgetClass = namespace.get(self.widgetClass) or getattr(QtWidgets, self.widgetClass)
+            baseinstance = widgetClass()
+        ui = namespace[self.uiClass]()
+        with deferStatusUpdates():
+            try:
+                ui.setupUi(baseinstance)
+            finally:
+                for widget, le, text, selection, blocked in built:
+                    le.blockSignals(blocked[1])
+                    widget.blockSignals(blocked[0])
+            for widget, le, text, selection, blocked in built:
+                if le.text() != text:
+                    le.textChanged.emit(le.text())  # sync, validate once
+                if selection is not None and widget._selection() != selection:
+                    widget._selectionChanged(selection)
+        for name, value in vars(ui).items():
+            setattr(baseinstance, name, value)
+        return baseinstance
+
+    @staticmethod
+    def _factory(cls, built, lazy):
+        def create(*args, **kwargs):
+            if lazy and issubclass(cls, EntryWidget):
+                kwargs.setdefault('lazy', True)
+            widget = cls(*args, **kwargs)
+            le = widget.lineEdit if isinstance(widget, EntryWidget) else widget
+            selection = widget._selection() if isinstance(widget, EntryWidget) else None
+            blocked = widget.blockSignals(True), le.blockSignals(True)
+            built.append((widget, le, le.text(), selection, blocked))
+            return widget
+        return create
+
+
+def _cacheFile(path, cacheDir):
+    digest = hashlib.sha1(path.encode()).hexdigest()[:16]
+    return os.path.join(cacheDir, f'{os.path.basename(path)}.{digest}.{sys.implementation.cache_tag}.uiplan')
+
+
+def loadPlan(uifile, cacheDir=None):
+    """Get the construction plan of a .ui file, compiling it when the file changed.
+
+    :param uifile: str, .ui file
+    :param cacheDir: str, directory to keep compiled plans in between runs, None for memory only
+    :return: UiPlan
+    """
+    path = os.path.abspath(uifile)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    plan = _plans.get(path)
+    if plan is not None and plan.stamp == stamp:
+        return plan
+
+    cached = _cacheFile(path, cacheDir) if cacheDir is not None else None
+    if cached is not None and os.path.exists(cached):
+        try:
+            with open(cached, 'rb') as f:
+                fileStamp, uiClass, widgetClass, code = marshal.load(f)
+            if tuple(fileStamp) == stamp:
+                plan = UiPlan(path, code, uiClass, widgetClass, stamp)
+        except (OSError, EOFError, ValueError, TypeError):
+            plan = None  # unreadable, compile again
+    if plan is None or plan.stamp != stamp:
+        plan = UiPlan.compile(path)
+        if cached is not None:
+            os.makedirs(cacheDir, exist_ok=True)
+            with open(cached, 'wb') as f:
+                marshal.dump((plan.stamp, plan.uiClass, plan.widgetClass, plan.code), f)
+    _plans[path] = plan
+    return plan
+
+
+def loadUi(uifile, baseinstance=None, lazy=True, cacheDir=None):
+    """Build a Designer form, like uic.loadUi, for forms with many entry widgets.
+
+    :param uifile: str, .ui file
+    :param baseinstance: widget to build the form onto, None to create the form's top-level widget
+    :param lazy: bool, whether to create EntryWidgets lazy
+    :param cacheDir: str, directory to keep compiled plans in between runs, None for memory only
+    :return: the form's top-level widget
+    """
+    return loadPlan(uifile, cacheDir).build(baseinstance, lazy)
+
+
+__all__ = ['loadUi', 'loadPlan', 'UiPlan']
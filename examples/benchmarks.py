@@ -0,0 +1,519 @@
+"""Timing benchmarks.
+
+    QT_QPA_PLATFORM=offscreen python examples/benchmarks.py [name ...]
+
+Runs all benchmarks when no names are given.
+"""
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+import time
+import sys
+
+app = QApplication(sys.argv[:1])
+
+from entrywidget import AutoColorLineEdit, EntryWidget
+
+
+def best(func, repeat=5):
+    """Run 'func' 'repeat' times, return the fastest time in seconds"""
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t)
+    return min(times)
+
+
+def report(label, seconds, n=None):
+    per = f'  ({seconds / n * 1e6:.1f} us each)' if n else ''
+    print(f'{label:<50} {seconds * 1000:9.2f} ms{per}')
+
+
+def make_form(n, options=('a', 'b', 'c')):
+    """Make a window with 'n' EntryWidgets"""
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    for i in range(n):
+        layout.addWidget(EntryWidget(objectName=f'field{i}', options=list(options)))
+    return window
+
+
+def bench_snapshot(n=10000):
+    from entrywidget_snapshot import FormState, snapshot, restore
+    window = make_form(n)
+    entries = window.findChildren(EntryWidget)
+    report(f'snapshot {n} fields', best(lambda: snapshot(window)), n)
+    data = snapshot(window)
+    print(f'{"snapshot size":<50} {len(data):9d} bytes')
+    report(f'restore {n} fields, unchanged', best(lambda: restore(window, data)), n)
+
+    state = FormState(window)
+    report(f'FormState.snapshot {n} fields', best(state.snapshot), n)
+    report(f'FormState.restore {n} fields, unchanged', best(lambda: state.restore(data)), n)
+
+    def changeAndRestore():
+        for e in entries[::10]:
+            e.lineEdit.blockSignals(True)
+            e.lineEdit.setText('changed')
+            e.lineEdit.blockSignals(False)
+        state.restore(data)
+    report(f'FormState.restore {n} fields, 10% changed', best(changeAndRestore), n)
+
+
+def bench_pool(n=300, rebuilds=10):
+    from entrywidget_pool import WidgetPool
+    from PyQt5.QtCore import QCoreApplication, QEvent
+    options = {'mm': 0.001, 'm': 1, 'km': 1000}
+
+    def rebuild(acquire, release):
+        """Master-detail selection changes: replace the detail screen with a new one"""
+        screen, widgets = None, []
+        for _ in range(rebuilds):
+            for w in widgets:
+                release(w)
+            if screen is not None:
+                screen.deleteLater()
+            screen = QWidget()
+            layout = QVBoxLayout(screen)
+            widgets = [acquire(screen, i) for i in range(n)]
+            for w in widgets:
+                layout.addWidget(w)
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        for w in widgets:
+            release(w)
+        screen.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def make(parent, i):
+        return EntryWidget(parent, text=str(i), options=options)
+
+    t = best(lambda: rebuild(make, lambda w: None), 3)
+    report(f'rebuild {n} fields x{rebuilds}, no pool', t, n * rebuilds)
+
+    pool = WidgetPool(EntryWidget, maxSize=n)
+    t = best(lambda: rebuild(lambda parent, i: pool.acquire(parent, text=str(i), options=options),
+                             pool.release), 3)
+    report(f'rebuild {n} fields x{rebuilds}, pool', t, n * rebuilds)
+    print(f'{"pool hits/misses/evictions":<50} {pool.hits}/{pool.misses}/{pool.evictions}')
+
+
+def bench_lazy(n=2000):
+    from PyQt5.QtCore import QCoreApplication, QEvent
+    options = {'mm': 0.001, 'm': 1, 'km': 1000}
+
+    def build(lazy):
+        window = QWidget()
+        for i in range(n):
+            EntryWidget(window, text=str(i), options=options, lazy=lazy)
+        window.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    report(f'construct {n} fields, hidden', best(lambda: build(False), 3), n)
+    report(f'construct {n} fields, hidden, lazy', best(lambda: build(True), 3), n)
+
+
+def bench_binding(n=2000, rows=100000, changed=500):
+    from entrywidget_binding import ColumnBinding
+    import random
+    store = {'length': [float(i) for i in range(rows)], 'unit': ['m'] * rows}
+    binding = ColumnBinding(store, parsers={'length': float})
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    for i in range(n):
+        w = EntryWidget(window, options=['m', 'km'])
+        layout.addWidget(w)
+        binding.bind(w, 'length', i, optionColumn='unit')
+    window.show()
+    app.processEvents()
+
+    def update():
+        sample = random.sample(range(n), changed)
+        for r in sample:
+            store['length'][r] += 1
+        binding.storeChanged('length', sample)
+        binding.applyStoreChanges()
+    report(f'apply {changed} changed rows to {n} bound fields', best(update), changed)
+
+    binding.setColumnCheck('length', lambda values: [v < 0 for v in values])
+    report(f'same, with a column check', best(update), changed)
+    window.close()
+
+
+def bench_options(n=500, changes=5, refreshes=100):
+    import random
+    rng = random.Random(0)
+    options = {f'option{i}': i for i in range(n)}
+    feeds = []
+    for _ in range(refreshes):
+        options = dict(options)
+        for key in rng.sample(list(options), changes):
+            del options[key]
+        for _ in range(changes):
+            options[f'option{rng.randrange(10 * n)}'] = 0
+        feeds.append(options)
+
+    widget = EntryWidget(options=feeds[0], errorCheck=lambda w: w.getSelected() == '')
+    report(f'setAllItems {n} options x{refreshes}',
+           best(lambda: [widget.comboBox.setAllItems(f) for f in feeds], 3), refreshes)
+    report(f'setOptions {n} options, {changes} changed, x{refreshes}',
+           best(lambda: [widget.setOptions(f) for f in feeds], 3), refreshes)
+
+
+def bench_paint(n=2000):
+    from PyQt5.QtWidgets import QGridLayout
+
+    def build(directPaint):
+        window = QWidget()
+        layout = QGridLayout(window)
+        fields = [AutoColorLineEdit(window, text=str(i), directPaint=directPaint) for i in range(n)]
+        for i, w in enumerate(fields):
+            layout.addWidget(w, i // 40, i % 40)
+        window.resize(4000, 2000)
+        window.show()
+        app.processEvents()
+        return window, fields
+
+    def flip(fields, error):
+        for w in fields:
+            w.setError(error)
+        window.repaint()
+
+    for directPaint in (False, True):
+        mode = 'palette' if directPaint else 'styleSheet'
+        window, fields = build(directPaint)
+        report(f'repaint {n} fields, {mode}', best(window.repaint), n)
+        report(f'status flip + repaint {n} fields, {mode}',
+               best(lambda: [flip(fields, e) for e in (True, False)]), 2 * n)
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+
+
+def bench_statuses(n=2000):
+    class LevelLineEdit(AutoColorLineEdit):
+        statusDependencies = ('text',)
+
+        def getStatus(self):
+            return self.text()
+
+    for keys in (6, 40, 200):
+        statuses = [str(i) for i in range(keys)]
+        colors = {k: ((i, 100, 200), 'black') for i, k in enumerate(statuses)}
+        for limit in (1000, 0):  # every status's rule, the current status's rule
+            LevelLineEdit.statusRuleLimit = limit
+            widget = LevelLineEdit(colors=colors, text='0')
+            widget.show()
+            mode = 'all status rules' if widget._statusRules is None else 'current status rule'
+            report(f'status change, {keys} statuses, {mode}',
+                   best(lambda: [widget.setText(statuses[i % keys]) for i in range(n)]), n)
+            widget.close()
+            widget.deleteLater()
+            app.processEvents()
+
+
+def _makeUi(n, columns=20):
+    """Get a Designer form of 'n' entry widgets in a grid, half AutoColorLineEdits, half EntryWidgets."""
+    items = []
+    for i in range(n):
+        if i % 2:
+            # stdset="0" lets uic.loadUi set EntryWidget's text_ (which has no setText_ setter)
+            cls, props = 'EntryWidget', f'<property name="text_" stdset="0"><string>{i}</string></property>'
+        else:
+            cls, props = 'AutoColorLineEdit', f'<property name="text"><string>{i}</string></property>'
+            if i % 10 == 0:
+                props += '<property name="readOnly"><bool>true</bool></property>'
+        props += f'<property name="toolTip"><string>field {i}</string></property>'
+        items.append(f'<item row="{i // columns}" column="{i % columns}">'
+                     f'<widget class="{cls}" name="field{i}">{props}</widget></item>')
+    custom = ''.join(f'<customwidget><class>{cls}</class><extends>{base}</extends><header>entrywidget</header>'
+                     f'</customwidget>' for cls, base in (('AutoColorLineEdit', 'QLineEdit'), ('EntryWidget', 'QWidget')))
+    return (f'<?xml version="1.0" encoding="UTF-8"?><ui version="4.0"><class>Form</class>'
+            f'<widget class="QWidget" name="Form"><layout class="QGridLayout" name="grid">{"".join(items)}'
+            f'</layout></widget><customwidgets>{custom}</customwidgets><resources/><connections/></ui>')
+
+
+def bench_ui(n=2000):
+    from PyQt5 import uic
+    from PyQt5.QtCore import QCoreApplication, QEvent
+    import entrywidget_ui
+    import tempfile
+    import os
+
+    def load(func):
+        start = time.perf_counter()
+        form = func()
+        seconds = time.perf_counter() - start
+        form.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        return seconds
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, cacheDir = os.path.join(tmp, 'form.ui'), os.path.join(tmp, 'cache')
+        with open(path, 'w') as f:
+            f.write(_makeUi(n))
+        report(f'compile {n} field form plan', best(lambda: entrywidget_ui.UiPlan.compile(path), 3), n)
+        entrywidget_ui.loadPlan(path, cacheDir)
+        report(f'read {n} field form plan from cacheDir',
+               best(lambda: [entrywidget_ui._plans.clear(), entrywidget_ui.loadPlan(path, cacheDir)], 3), n)
+
+        loaders = {'uic.loadUi': lambda: uic.loadUi(path),
+                   'loadUi, not lazy': lambda: entrywidget_ui.loadUi(path, lazy=False),
+                   'loadUi': lambda: entrywidget_ui.loadUi(path)}
+        times = {label: [] for label in loaders}
+        for _ in range(3):  # interleaved: every load of a form leaves the next one a little slower
+            for label, func in loaders.items():
+                times[label].append(load(func))
+        for label, t in times.items():
+            report(f'load {n} field form, {label}', min(t), n)
+
+
+def bench_history(values=300000, entries=1000000, widgets=20):
+    from PyQt5.QtCore import QStringListModel
+    from PyQt5.QtWidgets import QCompleter
+    from entrywidget_history import InputHistory
+    import random
+    import tempfile
+    import os
+    rng = random.Random(1)
+    letters = 'ABCDEFGHJKLMNPRSTUVWXYZ'
+    distinct = ['{}{}-{:05}'.format(rng.choice(letters), rng.choice(letters), rng.randrange(100000))
+                for _ in range(values)]
+    stream = [rng.choice(distinct) for _ in range(entries)]
+    typed = [[v[:i] for i in range(1, len(v) + 1)] for v in rng.sample(distinct, 50)]
+    keys = sum(len(t) for t in typed)
+
+    history = InputHistory()
+    report(f'import {entries} entries ({values} values)', best(lambda: [history.clear(), history.recordMany(stream)], 1),
+           entries)
+    report('record an entry', best(lambda: history.record(rng.choice(distinct)), 1))
+
+    def complete():
+        for prefixes in typed:
+            history._cache.clear()
+            for p in prefixes:
+                history.complete(p)
+    report(f'complete while typing, {len(history)} values', best(complete, 3), keys)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'parts.history')
+        history.save(path)
+        report(f'save {len(history)} values ({os.path.getsize(path) // 1024} kB)', best(lambda: history.save(path), 3))
+        report(f'load {len(history)} values', best(lambda: InputHistory(path), 3))
+
+    strings = list(set(stream))
+    completer = QCompleter()
+    completer.setModel(QStringListModel(strings, completer))
+
+    def qcomplete():
+        for prefixes in typed:
+            for p in prefixes:
+                completer.setCompletionPrefix(p)
+                completer.completionCount()
+    report(f'QCompleter while typing, {len(strings)} values', best(qcomplete, 3), keys)
+    report(f'QCompleter models for {widgets} widgets',
+           best(lambda: [QStringListModel(strings) for _ in range(widgets)], 1), widgets)
+    report(f'create {widgets} widgets attached to a shared history', best(
+        lambda: [history.attach(AutoColorLineEdit()) for _ in range(widgets)], 1), widgets)
+
+
+def bench_cache(n=2000):
+    from PyQt5.QtCore import QCoreApplication, QEvent
+    from entrywidget_cache import ValidationCache
+    import hashlib
+    import tempfile
+    import os
+
+    def checksumError(text):  # deterministic, expensive
+        return hashlib.pbkdf2_hmac('sha256', text.encode(), b'salt', 2000)[0] % 10 == 0
+
+    def start(errorCheck):
+        window = QWidget()
+        for i in range(n):
+            AutoColorLineEdit(window, text=f'SN-{i:06}', errorCheck=errorCheck)
+        window.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def session(path):
+        cache = ValidationCache(path)
+        start(cache.check(checksumError))
+        cache.close()
+
+    report(f'start with {n} prefilled fields, no cache', best(lambda: start(lambda w: checksumError(w.text())), 3), n)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'validation.sqlite')
+        report(f'start with {n} prefilled fields, first session', best(lambda: session(path), 1), n)
+        report(f'start with {n} prefilled fields, cached', best(lambda: session(path), 3), n)
+        texts = [f'SN-{i:06}' for i in range(n)]
+        report(f'{n} checksums', best(lambda: [checksumError(t) for t in texts], 3), n)
+
+        def lookups():
+            cache = ValidationCache(path)
+            for t in texts:
+                cache.get(checksumError, 'checksumError', 'bench', t)
+            cache.close()
+        lookups()
+        report(f'{n} cached checksums from the file', best(lookups, 3), n)
+
+
+def bench_lock(n=3000):
+    from PyQt5.QtWidgets import QGridLayout
+    from entrywidget_state import StateController
+    for directPaint in (False, True):
+        window = QWidget()
+        layout = QGridLayout(window)
+        fields = [EntryWidget(window, text=str(i), options=['m', 'km'], directPaint=directPaint) for i in range(n)]
+        for i, w in enumerate(fields):
+            layout.addWidget(w, i // 30, i % 30)
+        window.show()
+        app.processEvents()
+
+        def each(status):
+            for w in fields:
+                w.setReadOnly(status)
+            app.processEvents()
+
+        lock = StateController(window)
+
+        def controller(status):
+            lock.push(readOnly=True) if status else lock.pop()
+            app.processEvents()
+
+        variants = (('StateController, directPaint', controller),) if directPaint else \
+            (('setReadOnly on each', each), ('StateController', controller))
+        for label, func in variants:
+            lockTime = unlockTime = float('inf')
+            for _ in range(3):
+                t = time.perf_counter()
+                func(True)
+                lockTime = min(lockTime, time.perf_counter() - t)
+                t = time.perf_counter()
+                func(False)
+                unlockTime = min(unlockTime, time.perf_counter() - t)
+            report(f'lock {n} fields, {label}', lockTime, n)
+            report(f'unlock {n} fields, {label}', unlockTime, n)
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+
+
+def bench_scheduler(n=2000):
+    import sqlite3
+    from entrywidget_scheduler import ValidationScheduler
+    db = sqlite3.connect(':memory:')
+    db.execute('CREATE TABLE parts (id TEXT PRIMARY KEY)')
+    db.executemany('INSERT INTO parts VALUES (?)', ((f'P{i}',) for i in range(0, 100000, 2)))
+
+    def unknown(w):
+        return db.execute('SELECT 1 FROM parts WHERE id = ?', (w.text(),)).fetchone() is None
+
+    def unknownBatch(values):
+        known = set()
+        for i in range(0, len(values), 900):
+            chunk = values[i:i + 900]
+            known.update(r[0] for r in db.execute(
+                f"SELECT id FROM parts WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+        return [v not in known for v in values]
+
+    scheduler = ValidationScheduler()
+    perWidget = [AutoColorLineEdit(errorCheck=unknown) for _ in range(n)]
+    batched = [AutoColorLineEdit(errorCheck=scheduler.check(unknownBatch, batch=True)) for _ in range(n)]
+    scheduler.flush()
+
+    def load(widgets, offset):
+        for i, w in enumerate(widgets):
+            w.setText(f'P{i + offset}')
+        scheduler.flush()
+
+    offsets = iter(range(1, 100))
+    report(f'load {n} fields, SQL query per widget', best(lambda: load(perWidget, next(offsets))), n)
+    report(f'load {n} fields, one SQL IN query per tick', best(lambda: load(batched, next(offsets))), n)
+
+    # the same lookups on a database server: each query waits a round trip
+    roundTrip = 0.0002
+
+    def remote(w):
+        time.sleep(roundTrip)
+        return unknown(w)
+
+    def remoteBatch(values):
+        time.sleep(roundTrip)
+        return unknownBatch(values)
+
+    perWidget = [AutoColorLineEdit(errorCheck=remote) for _ in range(n)]
+    batched = [AutoColorLineEdit(errorCheck=scheduler.check(remoteBatch, batch=True)) for _ in range(n)]
+    scheduler.flush()
+    label = f'{roundTrip * 1e3:.1f} ms round trip'
+    report(f'load {n} fields, {label} per widget', best(lambda: load(perWidget, next(offsets)), 3), n)
+    report(f'load {n} fields, {label} per tick', best(lambda: load(batched, next(offsets)), 3), n)
+
+
+def bench_priority(n=2000):
+    import sqlite3
+    from PyQt5.QtWidgets import QScrollArea
+    from entrywidget_scheduler import ValidationScheduler
+    db = sqlite3.connect(':memory:')
+    db.execute('CREATE TABLE parts (id TEXT PRIMARY KEY)')
+    db.executemany('INSERT INTO parts VALUES (?)', ((f'P{i}',) for i in range(0, 100000, 2)))
+
+    def unknown(w):
+        return db.execute('SELECT 1 FROM parts WHERE id = ?', (w.text(),)).fetchone() is None
+
+    scheduler = ValidationScheduler()
+    scroll = QScrollArea()
+    form = QWidget()
+    layout = QVBoxLayout(form)
+    widgets = [AutoColorLineEdit(form, errorCheck=scheduler.check(unknown)) for _ in range(n)]
+    for w in widgets:
+        layout.addWidget(w)
+    scroll.setWidget(form)
+    scroll.resize(300, 600)
+    scroll.show()
+    app.processEvents()
+    scheduler.flush()
+    offsets = iter(range(1, 1000))
+
+    def load():
+        offset = next(offsets)
+        for i, w in enumerate(widgets):
+            w.setText(f'P{i + offset}')
+
+    def firstTick():
+        load()
+        scheduler._tick()  # the focused and visible widgets, the rest in idle ticks
+
+    def everything():
+        load()
+        scheduler.flush()
+
+    times = {everything: [], firstTick: []}
+    for _ in range(5):
+        for func in times:
+            t = time.perf_counter()
+            func()
+            times[func].append(time.perf_counter() - t)
+            scheduler.flush()
+    visible = sum(scheduler.priority(w) != scheduler.HIDDEN for w in widgets)
+    report(f'load {n} fields, validate all of them', min(times[everything]), n)
+    report(f'load {n} fields, until the {visible} visible are valid', min(times[firstTick]), n)
+    scroll.deleteLater()
+
+
+BENCHMARKS = {
+    'snapshot': bench_snapshot,
+    'pool': bench_pool,
+    'lazy': bench_lazy,
+    'binding': bench_binding,
+    'options': bench_options,
+    'paint': bench_paint,
+    'statuses': bench_statuses,
+    'ui': bench_ui,
+    'history': bench_history,
+    'cache': bench_cache,
+    'lock': bench_lock,
+    'scheduler': bench_scheduler,
+    'priority': bench_priority,
+}
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or BENCHMARKS:
+        print(f'--- {name}')
+        BENCHMARKS[name]()
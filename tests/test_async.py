@@ -0,0 +1,152 @@
+import asyncio
+import pytest
+import sys
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_async import AsyncioDriver
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+
+
+class FakeService:
+    """Stand-in for a validation service; 'bad' text is an error"""
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.started, self.finished = [], []
+
+    async def check(self, widget):
+        text = widget.text()
+        self.started.append(text)
+        await asyncio.sleep(self.delay)
+        if text == 'raise':
+            raise ValueError(text)
+        self.finished.append(text)
+        return 'bad' in text
+
+
+@pytest.fixture
+def driver():
+    driver = AsyncioDriver().start()
+    yield driver
+    driver.close()
+
+
+def test_supersede(qtbot, driver):
+    service = FakeService()
+    widget = AutoColorLineEdit(errorCheck=service.check)
+    show(locals())
+
+    async def run():
+        assert await widget.validated() is False
+        widget.setText('b')
+        await asyncio.sleep(0)  # 'b' check is awaiting the service
+        widget.setText('ba')
+        widget.setText('bad')
+        assert widget.isValidating() is True
+        assert widget.status == 'validating'
+        return await widget.validated()
+
+    assert driver.runUntilComplete(run(), timeout=5) is True
+    assert service.started[-2:] == ['b', 'bad']
+    assert service.finished[-1] == 'bad' and 'b' not in service.finished
+    assert widget.isValidating() is False
+    assert widget.status == 'error'
+
+
+def test_keystrokes(qtbot, driver):
+    service = FakeService(delay=0.01)
+    widget = EntryWidget(errorCheck=service.check)
+    show(locals())
+    qtbot.keyClicks(widget.lineEdit, 'ok')
+    qtbot.waitUntil(lambda: not widget.isValidating())
+    assert widget.getError() is False
+    assert service.finished[-1] == 'ok'
+    widget.setText('bad')
+    qtbot.waitUntil(lambda: widget.getError() is True)
+    assert widget.lineEdit.status == 'error'
+
+
+def test_sync_setError_supersedes(qtbot, driver):
+    widget = AutoColorLineEdit(errorCheck=FakeService().check)
+    show(locals())
+
+    async def run():
+        widget.setText('bad')
+        widget.setError('manual')
+        assert widget.isValidating() is False
+        return await widget.validated()
+
+    assert driver.runUntilComplete(run(), timeout=5) == 'manual'
+    qtbot.wait(50)
+    assert widget.getError() == 'manual'
+
+
+def test_sync_edit_supersedes(qtbot, driver):
+    service = FakeService()
+
+    def check(widget):
+        # a sync result for short text, the service otherwise
+        return True if len(widget.text()) < 3 else service.check(widget)
+
+    widget = AutoColorLineEdit(errorCheck=check, text='good')
+    show(locals())
+
+    async def run():
+        await widget.validated()
+        widget.setText('slow')
+        waiter = asyncio.ensure_future(widget.validated())
+        await asyncio.sleep(0)
+        widget.setText('x')  # cancels the service check, sets the error synchronously
+        return await asyncio.wait_for(waiter, 1)
+
+    assert driver.runUntilComplete(run(), timeout=5) is True
+    assert widget.isValidating() is False
+
+
+def test_exception(qtbot, driver):
+    widget = AutoColorLineEdit(errorCheck=FakeService().check)
+    show(locals())
+
+    async def run():
+        await widget.validated()
+        widget.setText('raise')
+        with pytest.raises(ValueError):
+            await widget.validated()
+        return widget.status
+
+    assert driver.runUntilComplete(run(), timeout=5) == 'default'
+
+
+def test_driver_idle(qtbot, driver):
+    service = FakeService(delay=0.01)
+    widget = AutoColorLineEdit(errorCheck=service.check)
+    show(locals())
+    qtbot.waitUntil(lambda: not driver._timer.isActive())
+    steps = driver.steps
+    qtbot.wait(50)
+    assert driver.steps == steps  # not polling while idle
+    assert driver.isRunning()
+
+    widget.setText('bad')
+    assert driver._timer.isActive()
+    qtbot.waitUntil(lambda: widget.getError() is True)
+    qtbot.waitUntil(lambda: not driver._timer.isActive())
+
+
+def test_no_driver(qtbot):
+    assert AsyncioDriver.current() is None
+    service = FakeService(delay=0)
+    widget = AutoColorLineEdit(errorCheck=service.check)
+    show(locals())
+    widget.setText('bad')
+    assert widget.isValidating() is False
+    assert widget.getError() is True
+    widget.setText('raise')
+    assert widget.getError() is True  # logged, unchanged
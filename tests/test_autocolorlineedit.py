@@ -410,3 +410,325 @@ def test_embed_widgets(qtbot):
     window.setLayout(layout)
     show({'qtbot':qtbot, 'widget':window})
 
+
+
+def chunk_check_no_x(widget):
+    """chunkCheck generator, returns 'X FOUND' if any chunk contains 'x', False otherwise"""
+    widget.chunks = 0
+    while True:
+        chunk = yield
+        if chunk is None:
+            return False
+        widget.chunks += 1
+        if 'x' in chunk:
+            return 'X FOUND'
+
+
+def test_chunkCheck_small(qtbot):
+    widget = AutoColorLineEdit(chunkCheck=chunk_check_no_x, chunkSize=2)
+    show(locals())
+    qtbot.keyClicks(widget, 'abc')
+    assert widget.isValidating() is False
+    assert widget.getError() is False
+    qtbot.keyClicks(widget, 'x')
+    assert widget.getError() == 'X FOUND'
+    assert widget.errorCheck(widget) == 'X FOUND'
+
+
+def test_chunkCheck_background(qtbot):
+    widget = AutoColorLineEdit(chunkCheck=chunk_check_no_x, chunkSize=10, chunkThreshold=100)
+    widget.chunkTimeSlice = 0
+    progress = []
+    widget.validationProgress.connect(progress.append)
+    show(locals())
+
+    assert 'validating' not in widget.styleSheet()
+    widget.setText('a' * 1000 + 'x')
+    assert widget.isValidating() is True
+    assert widget.status == 'validating'
+    assert getCurrentColor(widget, 'Window').names[0] == widget.validatingColors[0]
+    assert widget.getError() is False
+    qtbot.waitUntil(lambda: widget.isValidating() is False)
+    assert widget.getError() == 'X FOUND'
+    assert widget.chunks == 101
+    assert progress[0] == 0.0 and progress[-1] == 1.0
+    assert progress == sorted(progress)
+
+
+def test_chunkCheck_cancel(qtbot):
+    widget = AutoColorLineEdit(chunkCheck=chunk_check_no_x, chunkSize=10, chunkThreshold=100)
+    widget.chunkTimeSlice = 0
+    show(locals())
+
+    widget.setText('x' + 'a' * 1000)
+    widget.setText('a' * 1000)
+    assert widget.isValidating() is True
+    qtbot.waitUntil(lambda: widget.isValidating() is False)
+    assert widget.getError() is False
+    assert widget.chunks == 100
+
+
+def test_status_cached(qtbot):
+    widget = AutoColorLineEdit()
+    show(locals())
+    calls = []
+    getStatus = widget.getStatus
+    widget.getStatus = lambda: calls.append(1) or getStatus()
+
+    assert widget.status == 'blank'
+    widget.style().polish(widget)
+    assert calls == []
+
+    qtbot.keyClicks(widget, 'abc')
+    assert widget.status == 'default'
+    assert len(calls) == 1
+    widget.setError(True)
+    assert widget.status == 'error'
+    widget.setReadOnly(True)
+    assert widget.status == 'error-readonly'
+    widget.setReadOnly(False)
+    widget.setError(False)
+    widget.setEnabled(False)
+    assert widget.status == 'disabled'
+    assert getCurrentColor(widget, 'Window')[1] == widget.defaultColors['disabled'][0]
+    widget.setEnabled(True)
+    widget.setText('')
+    assert widget.status == 'blank'
+
+
+def test_status_dependencies(qtbot):
+    class LengthLineEdit(AutoColorLineEdit):
+        statusDependencies = ('text',)
+
+        def getStatus(self):
+            return 'long' if len(self.text()) > 3 else 'short'
+
+    widget = LengthLineEdit(colors={'long': ('red', 'black'), 'short': ('blue', 'black')})
+    show(locals())
+    assert widget.status == 'short'
+    qtbot.keyClicks(widget, 'abcd')
+    assert widget.status == 'long'
+    assert getCurrentColor(widget, 'Window').names[0] == 'red'
+    widget.setError(True)
+    assert widget.status == 'long'
+
+
+def test_directPaint(qtbot):
+    widget = AutoColorLineEdit(directPaint=True)
+    show(locals())
+    widget.setColors(test_color_dict_good)
+    assert widget.isDirectPaint()
+    assert widget.styleSheet() == ''
+
+    assert getCurrentColor(widget, 'Window').names[0] == test_color_dict_good['blank'][0]
+    assert getCurrentColor(widget, 'WindowText').names[0] == test_color_dict_good['blank'][1]
+    widget.setError(True)
+    assert getCurrentColor(widget, 'Window').names[0] == test_color_dict_good['error'][0]
+    widget.setReadOnly(True)
+    assert getCurrentColor(widget, 'Window').names[0] == test_color_dict_good['error-readonly'][0]
+    widget.setError(False)
+    assert getCurrentColor(widget, 'Window')[1] == test_color_dict_good['readonly'][0]
+    widget.setReadOnly(False)
+    widget.setEnabled(False)
+    assert getCurrentColor(widget, 'Window')[1] == test_color_dict_good['disabled'][0]
+    widget.setEnabled(True)
+    widget.setFocus()
+
+    other = AutoColorLineEdit(directPaint=True, colors=test_color_dict_good)
+    assert other._palette is widget._palette  # palettes are shared
+    other.setColors(([255, 0, 0], [0, 0, 0]))  # list colors are cache keys too
+    assert getCurrentColor(other, 'Window').names[0] == 'red'
+
+    widget.setColors(test_color_tuple_good)
+    widget.setText('a')
+    assert getCurrentColor(widget, 'Window').names[0] == test_color_tuple_good[0]
+
+    widget.setDirectPaint(False)
+    assert not widget.isDirectPaint()
+    assert widget.styleSheet() != ''
+    assert getCurrentColor(widget, 'Window').names[0] == test_color_dict_good['default'][0]
+
+
+def test_directPaint_palettes(qtbot):
+    from PyQt5.QtGui import QPalette, QColor
+    widget = AutoColorLineEdit()
+    show(locals())
+    own = QPalette()
+    own.setColor(QPalette.HighlightedText, QColor('yellow'))
+    widget.setPalette(own)
+    widget.setDirectPaint(True, test_color_dict_good)
+    assert getCurrentColor(widget, 'Window').names[0] == test_color_dict_good['blank'][0]
+
+    # application palette changes are followed
+    base = QApplication.palette()
+    for color in ('green', 'blue'):
+        changed = QPalette(base)
+        changed.setColor(QPalette.Highlight, QColor(color))
+        QApplication.setPalette(changed)
+        qtbot.wait(1)
+        assert widget.palette().color(QPalette.Highlight) == QColor(color)
+        assert getCurrentColor(widget, 'Window').names[0] == test_color_dict_good['blank'][0]
+    QApplication.setPalette(base)
+    qtbot.wait(1)
+    assert widget.palette().color(QPalette.Highlight) == QApplication.palette('QLineEdit').color(QPalette.Highlight)
+
+    # the widget's own palette is restored
+    widget.setDirectPaint(False)
+    assert widget.palette().color(QPalette.HighlightedText) == QColor('yellow')
+
+
+def test_directPaint_custom_status(qtbot):
+    class LengthLineEdit(AutoColorLineEdit):
+        statusDependencies = ('text',)
+
+        def getStatus(self):
+            return 'long' if len(self.text()) > 3 else 'short'
+
+    widget = LengthLineEdit(directPaint=True, colors={'long': ('red', 'black'), 'short': ('blue', 'rgb(0,0,0)')})
+    show(locals())
+    assert getCurrentColor(widget, 'Window').names[0] == 'blue'
+    assert getCurrentColor(widget, 'WindowText').names[0] == 'black'
+    qtbot.keyClicks(widget, 'abcd')
+    assert getCurrentColor(widget, 'Window').names[0] == 'red'
+
+
+def test_many_statuses(qtbot):
+    class LevelLineEdit(AutoColorLineEdit):
+        statusDependencies = ('text',)
+
+        def getStatus(self):
+            return 'level' + self.text()
+
+    colors = {f'level{i}': ((i, 0, 255 - i), 'white') for i in range(40)}
+    colors['level7'] = ('red', 'black')
+    widget = LevelLineEdit(colors=colors, text='3')
+    show(locals())
+    assert len(widget.autoColors()) > widget.statusRuleLimit
+    assert widget.styleSheet() == widget.makeStyleString(colors['level3'])
+    assert getCurrentColor(widget, 'Window').hex.lower() == '#0300fc'
+    assert getCurrentColor(widget, 'WindowText').names[0] == 'white'
+
+    widget.setText('7')
+    assert widget.styleSheet() == widget.makeStyleString(('red', 'black'))
+    assert getCurrentColor(widget, 'Window').names[0] == 'red'
+    assert getCurrentColor(widget, 'WindowText').names[0] == 'black'
+
+    # statuses without colors get the default style
+    widget.setText('x')
+    assert widget.styleSheet() == ''
+
+    # rules are shared between widgets, and dropped for a tuple
+    other = LevelLineEdit(colors=colors, text='7')
+    assert other._statusRules['level7'] is widget._statusRules['level7']
+    other.setColors(('blue', 'red'))
+    assert other._statusRules is None
+    other.setText('3')
+    assert getCurrentColor(other, 'Window').names[0] == 'blue'
+
+    # list colors work as rule cache keys
+    colors['level7'] = [[255, 0, 0], 'black']
+    other.setColors(colors)
+    other.setText('7')
+    assert getCurrentColor(other, 'Window').names[0] == 'red'
+
+    # a small dict is a single styleSheet again
+    widget = AutoColorLineEdit(colors=test_color_dict)
+    assert widget._statusRules is None
+    assert len(widget.styleSheet().split('\n')) == 7
+
+
+def test_adaptive_liveErrorChecking(qtbot):
+    import time
+    delay, calls, modes = [0.0], [], []
+
+    def check(w):
+        calls.append(w.text())
+        time.sleep(delay[0])
+        return w.text() == 'bad'
+
+    widget = AutoColorLineEdit(liveErrorChecking='adaptive', errorCheck=check)
+    widget.liveCheckModeChanged.connect(modes.append)
+    show(locals())
+    assert widget.liveCheckMode() == 'live'
+    qtbot.keyClicks(widget, 'ab')
+    assert widget.liveCheckMode() == 'live'
+    assert widget.checkLatency() < widget.adaptiveBudget
+
+    # slow validator: debounced
+    delay[0] = 0.02
+    widget.clear()
+    qtbot.keyClicks(widget, 'bad')
+    assert widget.liveCheckMode() == 'debounced'
+    assert modes == ['debounced']
+    decision = widget.liveCheckDecisions()[-1]
+    assert (decision['from'], decision['to']) == ('live', 'debounced')
+    assert decision['latency'] >= 0.02
+    qtbot.waitUntil(lambda: widget.getError() is True)
+    calls.clear()
+    widget.setText('ok')
+    qtbot.keyClicks(widget, '!')
+    assert calls == []
+    assert widget.getError() is True  # not checked yet
+    qtbot.waitUntil(lambda: calls == ['ok!'])
+    assert widget.getError() is False
+
+    # very slow validator: on editingFinished only
+    delay[0] = 0.15
+    for _ in range(3):
+        widget.editingFinished.emit()
+    assert widget.liveCheckMode() == 'editingFinished'
+    calls.clear()
+    qtbot.keyClicks(widget, 'x')
+    qtbot.wait(widget.adaptiveDebounce + 50)
+    assert calls == []
+
+    # fast again: back to live
+    delay[0] = 0.0
+    for _ in range(3):
+        widget.editingFinished.emit()
+    assert widget.liveCheckMode() == 'live'
+    assert modes == ['debounced', 'editingFinished', 'live']
+    widget.setText('bad')
+    assert widget.getError() is True
+
+    widget.setLiveErrorChecking(False)
+    assert widget.liveCheckMode() == 'editingFinished'
+    assert widget.liveCheckDecisions() == []
+
+
+def test_parser(qtbot):
+    parsed, values = [], []
+
+    def parser(text):
+        parsed.append(text)
+        return float(text)
+
+    widget = AutoColorLineEdit(text='1.5', parser=parser, valueCheck=lambda v: v < 0)
+    widget.valueChanged.connect(values.append)
+    show(locals())
+    assert widget.value() == 1.5
+    assert widget.getError() is False
+    assert parsed == ['1.5']
+
+    parsed.clear()
+    qtbot.keyClicks(widget, '7')
+    assert values == [1.57]
+    assert parsed == ['1.57']  # once, shared by errorCheck and value()
+    assert widget.value() == 1.57
+
+    widget.setText('-2')
+    assert widget.getError() is True
+    widget.setText('abc')
+    assert widget.value() is None
+    assert widget.getError() == widget.parseError() == "could not convert string to float: 'abc'"
+    assert values[-1] is None
+    widget.setText('2')
+    assert widget.getError() is False
+    assert values == [1.57, -2.0, None, 2.0]
+
+    # errorCheck reads the cached value
+    widget = AutoColorLineEdit(text='x', parser=parser, errorCheck=lambda w: w.value() > 10)
+    assert widget.getError() == "could not convert string to float: 'x'"
+    widget.setText('11')
+    assert widget.getError() is True
+    assert widget.value() == 11.0
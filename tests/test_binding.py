@@ -0,0 +1,188 @@
+import pytest
+import sys
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_binding import ColumnBinding
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+from PyQt5.QtCore import Qt
+
+app = QApplication(sys.argv)
+
+
+def make_form(binding, rows, hidden=()):
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    widgets = []
+    for row in rows:
+        w = EntryWidget(window, options=['m', 'km'])
+        layout.addWidget(w)
+        binding.bind(w, 'length', row, optionColumn='unit')
+        widgets.append(w)
+    for i in hidden:
+        widgets[i].hide()
+    return window, widgets
+
+
+def test_store_to_widgets(qtbot):
+    store = {'length': [float(i) for i in range(1000)], 'unit': ['m'] * 1000}
+    binding = ColumnBinding(store, parsers={'length': float})
+    window, widgets = make_form(binding, range(10, 15), hidden=[4])
+    show({'qtbot': qtbot, 'widget': window})
+    assert [w.text() for w in widgets] == ['10.0', '11.0', '12.0', '13.0', '14.0']
+    assert widgets[0].getSelected() == 'm'
+
+    changed = []
+    widgets[0].textChanged.connect(changed.append)
+    rows = range(0, 1000, 2)  # 500 rows changed elsewhere
+    for r in rows:
+        store['length'][r] = -1.0
+    binding.storeChanged('length', rows)
+    store['unit'][11] = 'km'
+    binding.storeChanged('unit', [11])
+    assert widgets[0].text() == '10.0'  # not applied yet
+
+    count = binding.updateCount
+    qtbot.waitUntil(lambda: widgets[0].text() == '-1.0')
+    assert binding.updateCount - count == 3  # rows 10, 11 and 12 are visible, 14 is hidden
+    assert widgets[1].getSelected() == 'km'
+    assert widgets[2].text() == '-1.0'
+    assert widgets[4].text() == '14.0'
+    assert changed == []
+
+    widgets[4].show()
+    assert widgets[4].text() == '-1.0'
+
+
+def test_widgets_to_store(qtbot):
+    store = {'length': [0.0] * 20, 'unit': ['m'] * 20}
+    binding = ColumnBinding(store, parsers={'length': float})
+    window, widgets = make_form(binding, range(3))
+    show({'qtbot': qtbot, 'widget': window})
+    written = []
+    binding.storeWritten.connect(written.append)
+
+    widgets[0].lineEdit.selectAll()
+    qtbot.keyClicks(widgets[0].lineEdit, '5')
+    widgets[1].setText('2.5')
+    widgets[1].setSelected('km')
+    widgets[2].setText('abc')
+    assert store['length'][:3] == [0.0, 0.0, 0.0]
+    qtbot.waitUntil(lambda: len(written) == 1)
+    assert store['length'][:3] == [5.0, 2.5, 0.0]
+    assert store['unit'][:3] == ['m', 'km', 'm']
+    assert written[0]['length'] == [0, 1]
+    assert binding.parseFailures == 1
+
+
+def test_column_check(qtbot):
+    store = {'length': [1.0, -2.0, 3.0, -4.0]}
+    binding = ColumnBinding(store, parsers={'length': float})
+    calls = []
+
+    def negative(values):
+        calls.append(list(values))
+        return [v < 0 for v in values]
+
+    binding.setColumnCheck('length', negative)
+    window = QWidget()
+    widgets = [AutoColorLineEdit(window) for _ in range(4)]
+    for row, w in enumerate(widgets):
+        binding.bind(w, 'length', row)
+    assert [w.getError() for w in widgets] == [False, True, False, True]
+
+    show({'qtbot': qtbot, 'widget': window})
+    store['length'][:] = [-1.0, -1.0, 1.0, 1.0]
+    binding.storeChanged('length')
+    calls.clear()
+    assert binding.applyStoreChanges() == 4
+    assert calls == [[-1.0, -1.0, 1.0, 1.0]]
+    assert [w.getError() for w in widgets] == [True, True, False, False]
+
+
+def test_numpy(qtbot):
+    np = pytest.importorskip('numpy')
+    store = {'length': np.arange(100, dtype=float)}
+    binding = ColumnBinding(store)
+    binding.setColumnCheck('length', lambda values: values > 50)
+    window = QWidget()
+    widgets = [AutoColorLineEdit(window) for _ in range(3)]
+    for w, row in zip(widgets, (10, 60, 70)):
+        binding.bind(w, 'length', row)
+    show({'qtbot': qtbot, 'widget': window})
+    assert [w.getError() for w in widgets] == [False, True, True]
+
+    store['length'][50:] = 0
+    binding.storeChanged('length', np.arange(50, 100))
+    binding.applyStoreChanges()
+    assert [w.text() for w in widgets] == ['10.0', '0.0', '0.0']
+    assert [w.getError() for w in widgets] == [False, False, False]
+
+    widgets[0].setText('99')
+    binding.flush()
+    assert store['length'][10] == 99.0
+    assert widgets[0].getError() is True
+
+
+def test_edit_validated_once(qtbot):
+    store = {'length': [1.0, 2.0]}
+    binding = ColumnBinding(store, parsers={'length': float})
+    checks, columnChecks = [], []
+    binding.setColumnCheck('length', lambda values: columnChecks.append(list(values)) or [v < 0 for v in values])
+    window = QWidget()
+    widgets = [AutoColorLineEdit(window, errorCheck=lambda w: checks.append(w.text()) or False) for _ in range(2)]
+    for row, w in enumerate(widgets):
+        binding.bind(w, 'length', row)
+    show({'qtbot': qtbot, 'widget': window})
+    checks.clear()
+    columnChecks.clear()
+
+    widgets[0].setText('-5')
+    assert widgets[0].getError() is False  # until written
+    binding.flush()
+    assert widgets[0].getError() is True
+    assert checks == []
+    assert columnChecks == [[-5.0]]
+
+    # unparseable edits are errors
+    widgets[0].setText('1')
+    binding.flush()
+    assert widgets[0].getError() is False
+    qtbot.keyClicks(widgets[0], 'x')
+    binding.flush()
+    assert widgets[0].getError() is True
+    assert binding.parseFailures == 1
+    assert store['length'][0] == 1.0
+    qtbot.keyClick(widgets[0], Qt.Key_Backspace)
+    binding.flush()
+    assert widgets[0].getError() is False
+
+    # without a column check, the widget's errorCheck
+    binding.setColumnCheck('length', None)
+    widgets[1].setText('-5')
+    assert checks == ['-5']
+    binding.unbind(widgets[1])
+    widgets[1].setText('3')
+    assert checks == ['-5', '3']
+
+
+def test_destroyed(qtbot):
+    store = {'length': [float(i) for i in range(4)], 'unit': ['m'] * 4}
+    binding = ColumnBinding(store, parsers={'length': float})
+    window, widgets = make_form(binding, range(4))
+    show({'qtbot': qtbot, 'widget': window})
+    widgets[1].setText('7')
+    widgets[1].deleteLater()
+    widgets[2].deleteLater()
+    qtbot.waitUntil(lambda: len(binding) == 2)
+    del widgets[1:3]
+
+    store['length'][:] = [9.0] * 4
+    binding.storeChanged('length')
+    assert binding.applyStoreChanges() == 2
+    assert [w.text() for w in widgets] == ['9.0', '9.0']
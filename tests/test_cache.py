@@ -0,0 +1,221 @@
+import pytest
+import sys
+import os
+import subprocess
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_cache import ValidationCache
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+
+calls = []
+
+
+def checksumError(text):
+    calls.append(text)
+    return sum(map(ord, text)) % 7 != 0
+
+
+def test_startup(qtbot, tmp_path):
+    path = str(tmp_path / 'validation.sqlite')
+    calls.clear()
+    cache = ValidationCache(path)
+    check = cache.check(checksumError, version=1)
+    widgets = [AutoColorLineEdit(text=t, errorCheck=check) for t in ('a', 'b', 'c', 'a')]
+    show({'qtbot': qtbot, 'widget': widgets[0]})
+    assert calls == ['a', 'b', 'c']  # the second 'a' is cached
+    errors = [w.getError() for w in widgets]
+    assert cache.misses == 3 and cache.hits == 1
+    cache.close()
+
+    # next session: read from the file
+    calls.clear()
+    cache = ValidationCache(path)
+    check = cache.check(checksumError, version=1)
+    widgets = [AutoColorLineEdit(text=t, errorCheck=check) for t in ('a', 'b', 'c', 'a')]
+    assert calls == []
+    assert [w.getError() for w in widgets] == errors
+    assert cache.hits == 4
+
+    # EntryWidget, keyed by text and option
+    unitCheck = cache.check(lambda key: key[1] == 'km', name='unit', key=lambda w: (w.text(), w.getSelected()))
+    entry = EntryWidget(text='b', options=['m', 'km'], errorCheck=unitCheck)
+    assert entry.getError() is False
+    entry.setSelected('km')
+    entry.setText('c')
+    assert entry.getError() is True
+    cache.close()
+
+
+def test_version(tmp_path):
+    path = str(tmp_path / 'validation.sqlite')
+    cache = ValidationCache(path)
+    assert cache.get(lambda v: 'v1', 'check', '1', 'x') == 'v1'
+    assert cache.get(lambda v: 'other', 'check', '1', 'x') == 'v1'
+    cache.flush()
+    assert len(cache) == 1
+
+    # versions are cached apart
+    assert cache.get(lambda v: 'v2', 'check', '2', 'x') == 'v2'
+    cache.flush()
+    assert len(cache) == 2
+    cache.close()
+    cache = ValidationCache(path)
+    assert cache.get(lambda v: 'v3', 'check', '2', 'x') == 'v2'
+    assert cache.get(lambda v: 'v3', 'check', '1', 'x') == 'v1'
+
+    cache.invalidate('other')
+    assert len(cache) == 2
+    cache.invalidate('check')
+    assert len(cache) == 0
+    assert cache.get(lambda v: 'v4', 'check', '2', 'x') == 'v4'
+    cache.invalidate()
+    assert len(cache) == 0
+    cache.close()
+
+    # closed: validators run without the cache
+    assert cache.get(lambda v: 'v5', 'check', '2', 'x') == 'v5'
+
+
+def test_default_version():
+    from entrywidget_cache import _codeVersion
+
+    def a(v):
+        return v == 1
+
+    def b(v):
+        return v == 2
+
+    def c(v):
+        return v == 1
+    assert _codeVersion(a) == _codeVersion(c)
+    assert _codeVersion(a) != _codeVersion(b)
+
+    # names read
+    def length(t):
+        return len(t) > 5
+
+    def largest(t):
+        return max(t) > 5
+    assert _codeVersion(length) != _codeVersion(largest)
+
+
+NESTED = """
+import sys
+from entrywidget_cache import _codeVersion
+
+def check(text):
+    return any(c.isdigit() for c in text) and sorted(text, key=lambda c: -ord(c))
+
+print(_codeVersion(check))
+"""
+
+
+def test_default_version_nested():
+    # the same in every process, though nested code objects' reprs have their addresses
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    versions = {subprocess.run([sys.executable, '-c', NESTED], env=env, capture_output=True, text=True,
+                               check=True).stdout for _ in range(2)}
+    assert len(versions) == 1
+
+
+def test_uncacheable(tmp_path):
+    cache = ValidationCache(str(tmp_path / 'validation.sqlite'))
+    results = []
+    validator = lambda v: results.append(v) or [v]
+    assert cache.get(validator, 'list', '1', 'x') == ['x']
+    assert cache.get(validator, 'list', '1', 'x') == ['x']
+    assert results == ['x', 'x']
+    assert cache.uncacheable == 2
+    cache.close()
+
+
+def test_eviction(tmp_path):
+    cache = ValidationCache(str(tmp_path / 'validation.sqlite'), maxEntries=10, memorySize=0)
+    for i in range(10):
+        cache.get(str, 'str', '1', i)
+    cache.flush()
+    for i in range(5):
+        cache.get(str, 'str', '1', i)  # used again
+    cache.flush()
+    for i in range(10, 15):
+        cache.get(str, 'str', '1', i)
+    cache.flush()
+    assert len(cache) == 10
+    assert cache.evicted == 5
+    kept = {row[0] for row in cache._db.execute('SELECT input FROM results')}
+    assert kept == {str(i) for i in [0, 1, 2, 3, 4, 10, 11, 12, 13, 14]}
+    cache.close()
+
+
+WRITER = """
+import sys
+from entrywidget_cache import ValidationCache
+cache = ValidationCache(sys.argv[1])
+for i in range(200):
+    cache.get(lambda v: v % 2 == 0, 'even', '1', i)
+    if i % 20 == 0:
+        cache.flush()
+cache.close()
+"""
+
+
+def test_concurrent_instances(tmp_path):
+    path = str(tmp_path / 'validation.sqlite')
+    cache = ValidationCache(path)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    writer = subprocess.Popen([sys.executable, '-c', WRITER, path], env=env)
+    for i in range(200, 400):
+        cache.get(lambda v: v % 2 == 0, 'even', '1', i)
+        if i % 20 == 0:
+            cache.flush()
+    cache.flush()
+    assert writer.wait(timeout=60) == 0
+    assert len(cache) == 400
+
+    calls = []
+    other = ValidationCache(path)
+    results = [other.get(lambda v: calls.append(v), 'even', '1', i) for i in (0, 1, 398, 399)]
+    assert results == [True, False, True, False]
+    assert calls == []
+    other.close()
+    cache.close()
+
+
+def rangeCheck(limit):
+    return lambda v: v > limit
+
+
+def limitCheck(v, limit):
+    return v > limit
+
+
+def test_bound_values(tmp_path):
+    import functools
+    cache = ValidationCache(str(tmp_path / 'validation.sqlite'))
+    small = cache.check(rangeCheck(10), key=lambda v: v)
+    big = cache.check(rangeCheck(1000), key=lambda v: v)
+    assert small(50) is True
+    assert big(50) is False
+
+    small = cache.check(functools.partial(limitCheck, limit=10), key=lambda v: v)
+    big = cache.check(functools.partial(limitCheck, limit=1000), key=lambda v: v)
+    assert small(50) is True
+    assert big(50) is False
+
+    # alternating versions of one name are both kept
+    cache.flush()
+    writes = cache.writes
+    for _ in range(3):
+        assert small(50) is True
+        assert big(50) is False
+    assert cache.hits == 6
+    assert cache.flush() == 0 and cache.writes == writes
+    cache.close()
@@ -0,0 +1,99 @@
+import pytest
+import sys
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_deps import DependencyGraph, DependencyCycleError
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+
+app = QApplication(sys.argv)
+
+
+def make_range():
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    low = AutoColorLineEdit(window, objectName='low', text='1')
+    high = AutoColorLineEdit(window, objectName='high', text='5',
+                             errorCheck=lambda w: float(w.text() or 0) <= float(low.text() or 0))
+    system = EntryWidget(window, objectName='system', options=['metric', 'imperial'])
+    units = {'metric': ['m', 'km'], 'imperial': ['ft', 'mi']}
+    length = EntryWidget(window, objectName='length', text='3', options=['m', 'km', 'ft', 'mi'],
+                         errorCheck=lambda w: w.getSelected() not in units[system.getSelected()])
+    summary = AutoColorLineEdit(window, objectName='summary',
+                                errorCheck=lambda w: bool(high.getError() or length.getError()))
+    for w in (low, high, system, length, summary):
+        layout.addWidget(w)
+    return window, low, high, system, length, summary
+
+
+def test_incremental(qtbot):
+    window, low, high, system, length, summary = make_range()
+    show({'qtbot': qtbot, 'widget': window})
+    graph = DependencyGraph()
+    graph.add(summary, reads=[high, length])
+    graph.add(high, reads=[low])
+    graph.add(length, reads=[system])
+
+    assert graph.dependencies(high) == (low,)
+    assert set(graph.dependents(high)) == {summary}
+    assert (low, high) in graph.edges()
+    assert graph.affected(low) == (high, summary)
+    order = graph.order()
+    assert order.index(low) < order.index(high) < order.index(summary)
+
+    low.setText('10')
+    assert high.getError() is True
+    assert summary.getError() is True
+    assert graph.recomputeCounts[high] == 1 and graph.recomputeCounts[summary] == 1
+    assert graph.recomputeCounts[length] == 0
+    assert graph.batchCount == 1
+
+    system.setSelected('imperial')
+    assert length.getError() is True
+    assert graph.recomputeCounts[length] == 1 and graph.recomputeCounts[high] == 1
+
+    summary.setText('x')
+    assert graph.batchCount == 2
+
+
+def test_batch(qtbot):
+    window, low, high, system, length, summary = make_range()
+    show({'qtbot': qtbot, 'widget': window})
+    graph = DependencyGraph()
+    graph.add(high, reads=[low])
+    graph.add(length, reads=[system])
+    graph.add(summary, reads=[high, length])
+
+    with graph.batch():
+        low.setText('10')
+        low.setText('0')
+        system.setSelected('imperial')
+        assert graph.batchCount == 0
+    assert graph.batchCount == 1
+    assert graph.recomputeCounts[summary] == 1
+    assert high.getError() is False
+    assert length.getError() is True
+    assert summary.getError() is True
+
+
+def test_cycle(qtbot):
+    window, low, high, system, length, summary = make_range()
+    graph = DependencyGraph()
+    graph.add(high, reads=[low])
+    graph.add(summary, reads=[high])
+    with pytest.raises(DependencyCycleError) as err:
+        graph.add(low, reads=[summary])
+    assert err.value.cycle == [low, high, summary, low]
+    assert graph.dependencies(low) == ()
+    with pytest.raises(DependencyCycleError):
+        graph.add(low, reads=[low])
+
+    graph.remove(high)
+    assert graph.dependencies(summary) == ()
+    graph.add(low, reads=[summary])
+    assert graph.affected(summary) == (low,)
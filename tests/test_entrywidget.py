@@ -223,3 +223,195 @@ def test_hasError(qtbot):
     assert widget.windowTitle() == 'ERROR'
     widget.clearError()
     assert widget.getError() is None
+
+
+def test_lazy(qtbot):
+    widget = EntryWidget(lazy=True, options={'a': 1, 'b': 2, 'c': 3}, errorCheck=check_text_matches_option)
+    changed, data = [], []
+    widget.optionChanged[str].connect(changed.append)
+    widget.dataChanged[object].connect(data.append)
+    assert widget._combo is None
+
+    assert widget.getOptions() == {'a': 1, 'b': 2, 'c': 3}
+    assert widget.getSelected() == 'a'
+    assert widget.currentData() == 1
+    widget.setSelected('b')
+    assert widget.getSelectedIndex() == 1
+    assert changed == ['b'] and data == [2]
+    widget.setText('b')
+    assert widget.getError() is True
+    widget.setSelected('c')
+    assert widget.getError() is False
+    widget.setOptionFixed(True)
+    assert widget.optionFixed() is True
+    widget.setOptions(['x', 'y'])
+    assert widget.getSelected() == 'x' and widget.optionCount() == 2
+    assert widget._combo is None
+
+    show(locals())
+    assert widget._combo is not None
+    assert widget.comboBox.currentText() == 'x'
+    assert widget.comboBox.isEnabled() is False
+    widget.setOptionFixed(False)
+    widget.comboBox.setCurrentText('y')
+    assert changed[-1] == 'y' and data[-1] == 'y'
+
+
+def test_lazy_comboBox_access(qtbot):
+    widget = EntryWidget(lazy=True, options=['a', 'b'], readOnly=True)
+    show(locals())
+    widget = EntryWidget(lazy=True, options=['a', 'b'], readOnly=True)
+    widget.setSelectedIndex(1)
+    assert widget.isReadOnly() is True
+    assert widget.comboBox.currentText() == 'b'
+    assert widget.comboBox.isEnabled() is False
+
+
+def test_setOptions_diff(qtbot):
+    for lazy in (False, True):
+        widget = EntryWidget(options={'a': 1, 'b': 2, 'c': 3}, errorCheck=check_text_matches_option, lazy=lazy)
+        show(locals())
+        widget.setSelected('b')
+        combo = widget.comboBox if not lazy else None
+        model = combo.model() if combo is not None else None
+        itemB = model.item(1) if model is not None else None
+        checks, texts, indexes, data = [], [], [], []
+        widget.lineEdit.errorChanged.connect(lambda: checks.append(1))
+        widget.optionChanged[str].connect(texts.append)
+        widget.optionIndexChanged[int].connect(indexes.append)
+        widget.dataChanged[object].connect(data.append)
+        widget.setText('b')
+        checks.clear()
+
+        widget.setOptions({'a': 1, 'b': 2, 'c': 3})
+        widget.setOptions({'a': 1, 'b': 2, 'c': 3, 'd': 4})
+        assert (texts, indexes, data, checks) == ([], [], [], [])
+        assert widget.getError() is True
+
+        widget.setOptions({'z': 0, 'b': 2, 'd': 4})
+        assert widget.getOptions() == {'z': 0, 'b': 2, 'd': 4}
+        assert widget.getSelected() == 'b' and widget.getSelectedIndex() == 1
+        assert (texts, indexes, data) == ([], [], [])
+        if combo is not None:
+            assert combo.model() is model
+            assert model.item(1) is itemB
+
+        widget.setOptions({'b': 20, 'd': 4})
+        assert (texts, indexes, data) == ([], [0], [20])
+        assert widget.currentData() == 20
+
+        widget.setOptions(['d', 'b'])
+        assert widget.getOptions() == {'d': 'd', 'b': 'b'}
+        assert widget.getSelectedIndex() == 1
+
+        widget.setOptions(['x', 'y'])
+        assert widget.getSelected() == 'x'
+        assert texts == ['x']
+        assert widget.getError() is False
+
+
+def test_setOptions_repeated(qtbot):
+    for lazy in (False, True):
+        widget = EntryWidget(options=['a', 'a'], lazy=lazy)
+        show(locals())
+        assert widget.getOptions() == {'a': 'a'}
+        widget.setOptions(['b', 'a', 'b'])
+        assert widget.getOptions() == {'b': 'b', 'a': 'a'}
+        assert widget.optionCount() == 2
+
+    widget.comboBox.addItem('a')  # repeated by a direct change
+    widget.setOptions(['a', 'c'])
+    assert widget.getOptions() == {'a': 'a', 'c': 'c'}
+    assert widget.optionCount() == 2
+
+
+def test_setOptions_after_direct_change(qtbot):
+    widget = EntryWidget(options=['a', 'b'])
+    show(locals())
+    widget.setOptions(['a', 'b', 'c'])
+    widget.comboBox.addItem('q', 'qData')
+    widget.comboBox.setItemData(0, 'aData')
+    assert widget.getOptions() == {'a': 'aData', 'b': 'b', 'c': 'c', 'q': 'qData'}
+    widget.setOptions(['a', 'b', 'c'])
+    assert widget.getOptions() == {'a': 'a', 'b': 'b', 'c': 'c'}
+
+
+def test_optionChecks(qtbot):
+    calls = []
+
+    def record(name, check):
+        def f(w):
+            calls.append(name)
+            return check(w)
+        return f
+
+    number = record('number', lambda w: not w.text().replace('.', '', 1).isdigit())
+    percent = record('percent', lambda w: number(w) or float(w.text()) > 100)
+    ratio = record('ratio', lambda w: number(w) or float(w.text()) > 1)
+
+    widget = EntryWidget(text='50', options={'%': 0.01, 'ratio': 1, 'mm': 0.001}, errorCheck=number,
+                         optionChecks={'%': percent, 1: ratio})
+    show(locals())
+    assert widget.activeErrorCheck() is percent
+    assert widget.getError() is False
+    calls.clear()
+    qtbot.keyClicks(widget.lineEdit, '0')
+    assert widget.getError() is True  # 500 %
+    assert calls == ['percent', 'number']
+
+    widget.setSelected('ratio')  # by data
+    assert widget.activeErrorCheck() is ratio
+    assert widget.getError() is True
+    widget.setSelected('mm')  # fallback
+    assert widget.activeErrorCheck() is number
+    assert widget.getError() is False
+
+    # selection changed without signals
+    widget.comboBox.blockSignals(True)
+    widget.setSelected('%')
+    widget.comboBox.blockSignals(False)
+    assert widget.activeErrorCheck() is percent
+
+    widget.setOptions(['ratio', 'mm'])
+    assert widget.getSelected() == 'ratio'
+    assert widget.activeErrorCheck() is number  # no data any more
+
+    widget.setOptionChecks(None)
+    widget.setSelected('mm')
+    assert widget.activeErrorCheck() is number
+
+
+def test_optionChecks_lazy(qtbot):
+    widget = EntryWidget(text='5', options=['a', 'b'], lazy=True,
+                         optionChecks={'b': lambda w: w.text() != 'b'})
+    assert widget.getError() is False  # default errorCheck
+    widget.setSelected('b')
+    assert widget.getError() is True
+    widget.setText('b')
+    assert widget.getError() is False
+
+
+def test_parser(qtbot):
+    calls = []
+
+    def parser(text, scale):
+        calls.append((text, scale))
+        return float(text) * scale
+
+    values = []
+    widget = EntryWidget(text='2', options={'m': 1, 'km': 1000}, parser=parser,
+                         optionChecks={'km': lambda w: w.value() > 5000})
+    widget.valueChanged.connect(values.append)
+    show(locals())
+    assert widget.value() == 2.0
+    calls.clear()
+    widget.setSelected('km')
+    assert values == [2000.0]
+    assert calls == [('2', 1000)]
+    assert widget.getError() is False
+    widget.setText('6')
+    assert widget.getError() is True
+    widget.setText('')
+    assert widget.parseError() == "could not convert string to float: ''"
+    assert widget.getError() == widget.parseError()
+    assert values == [2000.0, 6000.0, None]
@@ -0,0 +1,163 @@
+import pytest
+import sys
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_history import InputHistory, sharedHistory
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+
+app = QApplication(sys.argv)
+
+
+def test_complete():
+    history = InputHistory(limit=3)
+    for value in ['A-100', 'A-200', 'A-100', 'B-100', 'A-300', 'A-100', 'A-200']:
+        history.record(value)
+    assert len(history) == 4
+    assert history.count('A-100') == 3
+    assert 'B-100' in history and 'A-400' not in history
+
+    assert history.complete('A') == ['A-100', 'A-200', 'A-300']
+    assert history.complete('A-2') == ['A-200']
+    assert history.complete('B') == ['B-100']
+    assert history.complete('C') == []
+    assert history.complete('', limit=10) == ['A-100', 'A-200', 'A-300', 'B-100']
+
+    # blank values and values with NUL are not recorded
+    assert history.record('') is False
+    assert history.record('a\0b') is False
+    assert len(history) == 4
+
+
+def test_complete_recency():
+    history = InputHistory(halfLife=2, limit=20)
+    for _ in range(3):
+        history.record('old')
+    assert history.complete('') == ['old']
+    # entries decay by half every 2 entries: 3 entries of 'old' count more than a later single entry,
+    # but less than one 4 entries later
+    for i in range(10):
+        history.record(f'new{i}')
+    history.record('new9')
+    ranked = history.complete('')
+    assert ranked[:2] == ['new9', 'new8']
+    assert ranked.index('new3') < ranked.index('old') < ranked.index('new0')
+
+    # cached completions are updated by new entries
+    assert history.complete('o') == ['old']
+    history.record('other')
+    assert history.complete('o') == ['other', 'old']
+
+
+def test_recordMany():
+    values = ['A-100', 'B-200', 'A-100', '', 'C-300', 'B-200', 'A-100', 'D\0']
+    one = InputHistory()
+    one.record('B-200')
+    for value in values:
+        one.record(value)
+    many = InputHistory()
+    many.record('B-200')
+    assert many.recordMany(values) == 6
+    assert many._values == one._values
+    assert list(many._counts) == list(one._counts)
+    assert list(many._ranks) == pytest.approx(list(one._ranks))
+    assert many.complete('') == one.complete('') == ['A-100', 'B-200', 'C-300']
+    assert many.recordMany([]) == 0
+
+
+def test_prune():
+    history = InputHistory(maxValues=10)
+    for i in range(10):
+        history.record(f'{i:02}')
+        history.record(f'{i:02}')
+    for i in range(10, 20):
+        history.record(f'{i:02}')
+    assert len(history) == 10
+    assert history.complete('0') == [f'{i:02}' for i in range(9, -1, -1)]
+
+
+def test_save_load(tmp_path):
+    path = str(tmp_path / 'sub' / 'parts.history')
+    history = InputHistory(path)
+    for value in ['A-100', 'A-100', 'A-100', 'é-200']:
+        history.record(value)
+    assert history.save() is True
+    assert history.save() is False  # unchanged
+
+    loaded = InputHistory(path)
+    assert len(loaded) == 2
+    assert loaded.count('A-100') == 3
+    assert loaded.complete('') == ['A-100', 'é-200']
+    assert loaded.complete('') == history.complete('')
+    loaded.record('C')
+    history.record('C')
+    assert loaded.complete('') == history.complete('')
+
+    # other halfLife: ranks rescaled, recency counts more
+    other = InputHistory(path, halfLife=0.25)
+    assert other.complete('') == ['é-200', 'A-100']
+
+    empty = InputHistory()
+    empty.save(str(tmp_path / 'empty.history'))
+    assert len(InputHistory(str(tmp_path / 'empty.history'))) == 0
+
+    (tmp_path / 'bad.history').write_bytes(b'not a history')
+    with pytest.raises(ValueError):
+        InputHistory(str(tmp_path / 'bad.history'))
+    with pytest.raises(ValueError):
+        InputHistory().save()
+
+
+def test_sharedHistory():
+    a = sharedHistory('test_sharedHistory', limit=5)
+    assert sharedHistory('test_sharedHistory') is a
+    assert a.limit == 5
+    assert sharedHistory('test_sharedHistory_other') is not a
+
+
+def test_attach(qtbot):
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    part = AutoColorLineEdit(window, errorCheck=lambda w: w.text().startswith('X'))
+    length = EntryWidget(window, options=['m', 'km'])
+    layout.addWidget(part)
+    layout.addWidget(length)
+    show({'qtbot': qtbot, 'widget': window})
+
+    history = InputHistory()
+    for value in ['A-100', 'A-200', 'A-200', 'B-100']:
+        history.record(value)
+    completer = history.attach(part)
+    history.attach(length)
+    assert part.completer() is completer
+    assert length.lineEdit.completer() is not None
+
+    # completions while typing
+    part.setFocus()
+    qtbot.keyClicks(part, 'A')
+    assert completer.model().stringList() == ['A-200', 'A-100']
+    qtbot.keyClicks(part, '-1')
+    assert completer.model().stringList() == ['A-100']
+    qtbot.keyClicks(part, '00')
+    assert completer.model().stringList() == ['A-100']
+
+    # recorded on editingFinished without error
+    part.editingFinished.emit()
+    assert history.count('A-100') == 2
+    part.setText('X-1')
+    part.editingFinished.emit()
+    assert part.getError()
+    assert 'X-1' not in history
+
+    # shared between widgets
+    length.setText('12')
+    length.editingFinished.emit()
+    assert '12' in history
+    part.clear()
+    qtbot.keyClicks(part, '1')
+    assert completer.model().stringList() == ['12']
@@ -0,0 +1,59 @@
+import logging
+import sys
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_memory import measure, leakCheck, footprint
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+
+# per-widget budgets, about twice the measured cost
+LINE_BYTES = 4000
+ENTRY_BYTES = 12000
+LEAK_BYTES = 5000  # per cycle of 50 widgets; one leaked widget is over 1500, one-off table resizes are amortized
+
+
+def test_lineedit_budget():
+    report = measure(lambda parent: AutoColorLineEdit(parent, errorCheck=lambda w: w.text() == ''), n=100)
+    assert report['bytes'] < LINE_BYTES, report['top']
+    assert report['qtObjects'] <= 2
+
+
+def test_entrywidget_budget():
+    report = measure(lambda parent: EntryWidget(parent, options=['m', 'km']), n=100)
+    assert report['bytes'] < ENTRY_BYTES, report['top']
+    assert report['qtObjects'] <= 6
+    lazy = measure(lambda parent: EntryWidget(parent, options=['m', 'km'], lazy=True), n=100)
+    assert lazy['qtObjects'] < report['qtObjects']
+    assert set(report['footprint']) >= {'colors', 'styleSheet', 'lineEditDict', 'entryDict', 'qtObjects'}
+
+
+def test_no_leaks():
+    def connected(parent):
+        widget = EntryWidget(parent, objectName='field', options=['m', 'km'],
+                             errorCheck=lambda w: w.getSelected() == 'km')
+        widget.optionChanged[str].connect(lambda t: widget.setText(t))
+        widget.lineEdit.textChanged.connect(lambda t: widget.getError())
+        return widget
+
+    logging.disable(logging.CRITICAL)  # pytest keeps captured log records
+    try:
+        results = [leakCheck(f, cycles=10) for f in (lambda parent: AutoColorLineEdit(parent), connected)]
+    finally:
+        logging.disable(logging.NOTSET)
+    for leaks in results:
+        assert leaks['widgets'] == 0
+        assert leaks['loggers'] == 0
+        assert leaks['handlers'] == 0
+        assert leaks['bytesPerCycle'] < LEAK_BYTES
+
+
+def test_logger_reuse():
+    widgets = [AutoColorLineEdit(objectName='reused') for _ in range(3)]
+    assert len(logging.getLogger('reused').handlers) == 1
+    unnamed = [AutoColorLineEdit(), AutoColorLineEdit()]
+    assert unnamed[0].logger is unnamed[1].logger
+    assert footprint(widgets[0])['qtObjects'] == 2
@@ -0,0 +1,86 @@
+import pytest
+import sys
+
+# test helpers
+from qt_utils.helpers_for_tests import show, check_error_typed
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_pool import WidgetPool
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication, QWidget
+
+app = QApplication(sys.argv)
+
+
+def test_reuse(qtbot):
+    pool = WidgetPool(EntryWidget)
+    parent = QWidget()
+    widget = pool.acquire(parent, text='first', options=['a', 'b'], errorCheck=check_error_typed)
+    show({'qtbot': qtbot, 'widget': parent})
+    called = []
+    widget.textChanged.connect(lambda t: called.append(t))
+    widget.errorChanged.connect(lambda: called.append('error'))
+    widget.setSelected('b')
+    widget.setText('error')
+    widget.setReadOnly(True)
+    widget.setColors({'default': ('red', 'black')})
+    assert widget.getError() == 'ERROR'
+    pool.release(widget)
+    assert widget.parent() is None
+    assert len(pool) == 1
+
+    other = pool.acquire(parent, text='second', options=['a', 'b'], errorCheck=check_error_typed)
+    assert other is widget
+    assert pool.hits == 1 and pool.misses == 1
+    assert widget.parent() is parent
+    assert widget.text() == 'second'
+    assert widget.getSelected() == 'a'
+    assert widget.getError() is False
+    assert widget.isReadOnly() is False
+    assert widget.lineEdit.autoColors()['default'] == AutoColorLineEdit.defaultColors['default']
+    assert widget.lineEdit.status == 'default'
+
+    # user connections are gone, own connections still work
+    n = len(called)
+    qtbot.keyClicks(widget.lineEdit, 'x')
+    widget.setText('error')
+    assert len(called) == n
+    assert widget.getError() == 'ERROR'
+    assert widget.lineEdit.status == 'error'
+
+
+def test_config_key(qtbot):
+    pool = WidgetPool(AutoColorLineEdit)
+    widget = pool.acquire(colors=('red', 'white'))
+    pool.release(widget)
+    assert pool.acquire(colors=('blue', 'white')) is not widget
+    assert pool.acquire(colors=('red', 'white')) is widget
+    with pytest.raises(ValueError):
+        pool.release(AutoColorLineEdit())
+
+
+def test_eviction(qtbot):
+    pool = WidgetPool(AutoColorLineEdit, maxSize=2)
+    widgets = [pool.acquire() for _ in range(4)]
+    for w in widgets:
+        pool.release(w)
+    assert len(pool) == 2
+    assert pool.evictions == 2
+    assert pool.acquire() is widgets[3]
+    assert pool.acquire() is widgets[2]
+    assert pool.acquire() not in widgets
+
+
+def test_deleted_with_parent(qtbot):
+    pool = WidgetPool(EntryWidget)
+    parent = QWidget()
+    widgets = [pool.acquire(parent, options=['a']) for _ in range(3)]
+    pool.release(widgets[0])
+    widgets[0].deleteLater()  # idle
+    parent.deleteLater()  # in use
+    qtbot.waitUntil(lambda: not pool._inUse)
+    assert len(pool) == 0
+    assert pool._initial == {}
+    assert pool.acquire(options=['a']) not in widgets
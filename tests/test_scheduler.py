@@ -0,0 +1,220 @@
+import pytest
+import sys
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_scheduler import ValidationScheduler
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+
+app = QApplication(sys.argv)
+
+
+def test_batches(qtbot):
+    scheduler = ValidationScheduler()
+    batches = []
+
+    def outOfRange(values):
+        batches.append(list(values))
+        return [not 0 <= v <= 100 for v in values]
+
+    items = []
+
+    def blank(w):
+        items.append(w)
+        return w.text() == ''
+
+    inRange = scheduler.check(outOfRange, batch=True)
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    fields = [AutoColorLineEdit(window, text=str(i), parser=float, errorCheck=inRange) for i in range(200)]
+    units = [EntryWidget(window, text='1', options=['m', 'km'], parser=lambda t, d: float(t), errorCheck=inRange)
+             for i in range(5)]
+    names = [AutoColorLineEdit(window, errorCheck=scheduler.check(blank)) for i in range(3)]
+    for w in fields + units + names:
+        layout.addWidget(w)
+    show({'qtbot': qtbot, 'widget': window})
+    qtbot.waitUntil(lambda: not scheduler.isPending())
+    assert len(batches) == 1 and len(batches[0]) == 205
+    assert len(items) == 3
+    assert [w.getError() for w in fields[99:102]] == [False, False, True]
+    assert [w.getError() for w in names] == [True] * 3
+
+    batches.clear()
+    for i, w in enumerate(fields):  # programmatic load
+        w.setText(str(i - 100))
+    fields[0].setText('x')  # parse failure, set at once
+    assert fields[0].getError() == "could not convert string to float: 'x'"
+    units[0].setSelected('km')
+    assert fields[5].getError() is False  # not validated yet
+    assert scheduler.isPending(fields[5])
+    assert scheduler.flush() == 200
+    assert len(batches) == 1 and len(batches[0]) == 200
+    assert [w.getError() for w in fields[99:102]] == [True, False, False]
+    assert scheduler.ticks == 2 and scheduler.batchCalls == 2
+
+
+def test_numpy(qtbot):
+    np = pytest.importorskip('numpy')
+    scheduler = ValidationScheduler()
+    check = scheduler.check(lambda values: np.asarray(values) > 10, batch=True)
+    widgets = [AutoColorLineEdit(text=str(i * 5), parser=float, errorCheck=check) for i in range(4)]
+    scheduler.flush()
+    assert [w.getError() for w in widgets] == [False, False, False, True]
+
+
+def test_priority(qtbot):
+    from PyQt5.QtWidgets import QTabWidget, QScrollArea
+    scheduler = ValidationScheduler(idleBatch=10)
+    order = []
+    check = scheduler.check(lambda w: order.append(w) or w.text() == 'bad')
+
+    tabs = QTabWidget()
+    page = QWidget()
+    scroll = QScrollArea()
+    inner = QWidget()
+    layout = QVBoxLayout(inner)
+    scrolled = [AutoColorLineEdit(inner, text=str(i), errorCheck=check) for i in range(100)]
+    for w in scrolled:
+        layout.addWidget(w)
+    scroll.setWidget(inner)
+    pageLayout = QVBoxLayout(page)
+    pageLayout.addWidget(scroll)
+    other = QWidget()
+    otherLayout = QVBoxLayout(other)
+    onOtherTab = [EntryWidget(other, text='bad', options=['m', 'km'], errorCheck=check) for i in range(5)]
+    for w in onOtherTab:
+        otherLayout.addWidget(w)
+    tabs.addTab(page, 'page')
+    tabs.addTab(other, 'other')
+    tabs.resize(300, 300)
+    show({'qtbot': qtbot, 'widget': tabs})
+    tabs.activateWindow()
+    qtbot.waitUntil(tabs.isActiveWindow)
+    scheduler.flush()
+    order.clear()
+
+    focused = scrolled[50]  # scrolled out of view, but focused
+    focused.setFocus()
+    qtbot.waitUntil(focused.hasFocus)
+    assert scheduler.priority(focused) == scheduler.FOCUSED
+    assert scheduler.priority(scrolled[0]) == scheduler.VISIBLE
+    assert scheduler.priority(scrolled[99]) == scheduler.HIDDEN
+    assert scheduler.priority(onOtherTab[0]) == scheduler.HIDDEN
+    assert scheduler.priority(onOtherTab[0], focus=onOtherTab[0].lineEdit) == scheduler.FOCUSED
+
+    # bulk update: everything dirty, the other tab last
+    for w in reversed(scrolled):
+        w.setText('bad')
+    for w in onOtherTab:
+        w.setText('ok')
+    assert scheduler.revalidate() == 105
+    visible = [w for w in scrolled if scheduler.priority(w) == scheduler.VISIBLE]
+    assert 0 < len(visible) < 50
+
+    validated = []
+    scheduler.validated.connect(validated.append)
+    scheduler._tick()
+    assert order[0] is focused
+    assert set(order[1:]) == set(visible)
+    assert all(w.getError() for w in visible)
+    assert scheduler.isPending(scrolled[99]) and scheduler.isPending(onOtherTab[0])
+    assert validated == [1 + len(visible)]
+
+    # hidden widgets: in idle ticks, idleBatch at a time
+    order.clear()
+    scheduler._idle()
+    assert len(order) == 10
+    assert scheduler.isPending(onOtherTab[0])
+
+    # shown since: validated at the next idle tick
+    tabs.setCurrentIndex(1)  # focuses its first widget, marking it dirty
+    order.clear()
+    scheduler._tick()
+    scheduler._idle()
+    assert set(onOtherTab) <= set(order)
+    assert [w.getError() for w in onOtherTab] == [False] * 5
+
+    settled = []
+    scheduler.settled.connect(lambda: settled.append(True))
+    qtbot.waitUntil(lambda: not scheduler.isPending())
+    assert settled == [True]
+    assert all(w.getError() for w in scrolled)
+    assert scheduler.idleTicks >= 3
+
+
+def test_validateAll(qtbot):
+    scheduler = ValidationScheduler()
+    limit = [10]
+    check = scheduler.check(lambda w: float(w.text()) > limit[0])
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    widgets = [AutoColorLineEdit(window, text=str(i * 5), errorCheck=check) for i in range(4)]
+    hidden = AutoColorLineEdit(text='20', errorCheck=check)  # never shown
+    for w in widgets:
+        layout.addWidget(w)
+    show({'qtbot': qtbot, 'widget': window})
+
+    # everything settled when it returns, hidden widgets included
+    assert scheduler.validateAll() == 5
+    assert not scheduler.isPending()
+    assert [w.getError() for w in widgets + [hidden]] == [False, False, False, True, True]
+
+    limit[0] = 5
+    assert [w.getError() for w in widgets] == [False, False, False, True]
+    assert scheduler.validateAll(widgets[:3]) == 3
+    assert [w.getError() for w in widgets] == [False, False, True, True]
+
+
+def test_dependent_and_bound(qtbot):
+    from PyQt5.QtWidgets import QTabWidget
+    from entrywidget_deps import DependencyGraph
+    from entrywidget_binding import ColumnBinding
+    scheduler = ValidationScheduler()
+    graph = DependencyGraph()
+    store = {'length': [1.0] * 6}
+    binding = ColumnBinding(store, parsers={'length': float})
+    order = []
+
+    tabs = QTabWidget()
+    pages = [QWidget(), QWidget()]
+    layouts = [QVBoxLayout(p) for p in pages]
+    limit = AutoColorLineEdit(pages[0], text='10')
+    layouts[0].addWidget(limit)
+    check = scheduler.check(lambda w: order.append(w) or float(w.text()) > float(limit.text()))
+    widgets = []
+    for row in range(6):
+        w = AutoColorLineEdit(pages[row % 2], errorCheck=check)
+        layouts[row % 2].addWidget(w)
+        binding.bind(w, 'length', row)
+        graph.add(w, reads=[limit])
+        widgets.append(w)
+    shown, hidden = widgets[::2], widgets[1::2]
+    for p, name in zip(pages, ('shown', 'hidden')):
+        tabs.addTab(p, name)
+    show({'qtbot': qtbot, 'widget': tabs})
+    scheduler.flush()
+    order.clear()
+
+    # dependents: marked by the graph, the visible ones validated first
+    limit.setText('0')
+    assert all(scheduler.isPending(w) for w in widgets)
+    scheduler._tick()
+    assert set(order) == set(shown)
+    assert all(w.getError() for w in shown)
+    assert not any(w.getError() for w in hidden)
+    scheduler.flush()
+    assert all(w.getError() for w in hidden)
+
+    # bound: loaded (and marked) when visible
+    order.clear()
+    store['length'][:] = [-1.0] * 6
+    binding.storeChanged('length')
+    assert binding.applyStoreChanges() == 3
+    scheduler._tick()
+    assert set(order) == set(shown)
+    assert not any(w.getError() for w in shown)
@@ -0,0 +1,110 @@
+import pytest
+import sys
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_service import ServiceValidator, StandInService
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+
+app = QApplication(sys.argv)
+
+PARTS = {'A-1', 'A-2', 'B-7'}
+
+
+def lookup(kind, value):
+    if kind == 'part':
+        return value not in PARTS
+    return 'unknown kind'
+
+
+@pytest.fixture
+def server():
+    server = StandInService(lookup).start()
+    yield server
+    server.stop()
+
+
+def test_batching(qtbot, server):
+    service = ServiceValidator(server.address)
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    widgets = [AutoColorLineEdit(window, errorCheck=service.check('part')) for _ in range(20)]
+    for w in widgets:
+        layout.addWidget(w)
+    show({'qtbot': qtbot, 'widget': window})
+    assert service.settle()
+    assert server.batches == [1]  # all blank: one query
+
+    texts = ['A-1', 'X-9', 'B-7', 'A-1'] * 5
+    for w, text in zip(widgets, texts):
+        w.setText(text)
+    assert service.isPending(widgets[0])
+    assert widgets[1].getError() is True  # unchanged until answered
+    assert service.settle()
+    assert server.batches == [1, 3]  # one request, duplicates sent once
+    assert service.dedupCount == 19 + 17
+    assert [w.getError() for w in widgets] == [t not in PARTS for t in texts]
+    assert service.connectionCount == 1
+
+    # answers are cached
+    widgets[1].setText('A-1')
+    assert widgets[1].getError() is False
+    assert not service.isPending()
+    service.close()
+
+
+def test_superseded(qtbot, server):
+    service = ServiceValidator(server.address)
+    widget = EntryWidget(options=['part', 'catalogue'],
+                         errorCheck=service.check('part', value=lambda w: w.text().upper()))
+    answered = []
+    service.answered.connect(lambda w, error: answered.append((w, error)))
+    show(locals())
+    service.settle()
+    answered.clear()
+    qtbot.keyClicks(widget.lineEdit, 'a-1')  # 'A', 'A-' and 'A-1' in one request
+    assert service.settle()
+    assert server.batches[-1] == 3
+    assert answered == [(widget, False)]
+    assert widget.getError() is False
+    service.close()
+    widget.setText('B-8')  # after close: unchanged
+    assert widget.getError() is False
+
+
+def test_timeout(qtbot):
+    server = StandInService(lookup, delay=0.5).start()
+    try:
+        service = ServiceValidator(server.address, timeout=0.1, timeoutError='unavailable')
+        widget = AutoColorLineEdit(text='A-1', errorCheck=service.check('part'))
+        show(locals())
+        assert service.settle()
+        assert widget.getError() == 'unavailable'
+        assert service.failureCount == 1
+        assert service.cacheHits == 0
+        service.close()
+    finally:
+        server.stop()
+
+
+def test_unix_socket(qtbot, tmp_path):
+    server = StandInService(lookup, socketPath=str(tmp_path / 'validation.sock')).start()
+    try:
+        service = ServiceValidator(server.address, poolSize=1)
+        widget = AutoColorLineEdit(text='B-7', errorCheck=service.check('part'))
+        show(locals())
+        assert service.settle()
+        assert widget.getError() is False
+        widget.setText('B-8')
+        assert service.settle()
+        assert widget.getError() is True
+        assert server.requests == 2
+        assert service.connectionCount == 1  # persistent connection
+        service.close()
+    finally:
+        server.stop()
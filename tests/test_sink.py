@@ -0,0 +1,77 @@
+import pytest
+import sys
+import threading
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_sink import ErrorSink
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+
+app = QApplication(sys.argv)
+
+
+def make_form(n):
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    widgets = []
+    for i in range(n):
+        w = EntryWidget(window, objectName=f'field{i}', options=['m']) if i % 2 else \
+            AutoColorLineEdit(window, objectName=f'field{i}')
+        layout.addWidget(w)
+        widgets.append(w)
+    return window, widgets
+
+
+def test_threads(qtbot):
+    window, widgets = make_form(200)
+    show({'qtbot': qtbot, 'widget': window})
+    sink = ErrorSink(batchSize=50)
+    assert sink.registerAll(window) == 200
+    batches = []
+    sink.applied.connect(batches.append)
+
+    def produce(first):
+        for n in range(5000):
+            i = first + (n * 7) % 50
+            sink.push(f'field{i}', n % 3 == 0)
+        sink.pushMany((f'field{first + i}', f'final{first + i}') for i in range(50))
+
+    threads = [threading.Thread(target=produce, args=(i * 50,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    qtbot.waitUntil(lambda: sink.pending() == 0)
+    app.processEvents()
+
+    assert [w.getError() for w in widgets] == [f'final{i}' for i in range(200)]
+    assert sink.received == 4 * 5050
+    assert sink.updated + sink.merged == sink.received
+    assert max(batches) <= 50
+    assert sink.dropped == 0
+
+
+def test_merge_and_flush(qtbot):
+    window, widgets = make_form(4)
+    sink = ErrorSink()
+    sink.register(widgets[0], key=0)
+    for i in range(1000):
+        sink.push(0, i)
+    sink.push(widgets[1], 'direct')
+    sink.push('missing', True)
+    assert widgets[0].getError() is False  # not applied yet
+    assert sink.pending() == 3
+    assert sink.flush() == 2
+    assert widgets[0].getError() == 999
+    assert widgets[1].getError() == 'direct'
+    assert sink.merged == 999 and sink.dropped == 1
+
+    sink.pushMany([('field2', True), ('field2', 'last')])
+    sink.registerAll(window)
+    qtbot.waitUntil(lambda: sink.pending() == 0)
+    assert widgets[2].getError() == 'last'
@@ -0,0 +1,142 @@
+import pytest
+import sys
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# functions to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_snapshot import snapshot, restore, load, SnapshotError
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+
+app = QApplication(sys.argv)
+
+
+def make_form(n=5):
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    window.entries = []
+    for i in range(n):
+        window.entries.append(EntryWidget(objectName=f'entry{i}', options=['a', 'b', 'c']))
+        layout.addWidget(window.entries[-1])
+    layout.addWidget(AutoColorLineEdit(objectName='line'))
+    return window
+
+
+def test_roundtrip(qtbot):
+    widget = make_form()
+    show(locals())
+    entry = widget.entries[2]
+    line = widget.findChild(AutoColorLineEdit, 'line')
+    entry.setText('hello')
+    entry.setSelected('c')
+    entry.setError('ERROR')
+    entry.setReadOnly(True)
+    line.setColors({'blank': ('red', 'black')})
+    data = snapshot(widget)
+    assert load(data)[0] == 5
+
+    other = make_form()
+    signals = []
+    other.entries[2].errorChanged.connect(lambda: signals.append('error'))
+    other.entries[2].optionChanged.connect(lambda: signals.append('option'))
+    assert restore(other, data) == 2
+    assert signals == []
+
+    entry = other.entries[2]
+    assert entry.text() == 'hello'
+    assert entry.getSelected() == 'c'
+    assert entry.getError() == 'ERROR'
+    assert entry.isReadOnly() is True
+    assert entry.lineEdit.status == 'error-readonly'
+    line = other.findChild(AutoColorLineEdit, 'line')
+    assert line.autoColors()['blank'] == ('red', 'black')
+    assert line.status == 'blank'
+
+    assert restore(other, data) == 0
+
+    # matched by name when the order differs
+    reordered = QWidget()
+    entries = [EntryWidget(reordered, objectName=f'entry{i}', options=['a', 'b', 'c']) for i in (2, 0, 1, 3, 4)]
+    restore(reordered, data)
+    assert [e.text() for e in entries] == ['hello', '', '', '', '']
+
+
+def test_restore_clears(qtbot):
+    widget = make_form(2)
+    show(locals())
+    data = snapshot(widget)
+    entry = widget.entries[1]
+    entry.setText('changed')
+    entry.setError(True)
+    assert restore(widget, data) == 1
+    assert entry.text() == ''
+    assert entry.getError() is False
+    assert entry.lineEdit.status == 'blank'
+
+
+def test_bad_data(qtbot):
+    with pytest.raises(SnapshotError):
+        load(b'not a snapshot')
+
+
+def test_restore_by_name(qtbot):
+    window = QWidget()
+    [AutoColorLineEdit(window, objectName=n, text=n.upper()) for n in 'abc']
+    data = snapshot(window)
+
+    # fewer widgets, in another order: the named records past them are still matched
+    other = QWidget()
+    c, z = [AutoColorLineEdit(other, objectName=n) for n in 'cz']
+    assert restore(other, data) == 1
+    assert c.text() == 'C'
+    assert z.text() == ''
+
+
+def test_colors_and_errors(qtbot):
+    from PyQt5.QtGui import QColor
+    window = make_form(1)
+    entry = window.entries[0]
+    entry.lineEdit.setColors({'error': (QColor('red'), (0, 0, 255)), 'blank': ('white', 'black')})
+    entry.setError(ValueError('bad'))
+    data = snapshot(window)
+
+    other = make_form(1)
+    restore(other, data)
+    colors = other.entries[0].lineEdit.autoColors()
+    assert colors['error'] == (QColor('red'), (0, 0, 255))
+    assert colors['blank'] == ('white', 'black')
+    assert other.entries[0].getError() == 'bad'
+    assert restore(other, data) == 0
+
+    # the scheme is replaced, list colors are the same as tuples
+    line = other.entries[0].lineEdit
+    line.setColors({'validating': ('lavender', 'black'), 'blank': [[255, 255, 255], 'black']})
+    assert restore(other, data) == 1
+    assert 'validating' not in line.autoColors()
+    assert restore(other, data) == 0
+    line.setColors({'blank': ['white', 'black']})
+    assert restore(other, data) == 0
+
+
+def test_restore_cancels_validation(qtbot):
+    def chunkCheck(w):
+        length = 0
+        chunk = yield
+        while chunk is not None:
+            length += len(chunk)
+            chunk = yield
+        return length > 10 and 'stale'
+
+    window = QWidget()
+    line = AutoColorLineEdit(window, objectName='line', chunkCheck=chunkCheck, chunkThreshold=10, chunkSize=1)
+    data = snapshot(window)
+    line.setText('x' * 1000)
+    assert line.isValidating()
+    assert restore(window, data) == 1
+    assert not line.isValidating()
+    qtbot.wait(20)
+    assert line.text() == ''
+    assert line.getError() is False
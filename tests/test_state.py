@@ -0,0 +1,86 @@
+import pytest
+import sys
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_state import StateController
+from entrywidget_trace import CallCounter
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+
+app = QApplication(sys.argv)
+
+
+def make_form():
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    widgets = [
+        EntryWidget(window, text='1', options=['m', 'km']),
+        EntryWidget(window, text='2', options=['m', 'km'], optionFixed=True),
+        EntryWidget(window, text='3', options=['m', 'km'], readOnly=True),
+        EntryWidget(window, text='', options=['m', 'km'], lazy=True),
+        AutoColorLineEdit(window, text='5', errorCheck=lambda w: True),
+        AutoColorLineEdit(window, text='6', readOnly=True),
+    ]
+    widgets[0].setEnabled(False)
+    for w in widgets:
+        layout.addWidget(w)
+    return window, widgets
+
+
+def state(w):
+    le = w.lineEdit if isinstance(w, EntryWidget) else w
+    result = (le.isReadOnly(), le.isEnabled(), le.isClearButtonEnabled(), le.status, w.getError())
+    if isinstance(w, EntryWidget):
+        result += (w.optionFixed(),)
+    return result
+
+
+def test_lock_unlock(qtbot):
+    window, widgets = make_form()
+    show({'qtbot': qtbot, 'widget': window})
+    before = [state(w) for w in widgets]
+    lock = StateController(window)
+
+    counter = CallCounter().install()
+    try:
+        assert lock.push(readOnly=True) == 4
+    finally:
+        counter.uninstall()
+    assert counter.counts['polish'] == 3  # restyled once each; widgets[0] stays 'disabled'
+    assert window.updatesEnabled()
+    assert [w.lineEdit.isReadOnly() if isinstance(w, EntryWidget) else w.isReadOnly() for w in widgets] == [True] * 6
+    assert [w.optionFixed() for w in widgets[:4]] == [True] * 4
+    assert widgets[4].status == 'error-readonly'
+    assert widgets[3].lineEdit.status == 'readonly'
+    assert lock.depth() == 1
+
+    with lock.pushed(enabled=False):
+        assert [w.isEnabled() for w in widgets[4:]] == [False, False]
+        assert widgets[1].lineEdit.status == 'disabled'
+    assert widgets[1].lineEdit.status == 'readonly'
+
+    assert lock.pop() == 4
+    assert [state(w) for w in widgets] == before
+    assert lock.depth() == 0
+    with pytest.raises(IndexError, match='without a matching push'):
+        lock.pop()
+
+
+def test_optionFixed_and_apply(qtbot):
+    window, widgets = make_form()
+    lock = StateController(widgets[:2])
+    lock.push(optionFixed=False)
+    assert widgets[1].optionFixed() is False
+    assert widgets[1].lineEdit.isReadOnly() is False
+    lock.pop()
+    assert widgets[1].optionFixed() is True
+
+    lock.apply(readOnly=True, optionFixed=False)
+    assert widgets[1].lineEdit.isReadOnly() is True
+    assert widgets[1].optionFixed() is False
+    assert lock.depth() == 0
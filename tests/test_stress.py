@@ -0,0 +1,59 @@
+import io
+import sys
+
+# classes to test
+from entrywidget_stress import KeyStream, Recorder, StressHarness, makeForm, lineEdits, percentile, formatReport
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtTest import QTest
+from PyQt5 import QtCore
+
+app = QApplication(sys.argv)
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([], 50) is None
+
+
+def test_synthetic(qtbot):
+    window = makeForm(10, validator='float')
+    qtbot.addWidget(window)
+    stream = KeyStream.synthetic(300, nFields=10, seed=1)
+    report = StressHarness(window).run(stream, realtime=False)
+
+    assert report['keys'] == 300
+    assert report['p50'] <= report['p95'] <= report['p99'] <= report['max']
+    assert report['droppedFrames'] >= 0
+    assert 0.9 < report['callsPerKey']['errorCheck'] <= 1  # Backspace in an empty field does nothing
+    assert report['maxCallsPerKey']['polish'] <= 1
+    assert 'latency p99' in formatReport(report)
+
+
+def test_record_replay(qtbot):
+    window = makeForm(3, kind='line')
+    qtbot.addWidget(window)
+    window.show()
+    fields = lineEdits(window)
+    recorder = Recorder(window).start()
+    QTest.keyClicks(fields[1], '12')
+    QTest.keyClick(fields[1], QtCore.Qt.Key_Backspace)
+    QTest.keyClicks(fields[2], '3.5')
+    stream = recorder.stop()
+    assert len(stream) == 6
+    assert [e[2] for e in stream] == ['field1'] * 3 + ['field2'] * 3
+
+    f = io.StringIO()
+    stream.save(f)
+    f.seek(0)
+    stream = KeyStream.load(f)
+
+    replayed = makeForm(3, kind='line')
+    qtbot.addWidget(replayed)
+    report = StressHarness(replayed).run(stream, realtime=False)
+    assert report['keys'] == 6 and report['fields'] == 2
+    assert [le.text() for le in lineEdits(replayed)] == ['', '1', '3.5']
@@ -0,0 +1,90 @@
+import json
+import sys
+import io
+
+# test helpers
+from qt_utils.helpers_for_tests import show, check_error_typed
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_trace import Tracer
+import entrywidget
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+
+
+def test_not_installed(qtbot):
+    tracer = Tracer()
+    widget = AutoColorLineEdit(errorCheck=check_error_typed)
+    show(locals())
+    qtbot.keyClicks(widget, 'abc')
+    assert len(tracer) == 0
+    assert entrywidget._tracer is None
+
+
+def test_spans(qtbot):
+    with Tracer() as tracer:
+        widget = EntryWidget(objectName='traced', errorCheck=check_error_typed)
+        show(locals())
+        qtbot.keyClicks(widget.lineEdit, 'error')
+    assert tracer.isInstalled() is False
+
+    names = {e['name'] for e in tracer.events()}
+    assert {'textChanged', 'errorCheck', 'setError', 'errorChanged', 'polish'} <= names
+    assert any(e['args']['widget'] == widget.name for e in tracer.events())
+
+    n = len(tracer)
+    qtbot.keyClicks(widget.lineEdit, 'x')
+    assert len(tracer) == n
+
+
+def test_dump(qtbot):
+    tracer = Tracer(maxEvents=10).install()
+    widget = AutoColorLineEdit(errorCheck=check_error_typed)
+    show(locals())
+    qtbot.keyClicks(widget, 'abcdefghij')
+    tracer.uninstall()
+    assert len(tracer) == 10
+
+    f = io.StringIO()
+    tracer.dump(f)
+    data = json.loads(f.getvalue())
+    assert len(data['traceEvents']) == 10
+    assert all(e['ph'] == 'X' and e['dur'] >= 0 for e in data['traceEvents'])
+
+
+def test_nested(qtbot):
+    first = Tracer().install()
+    second = Tracer().install()
+    third = Tracer().install()
+    widget = AutoColorLineEdit(errorCheck=check_error_typed)
+    show(locals())
+    qtbot.keyClicks(widget, 'a')
+    assert len(third) > 0 and len(second) == 0
+
+    second.uninstall()  # out of order, only removed from the chain
+    assert entrywidget._tracer is third
+    third.uninstall()
+    assert entrywidget._tracer is first
+    second.uninstall()
+    assert entrywidget._tracer is first
+    first.uninstall()
+    assert entrywidget._tracer is None
+
+
+def test_counter(qtbot):
+    from entrywidget_trace import CallCounter
+    outer = Tracer().install()
+    widget = AutoColorLineEdit(errorCheck=check_error_typed)
+    show(locals())
+    counter = CallCounter().install()
+    qtbot.keyClicks(widget, 'a')
+    counter.uninstall()
+    assert counter.counts['errorCheck'] == 1
+    assert entrywidget._tracer is outer
+    assert 'errorCheck' in {e['name'] for e in outer.events()}  # counted spans are passed on
+    outer.uninstall()
+    assert entrywidget._tracer is None
@@ -0,0 +1,173 @@
+import pytest
+import sys
+import os
+
+# test helpers
+from qt_utils.helpers_for_tests import show
+
+# classes to test
+from entrywidget import AutoColorLineEdit, EntryWidget
+from entrywidget_ui import loadUi, loadPlan, UiPlan
+from entrywidget_trace import CallCounter
+import entrywidget_ui
+
+# Qt stuff
+from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtCore import pyqtProperty
+from PyQt5 import uic
+
+app = QApplication(sys.argv)
+
+checked = []
+units = []
+
+
+class CheckedLineEdit(AutoColorLineEdit):
+    defaultArgs = dict(AutoColorLineEdit.defaultArgs,
+                       errorCheck=lambda w: checked.append(w.text()) or w.text() == 'bad')
+
+
+class UnitEntry(EntryWidget):
+    def __init__(self, parent=None, **kwargs):
+        kwargs.setdefault('options', ['m', 'km'])
+        kwargs.setdefault('errorCheck', lambda w: units.append(w.getSelected()) or w.getSelected() == 'km')
+        super().__init__(parent, **kwargs)
+
+    setUnit = EntryWidget.setSelected
+    unit = pyqtProperty(str, EntryWidget.getSelected, setUnit)
+
+
+FORM = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Order</class>
+ <widget class="QWidget" name="Order">
+  <layout class="QVBoxLayout" name="layout">
+   <item><widget class="AutoColorLineEdit" name="part">
+    <property name="text"><string>A-100</string></property>
+   </widget></item>
+   <item><widget class="AutoColorLineEdit" name="note">
+    <property name="readOnly"><bool>true</bool></property>
+   </widget></item>
+   <item><widget class="EntryWidget" name="length">
+    <property name="text_"><string>12</string></property>
+    <property name="toolTip"><string>length</string></property>
+   </widget></item>
+   <item><widget class="CheckedLineEdit" name="checked">
+    <property name="text"><string>bad</string></property>
+   </widget></item>
+   <item><widget class="UnitEntry" name="distance">
+    <property name="unit"><string>km</string></property>
+   </widget></item>
+  </layout>
+ </widget>
+ <customwidgets>
+  <customwidget><class>AutoColorLineEdit</class><extends>QLineEdit</extends><header>entrywidget.h</header></customwidget>
+  <customwidget><class>EntryWidget</class><extends>QWidget</extends><header>entrywidget.h</header></customwidget>
+  <customwidget><class>CheckedLineEdit</class><extends>QLineEdit</extends><header>tests/test_ui.h</header></customwidget>
+  <customwidget><class>UnitEntry</class><extends>QWidget</extends><header>tests/test_ui.h</header></customwidget>
+ </customwidgets>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+@pytest.fixture
+def uiFile(tmp_path):
+    entrywidget_ui._plans.clear()
+    path = tmp_path / 'order.ui'
+    path.write_text(FORM)
+    return str(path)
+
+
+def test_loadUi(qtbot, uiFile):
+    checked.clear()
+    units.clear()
+    counter = CallCounter().install()
+    try:
+        window = loadUi(uiFile)
+    finally:
+        counter.uninstall()
+    show({'qtbot': qtbot, 'widget': window})
+
+    assert isinstance(window, QWidget)
+    assert window.part.text() == 'A-100'
+    assert window.part.status == 'default'
+    assert window.note.isReadOnly() and window.note.status == 'readonly'
+    assert isinstance(window.length, EntryWidget)
+    assert window.length.text() == '12'
+    assert window.length.toolTip() == 'length'
+    assert window.length.lineEdit.status == 'default'
+
+    # validated once after the Designer properties were set, restyled once
+    assert checked == ['', 'bad']
+    assert window.checked.getError() is True
+    assert window.checked.status == 'error'
+    assert counter.counts['polish'] == 5  # one per widget whose status changed
+
+    # a selection set by Designer is resynced: validated with it
+    assert window.distance.getSelected() == 'km'
+    assert units[-1] == 'km' and units.count('km') == 1
+    assert window.distance.getError() is True
+
+    # signals work again
+    window.part.setText('')
+    assert window.part.status == 'blank'
+
+
+def test_loadUi_lazy(qtbot, uiFile):
+    window = loadUi(uiFile)
+    assert window.length._combo is None
+    window.show()
+    qtbot.addWidget(window)
+    assert window.length._combo is not None
+
+    window = loadUi(uiFile, lazy=False)
+    assert window.length._combo is not None
+
+
+def test_loadUi_baseinstance(qtbot, uiFile):
+    base = QWidget()
+    assert loadUi(uiFile, base) is base
+    assert base.objectName() == 'Order'
+    assert base.part.text() == 'A-100'
+    show({'qtbot': qtbot, 'widget': base})
+
+
+def test_loadUi_matches_uic(qtbot, uiFile, tmp_path):
+    # uic.loadUi cannot set EntryWidget's text_ unless stdset="0" marks it
+    path = tmp_path / 'order_uic.ui'
+    path.write_text(FORM.replace('<property name="text_">', '<property name="text_" stdset="0">'))
+    reference = uic.loadUi(str(path))
+    window = loadUi(uiFile)
+    for name in ('part', 'note', 'length', 'checked'):
+        a, b = getattr(reference, name), getattr(window, name)
+        assert type(a) is type(b)
+        assert a.text() == b.text()
+        assert a.getError() == b.getError()
+        le = lambda w: w.lineEdit if isinstance(w, EntryWidget) else w
+        assert le(a).status == le(b).status
+
+
+def test_loadPlan_cache(uiFile, tmp_path, monkeypatch):
+    cacheDir = str(tmp_path / 'cache')
+    plan = loadPlan(uiFile, cacheDir)
+    assert loadPlan(uiFile, cacheDir) is plan
+    assert len(os.listdir(cacheDir)) == 1
+
+    # read back from disk
+    entrywidget_ui._plans.clear()
+    compiles = []
+    original = UiPlan.compile
+    monkeypatch.setattr(UiPlan, 'compile', classmethod(lambda cls, path: compiles.append(path) or original(path)))
+    other = loadPlan(uiFile, cacheDir)
+    assert other is not plan
+    assert compiles == []
+    assert (other.uiClass, other.widgetClass) == ('Ui_Order', 'QWidget')
+
+    # changed file: compiled again
+    with open(uiFile, 'a') as f:
+        f.write('\n')
+    changed = loadPlan(uiFile, cacheDir)
+    assert compiles == [os.path.abspath(uiFile)]
+    assert changed.stamp != other.stamp